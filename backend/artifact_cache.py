@@ -0,0 +1,138 @@
+"""생성된 xlsx 산출물 캐시 + ETag 조건부 다운로드
+
+키 = 입력 데이터(근무표/요청/간호사/규칙/기간)의 버전 → 데이터가 바뀌면 키도 바뀜.
+  - 버전은 DB RPC export_version 1회로 조회 (미배포 환경은 입력을 모두 읽어 내용 해시)
+  - 메모리 LRU (engine.byte_cache, 프로세스 전역, 항목 수 + 총 용량 제한)
+  - 디스크 저장소 (settings.export_cache_dir 지정 시, 재시작 후에도 재사용)
+같은 키로 If-None-Match가 오면 워크북을 만들지 않고 304 반환.
+"""
+import hashlib
+import json
+import os
+from typing import Callable
+from urllib.parse import quote
+
+from fastapi import HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+
+from engine.byte_cache import ByteLRU
+
+from .config import settings
+from .database import is_missing_rpc
+
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+_CHUNK_SIZE = 64 * 1024
+
+
+def content_key(kind: str, *parts) -> str:
+    """산출물 종류 + 입력 데이터(또는 데이터 버전) → 버전 키 (sha256 앞 32자)"""
+    raw = json.dumps([kind, *parts], sort_keys=True, ensure_ascii=False, default=str)
+    return f"{kind}-{hashlib.sha256(raw.encode('utf-8')).hexdigest()[:32]}"
+
+
+def data_version(db, period_id: str | None = None, schedule_id: str | None = None) -> dict | None:
+    """산출물 입력의 데이터 버전 — RPC export_version 1회 (입력 데이터 자체는 조회하지 않음)
+
+    반환: {"version": 부서명·간호사·규칙·기간·신청(+삭제)·근무표의 변경 시각/트랜잭션 id를 합친 문자열,
+           "start_date": 기간 시작일 (파일명용)}
+    RPC 미배포(PGRST202)면 None → 호출 측에서 입력 조회 후 내용 해시로 폴백.
+    대상 기간/근무표가 없으면 404.
+    """
+    try:
+        version = db.rpc("export_version", {
+            "p_department_id": settings.department_id,
+            "p_period_id": period_id,
+            "p_schedule_id": schedule_id,
+        }).execute().data
+    except Exception as e:
+        if not is_missing_rpc(e):
+            raise
+        return None
+    if not version:
+        raise HTTPException(404)
+    return version
+
+
+class ArtifactCache:
+    """bytes 산출물 LRU (engine.byte_cache.ByteLRU) + 선택적 디스크 저장소"""
+
+    def __init__(self, max_items: int = 32, max_bytes: int = 64 * 1024 * 1024, disk_dir: str = ""):
+        self._memory = ByteLRU(max_items, max_bytes)
+        self._disk_dir = disk_dir
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self._disk_dir, f"{key}.xlsx")
+
+    def get(self, key: str) -> bytes | None:
+        data = self._memory.get(key)
+        if data is not None or not self._disk_dir:
+            return data
+        try:
+            with open(self._disk_path(key), "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        self._memory.put(key, data)
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        self._memory.put(key, data)
+        if self._disk_dir:
+            tmp = f"{self._disk_path(key)}.{os.getpid()}.tmp"
+            try:
+                with open(tmp, "wb") as f:
+                    f.write(data)
+                os.replace(tmp, self._disk_path(key))
+            except OSError:
+                pass  # 디스크 저장 실패해도 메모리 캐시는 유효
+
+    def clear(self) -> None:
+        self._memory.clear()
+
+
+export_cache = ArtifactCache(disk_dir=settings.export_cache_dir)
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match", "")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return etag in {t.strip().removeprefix("W/") for t in header.split(",")}
+
+
+def _iter_chunks(content: bytes):
+    for i in range(0, len(content), _CHUNK_SIZE):
+        yield content[i:i + _CHUNK_SIZE]
+
+
+def cached_xlsx_response(
+    request: Request,
+    key: str,
+    build: Callable[[], bytes],
+    filename: str,
+) -> Response:
+    """캐시/ETag를 거쳐 xlsx 다운로드 응답 생성
+
+    1. If-None-Match == ETag → 304 (워크북 생성·전송 생략)
+    2. 캐시 적중 → 저장된 bytes 전송
+    3. 미적중 → build() 후 캐시에 저장
+    """
+    etag = f'"{key}"'
+    # 내용이 바뀔 수 있으므로 매번 재검증 (ETag 일치 시 304)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+
+    content = export_cache.get(key)
+    if content is None:
+        content = build()
+        export_cache.put(key, content)
+
+    encoded = quote(filename, safe='')
+    headers["Content-Disposition"] = f"attachment; filename*=UTF-8''{encoded}"
+    headers["Content-Length"] = str(len(content))
+    return StreamingResponse(_iter_chunks(content), media_type=XLSX_MEDIA_TYPE, headers=headers)
@@ -1,19 +1,24 @@
 """JWT 발급/검증 + bcrypt 해시/검증"""
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from jose import jwt, JWTError
-from passlib.context import CryptContext
 from fastapi import HTTPException, status
 from .config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+@lru_cache(maxsize=1)
+def _pwd_context():
+    """passlib/bcrypt는 로그인·비밀번호 변경 시에만 필요 → 첫 사용 시 생성"""
+    from passlib.context import CryptContext
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
 def hash_password(plain: str) -> str:
-    return pwd_context.hash(plain)
+    return _pwd_context().hash(plain)
 
 
 def verify_password(plain: str, hashed: str) -> bool:
-    return pwd_context.verify(plain, hashed)
+    return _pwd_context().verify(plain, hashed)
 
 
 def create_token(payload: dict, expires_hours: int) -> str:
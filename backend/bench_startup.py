@@ -0,0 +1,103 @@
+"""콜드 스타트 측정 — import 시간 프로파일 + /health 첫 200 응답까지 시간
+
+사용법 (프로젝트 루트에서, backend/.env 또는 환경변수 설정 필요):
+    python -m backend.bench_startup              # import 프로파일 + TTFB 3회
+    python -m backend.bench_startup --runs 5 --top 30
+
+측정 항목:
+  1. python -X importtime 으로 backend.main import 시 모듈별 누적 시간 상위 N개
+  2. uvicorn 프로세스 시작 → GET /health 가 처음 200을 돌려줄 때까지 경과 시간
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def import_profile(top: int = 20) -> tuple[float, list[tuple[int, int, str]]]:
+    """backend.main import 시간(ms)과 누적 시간 상위 모듈 [(self_us, cumulative_us, name)]"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import backend.main"],
+        cwd=_root, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"backend.main import 실패:\n{proc.stderr[-2000:]}")
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, self_us, cum_us, name = (p.strip() for p in line.replace("import time:", "|", 1).split("|"))
+        rows.append((int(self_us), int(cum_us), name))
+
+    total = next((cum for _, cum, name in rows if name.strip() == "backend.main"), 0)
+    rows.sort(key=lambda r: r[1], reverse=True)
+    return total / 1000, rows[:top]
+
+
+def time_to_first_200(port: int, timeout: float = 60.0) -> float:
+    """uvicorn 기동 → /health 200 까지 경과 시간(초)"""
+    url = f"http://127.0.0.1:{port}/health"
+    t0 = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.main:app",
+         "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=_root, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+    )
+    try:
+        while time.perf_counter() - t0 < timeout:
+            if proc.poll() is not None:
+                raise RuntimeError(f"uvicorn 종료됨:\n{proc.stderr.read().decode(errors='replace')[-2000:]}")
+            try:
+                with urllib.request.urlopen(url, timeout=timeout) as res:
+                    if res.status == 200:
+                        return time.perf_counter() - t0
+            except (urllib.error.URLError, ConnectionError):
+                time.sleep(0.02)
+        raise TimeoutError(f"{timeout}s 내에 /health 응답 없음")
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API 콜드 스타트 측정")
+    parser.add_argument("--runs", type=int, default=3, help="TTFB 측정 횟수")
+    parser.add_argument("--top", type=int, default=20, help="import 프로파일 상위 모듈 수")
+    parser.add_argument("--skip-ttfb", action="store_true", help="import 프로파일만 측정")
+    args = parser.parse_args()
+
+    total_ms, rows = import_profile(args.top)
+    print(f"[import] backend.main: {total_ms:.0f} ms")
+    print(f"{'self(ms)':>9} {'cum(ms)':>9}  module")
+    for self_us, cum_us, name in rows:
+        print(f"{self_us / 1000:9.1f} {cum_us / 1000:9.1f}  {name}")
+
+    if args.skip_ttfb:
+        return
+    samples = []
+    for i in range(args.runs):
+        elapsed = time_to_first_200(_free_port())
+        samples.append(elapsed)
+        print(f"[ttfb] run {i + 1}: {elapsed * 1000:.0f} ms")
+    print(f"[ttfb] min {min(samples) * 1000:.0f} ms | median {statistics.median(samples) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
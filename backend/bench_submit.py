@@ -0,0 +1,173 @@
+"""근무신청 동시 제출 부하 테스트 — 로컬 SQLite 대역(local_rpc) 사용
+
+사용법 (프로젝트 루트에서):
+    python -m backend.bench_submit                        # 50명, 동시 16, 제출 800회
+    python -m backend.bench_submit --workers 32 --submits 2000
+    python -m backend.bench_submit --mode legacy          # 기존 3단계(점수 upsert → 삭제 → 삽입) 비교
+
+모드:
+  - rpc   : submit_nurse_requests 1회 호출 (검증 + 점수 + diff 저장, 단일 트랜잭션)
+  - legacy: 트랜잭션 없이 문장 3개를 따로 실행 (변경 전 저장 경로)
+
+검증 (제출 종료 후 간호사별):
+  1. 저장된 신청 = 승인된 제출 중 하나와 정확히 일치 (서로 다른 제출이 섞이지 않음)
+  2. nurse_scores 점수 = 그 제출의 점수 (행의 score는 마지막 변경 시점 스냅샷이라 비교 안 함)
+  3. (day, code) 중복 없음
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .local_rpc import LocalRequestStore, LocalRpcError
+from .request_rules import A_LIMIT_HINT, desired_request_items, score_request_items
+
+PERIOD_ID = "bench-period"
+_CODES = ["D", "E", "N", "OFF", "OFF", "휴가", "D9", "수면", "병가", "필수"]
+
+
+def _random_items(rng: random.Random) -> list[dict]:
+    """간호사 1회 제출 (3~10건, 일부 OR 쌍, 약 30% A조건 → 일부는 A조건 초과로 거절)"""
+    items = []
+    for day in sorted(rng.sample(range(1, 29), rng.randint(3, 10))):
+        condition = "A" if rng.random() < 0.3 else "B"
+        if rng.random() < 0.15:
+            for code in rng.sample(["D", "E", "N"], 2):
+                items.append({"day": day, "code": code, "is_or": True, "note": "", "condition": condition})
+        else:
+            items.append({"day": day, "code": rng.choice(_CODES), "is_or": False, "note": "", "condition": condition})
+    return items
+
+
+def _signature(rows) -> frozenset:
+    return frozenset(
+        (r["day"], r["code"], bool(r["is_or"]), r["note"] or "", r["condition"]) for r in rows
+    )
+
+
+def _legacy_submit(store: LocalRequestStore, nurse_id: str, items: list[dict]) -> None:
+    """변경 전 저장 경로 재현: 점수 upsert / 전체 삭제 / 전체 삽입을 각각 autocommit"""
+    a_count, score = score_request_items(items)
+    if a_count > 3:
+        raise LocalRpcError("P0001", "A조건 초과", A_LIMIT_HINT)
+    conn = store.connection()
+    conn.execute(
+        "INSERT INTO nurse_scores (period_id, nurse_id, score) VALUES (?, ?, ?) "
+        "ON CONFLICT (period_id, nurse_id) DO UPDATE SET score = excluded.score",
+        (PERIOD_ID, nurse_id, score),
+    )
+    conn.execute("DELETE FROM requests WHERE period_id = ? AND nurse_id = ?", (PERIOD_ID, nurse_id))
+    for r in desired_request_items(items).values():
+        conn.execute(
+            "INSERT INTO requests (id, period_id, nurse_id, day, code, is_or, note, condition, score, submitted_at) "
+            "VALUES (lower(hex(randomblob(16))), ?, ?, ?, ?, ?, ?, ?, ?, datetime('now'))",
+            (PERIOD_ID, nurse_id, r["day"], r["code"], r["is_or"], r["note"], r["condition"], score),
+        )
+
+
+def run(nurses: int, workers: int, submits: int, mode: str, seed: int = 0) -> dict:
+    rng = random.Random(seed)
+    nurse_ids = [f"nurse-{i:03d}" for i in range(nurses)]
+    # 마감 직전처럼 일부 간호사가 반복 저장하도록 편중 분포
+    weights = [1.0 / (i + 1) ** 0.5 for i in range(nurses)]
+    tasks = [(rng.choices(nurse_ids, weights)[0], _random_items(rng)) for _ in range(submits)]
+
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    store = LocalRequestStore(path)
+    accepted: dict[str, dict[frozenset, int]] = {}
+    latencies: list[float] = []
+    counts = {"accepted": 0, "rejected": 0, "errors": 0}
+    lock = threading.Lock()
+
+    def submit(task):
+        nurse_id, items = task
+        t0 = time.perf_counter()
+        outcome = "accepted"
+        try:
+            if mode == "rpc":
+                store.rpc("submit_nurse_requests", {
+                    "p_period_id": PERIOD_ID, "p_nurse_id": nurse_id, "p_items": items,
+                }).execute()
+            else:
+                _legacy_submit(store, nurse_id, items)
+        except LocalRpcError as e:
+            outcome = "rejected" if e.hint == A_LIMIT_HINT else "errors"
+        except Exception:
+            outcome = "errors"
+        elapsed = time.perf_counter() - t0
+        with lock:
+            latencies.append(elapsed)
+            counts[outcome] += 1
+            if outcome == "accepted":
+                desired = desired_request_items(items)
+                accepted.setdefault(nurse_id, {})[_signature(desired.values())] = score_request_items(items)[1]
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(submit, tasks))
+    wall = time.perf_counter() - t0
+
+    violations = []
+    for nurse_id in nurse_ids:
+        rows = store.nurse_rows(PERIOD_ID, nurse_id)
+        options = accepted.get(nurse_id, {})
+        if not options:
+            continue
+        sig = _signature(rows)
+        keys = [(r["day"], r["code"]) for r in rows]
+        if len(keys) != len(set(keys)):
+            violations.append((nurse_id, "duplicate (day, code)"))
+        if sig not in options:
+            violations.append((nurse_id, "rows match no accepted submission"))
+            continue
+        score = store.nurse_score(PERIOD_ID, nurse_id)
+        if score != options[sig]:
+            violations.append((nurse_id, f"score mismatch ({score} vs {options[sig]})"))
+
+    os.unlink(path)
+    for suffix in ("-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.unlink(path + suffix)
+
+    latencies.sort()
+    return {
+        "mode": mode,
+        "nurses": nurses,
+        "workers": workers,
+        "submits": submits,
+        "wall_sec": wall,
+        "throughput": submits / wall if wall else 0.0,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "max_ms": latencies[-1] * 1000,
+        **counts,
+        "violations": violations,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="근무신청 동시 제출 부하 테스트")
+    parser.add_argument("--nurses", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--submits", type=int, default=800)
+    parser.add_argument("--mode", choices=["rpc", "legacy"], default="rpc")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    r = run(args.nurses, args.workers, args.submits, args.mode, args.seed)
+    print(f"[{r['mode']}] 간호사 {r['nurses']}명 | 동시 {r['workers']} | 제출 {r['submits']}회")
+    print(f"  {r['wall_sec']:.2f} s, {r['throughput']:.0f} 건/s | "
+          f"p50 {r['p50_ms']:.1f} ms, p95 {r['p95_ms']:.1f} ms, max {r['max_ms']:.1f} ms")
+    print(f"  승인 {r['accepted']} | A조건 초과 거절 {r['rejected']} | 오류 {r['errors']}")
+    print(f"  정합성 위반 {len(r['violations'])}건")
+    for nurse_id, reason in r["violations"][:10]:
+        print(f"    - {nurse_id}: {reason}")
+
+
+if __name__ == "__main__":
+    main()
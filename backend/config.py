@@ -16,6 +16,14 @@ class Settings(BaseSettings):
     nurse_token_expire_hours: int = 24
     department_id: str          # 운영 부서 UUID — Supabase 초기화 시 설정
     environment: str = "development"  # "development" | "production"
+    export_cache_dir: str = ""        # xlsx 산출물 디스크 캐시 경로 (빈 값 = 메모리 캐시만)
+    solver_bundle_dir: str = ""       # 솔버 입력 번들 저장 경로 (빈 값 = 저장 안 함, engine/replay.py로 재실행)
+    solver_bundle_anonymize: bool = True  # 번들 저장 시 간호사 id·이름 익명화
+    solver_native_encoding: bool = False  # 불리언 제약을 CP-SAT 전용 제약으로 (기본 = 선형 제약)
+    solver_symmetry_breaking: bool = True  # 교환 가능한 간호사 대칭 제거 (최적값 불변, 해 집합만 축소)
+    solver_redundant_constraints: bool = False  # 함의 제약 R1~R5 추가 (첫 해는 늦어지고 목적값·불가능 증명은 개선)
+    solver_search_strategy: str = "default"     # "default" | "night_first" (engine.solver.SEARCH_STRATEGIES)
+    solver_solve_mode: str = "monolithic"       # "monolithic" | "two_phase" (engine.solver.SOLVE_MODES)
 
 
 settings = Settings()  # type: ignore[call-arg]
@@ -1,12 +1,20 @@
 """Supabase 클라이언트 + 공통 쿼리 헬퍼
 요청마다 새 클라이언트를 생성해 idle 후 HTTP/2 연결 종료(RemoteProtocolError) 문제를 방지.
 create_client()는 객체 생성만 하고 실제 연결은 execute() 시점에 맺히므로 비용이 거의 없음.
+
+supabase 패키지는 import 비용이 커서(콜드 스타트의 약 1/3) 첫 get_db() 호출 시점에 로드.
 """
-from supabase import create_client, Client
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
 from .config import settings
 
+if TYPE_CHECKING:
+    from supabase import Client
+
 
 def get_db() -> Client:
+    from supabase import create_client
     return create_client(settings.supabase_url, settings.supabase_service_key)
 
 
@@ -88,3 +96,8 @@ def get_period_by_start_date(db: Client, start_date: str) -> dict | None:
         .execute()
     )
     return res.data[0] if res.data else None
+
+
+def is_missing_rpc(exc: Exception) -> bool:
+    """RPC 함수 미배포 여부 (PostgREST PGRST202) — SQL 마이그레이션 전 환경 폴백 판단용"""
+    return getattr(exc, "code", None) == "PGRST202"
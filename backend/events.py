@@ -0,0 +1,93 @@
+"""프로세스 내 pub/sub — SSE(/events) 구독자에게 작업 상태·신청 변경 푸시
+
+토픽:
+  - job:{job_id}       : 솔버 작업 상태 (pending → running → progress… → done | failed)
+  - period:{period_id} : 해당 기간의 작업 상태 + 신청 제출/가져오기
+
+발행자(worker, 요청 라우터)는 이벤트 루프 안/밖 어디서든 publish 가능 (thread-safe).
+단일 프로세스 전제 — 여러 uvicorn 워커로 띄우면 같은 프로세스의 구독자에게만 전달됨.
+"""
+import asyncio
+import threading
+from collections import OrderedDict
+
+_QUEUE_SIZE = 256      # 구독자별 대기 이벤트 상한 (넘치면 오래된 것부터 버림)
+_RETAIN_TOPICS = 256   # 마지막 상태를 보관할 토픽 수 (늦게 접속한 구독자에게 즉시 전달)
+
+
+class Subscription:
+    """구독자 1명 — 자신의 이벤트 루프에 묶인 asyncio.Queue"""
+    __slots__ = ("topics", "queue", "_loop")
+
+    def __init__(self, topics: tuple[str, ...]):
+        self.topics = topics
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=_QUEUE_SIZE)
+        self._loop = asyncio.get_running_loop()
+
+    def _offer(self, msg: dict) -> None:
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(msg)
+
+    def deliver(self, msg: dict) -> None:
+        self._loop.call_soon_threadsafe(self._offer, msg)
+
+
+class EventBus:
+    def __init__(self):
+        self._subs: dict[str, set[Subscription]] = {}
+        self._retained: OrderedDict[str, dict] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def subscribe(self, *topics: str) -> Subscription:
+        """이벤트 루프 안에서 호출"""
+        sub = Subscription(topics)
+        with self._lock:
+            for t in topics:
+                self._subs.setdefault(t, set()).add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        with self._lock:
+            for t in sub.topics:
+                subs = self._subs.get(t)
+                if subs is not None:
+                    subs.discard(sub)
+                    if not subs:
+                        del self._subs[t]
+
+    def retained(self, topic: str) -> dict | None:
+        """토픽의 마지막 보관 이벤트 {"event", "data"}"""
+        with self._lock:
+            return self._retained.get(topic)
+
+    def publish(self, topic: str, event: str, data: dict, retain: bool = False) -> None:
+        msg = {"event": event, "data": data}
+        with self._lock:
+            subs = list(self._subs.get(topic, ()))
+            if retain:
+                self._retained[topic] = msg
+                self._retained.move_to_end(topic)
+                while len(self._retained) > _RETAIN_TOPICS:
+                    self._retained.popitem(last=False)
+        for sub in subs:
+            try:
+                sub.deliver(msg)
+            except RuntimeError:
+                pass  # 구독자 이벤트 루프 종료됨 — 연결 정리 시 unsubscribe
+
+
+bus = EventBus()
+
+
+def publish_job(job_id: str, period_id: str | None, status: str, **fields) -> None:
+    """작업 상태 발행 (job 토픽은 마지막 상태 보관)"""
+    data = {"job_id": job_id, "status": status, **fields}
+    bus.publish(f"job:{job_id}", "status", data, retain=True)
+    if period_id:
+        bus.publish(f"period:{period_id}", "job", data)
+
+
+def publish_submission(period_id: str, **fields) -> None:
+    """신청 변경 발행 (간호사 저장, 엑셀 가져오기)"""
+    bus.publish(f"period:{period_id}", "submission", fields)
@@ -0,0 +1,196 @@
+"""근무신청 RPC 로컬 대역 (SQLite) — Supabase 없이 저장 로직·동시성 검증용
+
+docs/supabase_schema.sql의 submit_nurse_requests / save_nurse_requests / replace_period_requests와
+같은 입력·출력·에러 형태를 흉내냄. supabase Client처럼 호출:
+
+    store = LocalRequestStore("/tmp/requests.db")
+    store.rpc("submit_nurse_requests", {"p_period_id": ..., "p_nurse_id": ..., "p_items": [...]}).execute().data
+
+트랜잭션은 BEGIN IMMEDIATE (DB 전체 쓰기 잠금) → Postgres advisory lock보다 강하게 직렬화.
+스레드마다 별도 연결을 사용하므로 동시 제출 부하 테스트(bench_submit)에 그대로 사용 가능.
+"""
+import sqlite3
+import threading
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+
+from .request_rules import (
+    A_CONDITION_LIMIT, A_LIMIT_HINT, a_limit_message,
+    desired_request_items, diff_request_rows, score_request_items,
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS requests (
+    id           TEXT PRIMARY KEY,
+    period_id    TEXT NOT NULL,
+    nurse_id     TEXT NOT NULL,
+    day          INTEGER NOT NULL CHECK (day BETWEEN 1 AND 28),
+    code         TEXT NOT NULL,
+    is_or        INTEGER DEFAULT 0,
+    note         TEXT DEFAULT '',
+    condition    TEXT DEFAULT 'B',
+    score        INTEGER DEFAULT 100,
+    submitted_at TEXT,
+    UNIQUE (period_id, nurse_id, day, code)
+);
+CREATE TABLE IF NOT EXISTS nurse_scores (
+    period_id TEXT NOT NULL,
+    nurse_id  TEXT NOT NULL,
+    score     INTEGER NOT NULL DEFAULT 100,
+    PRIMARY KEY (period_id, nurse_id)
+);
+CREATE INDEX IF NOT EXISTS idx_requests_period_nurse ON requests(period_id, nurse_id);
+"""
+
+_COLUMNS = ("id", "period_id", "nurse_id", "day", "code", "is_or", "note", "condition", "score", "submitted_at")
+
+
+class LocalRpcError(Exception):
+    """postgrest APIError와 같은 속성(code/message/hint)을 갖는 RPC 오류"""
+
+    def __init__(self, code: str, message: str, hint: str | None = None):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+        self.hint = hint
+
+
+class _Result:
+    __slots__ = ("data",)
+
+    def __init__(self, data):
+        self.data = data
+
+
+class _RpcCall:
+    def __init__(self, fn, params: dict):
+        self._fn = fn
+        self._params = params
+
+    def execute(self) -> _Result:
+        return _Result(self._fn(**self._params))
+
+
+class LocalRequestStore:
+    """SQLite 파일 하나에 requests / nurse_scores 테이블 + RPC 함수"""
+
+    def __init__(self, path: str):
+        self._path = path
+        self._local = threading.local()
+        self.connection().executescript(_SCHEMA)
+
+    def connection(self) -> sqlite3.Connection:
+        """현재 스레드 전용 연결 (autocommit 모드 — 트랜잭션은 _tx로 명시)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self._path, timeout=30, isolation_level=None, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _tx(self):
+        conn = self.connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def rpc(self, name: str, params: dict | None = None) -> _RpcCall:
+        fn = {
+            "submit_nurse_requests": self.submit_nurse_requests,
+            "save_nurse_requests": self.save_nurse_requests,
+            "replace_period_requests": self.replace_period_requests,
+        }.get(name)
+        if fn is None:
+            raise LocalRpcError("PGRST202", f"Could not find the function public.{name}")
+        return _RpcCall(fn, params or {})
+
+    # ── 조회 ──
+
+    def nurse_rows(self, period_id: str, nurse_id: str, conn: sqlite3.Connection | None = None) -> list[dict]:
+        conn = conn or self.connection()
+        cur = conn.execute(
+            f"SELECT {', '.join(_COLUMNS)} FROM requests WHERE period_id = ? AND nurse_id = ?",
+            (period_id, nurse_id),
+        )
+        return [{**dict(r), "is_or": bool(r["is_or"])} for r in cur.fetchall()]
+
+    def nurse_score(self, period_id: str, nurse_id: str) -> int | None:
+        row = self.connection().execute(
+            "SELECT score FROM nurse_scores WHERE period_id = ? AND nurse_id = ?",
+            (period_id, nurse_id),
+        ).fetchone()
+        return row["score"] if row else None
+
+    # ── RPC ──
+
+    def submit_nurse_requests(self, p_period_id: str, p_nurse_id: str, p_items: list[dict]) -> dict:
+        a_count, score = score_request_items(p_items)
+        if a_count > A_CONDITION_LIMIT:
+            raise LocalRpcError("P0001", a_limit_message(a_count), A_LIMIT_HINT)
+        rows = self._save(p_period_id, p_nurse_id, score, desired_request_items(p_items))
+        return {"score": score, "a_count": a_count, "rows": rows}
+
+    def save_nurse_requests(self, p_period_id: str, p_nurse_id: str, p_score: int, p_items: list[dict]) -> list[dict]:
+        return self._save(p_period_id, p_nurse_id, p_score, desired_request_items(p_items))
+
+    def _save(self, period_id: str, nurse_id: str, score: int, desired: dict) -> list[dict]:
+        now_iso = datetime.utcnow().isoformat()
+        with self._tx() as conn:
+            conn.execute(
+                "INSERT INTO nurse_scores (period_id, nurse_id, score) VALUES (?, ?, ?) "
+                "ON CONFLICT (period_id, nurse_id) DO UPDATE SET score = excluded.score",
+                (period_id, nurse_id, score),
+            )
+            existing = self.nurse_rows(period_id, nurse_id, conn)
+            to_delete, to_update, to_insert, _ = diff_request_rows(existing, desired, score)
+            conn.executemany("DELETE FROM requests WHERE id = ?", [(i,) for i in to_delete])
+            conn.executemany(
+                "UPDATE requests SET is_or = ?, note = ?, condition = ?, score = ?, submitted_at = ? WHERE id = ?",
+                [(r["is_or"], r["note"], r["condition"], score, now_iso, r["id"]) for r in to_update],
+            )
+            conn.executemany(
+                f"INSERT INTO requests ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})",
+                [
+                    (str(uuid.uuid4()), period_id, nurse_id, r["day"], r["code"], r["is_or"],
+                     r["note"], r["condition"], score, now_iso)
+                    for r in to_insert
+                ],
+            )
+            return self.nurse_rows(period_id, nurse_id, conn)
+
+    def replace_period_requests(self, p_period_id: str, p_nurse_ids: list[str], p_rows: list[dict]) -> dict:
+        now_iso = datetime.utcnow().isoformat()
+
+        def key(r: dict) -> tuple:
+            return (r["nurse_id"], r["day"], r["code"], bool(r.get("is_or")), r.get("note") or "")
+
+        with self._tx() as conn:
+            old = [r for nid in p_nurse_ids for r in self.nurse_rows(p_period_id, nid, conn)]
+            old_keys = {key(r) for r in old}
+            new_keys = {key(r) for r in p_rows}
+            conn.executemany(
+                "DELETE FROM requests WHERE period_id = ? AND nurse_id = ?",
+                [(p_period_id, nid) for nid in p_nurse_ids],
+            )
+            conn.executemany(
+                f"INSERT INTO requests ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})",
+                [
+                    (str(uuid.uuid4()), p_period_id, r["nurse_id"], r["day"], r["code"],
+                     bool(r.get("is_or")), r.get("note") or "", "B", 100, now_iso)
+                    for r in p_rows
+                ],
+            )
+        return {
+            "added": len(new_keys - old_keys),
+            "removed": len(old_keys - new_keys),
+            "unchanged": len(new_keys & old_keys),
+            "deleted": len(old),
+            "inserted": len(p_rows),
+        }
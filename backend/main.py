@@ -1,4 +1,9 @@
-"""FastAPI 앱 진입점"""
+"""FastAPI 앱 진입점
+
+콜드 스타트 최적화: 무거운 모듈(supabase, passlib, openpyxl, holidays, ortools)은
+실제 사용하는 경로에서 지연 import. 시작 시간 측정은 backend/bench_startup.py
+"""
+import asyncio
 import sys
 import os
 from contextlib import asynccontextmanager
@@ -11,14 +16,17 @@ _root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if _root not in sys.path:
     sys.path.insert(0, _root)
 
-from .routers import auth, nurses, rules, settings, requests, schedule, export, holidays
+from .routers import auth, nurses, rules, settings, requests, schedule, export, holidays, events
 
 # 보존 기간 (일) — 변경 시 이 값만 수정
 _KEEP_DAYS = 180  # 6개월
 
+# 오래된 period 정리는 서버가 첫 요청을 받은 뒤 실행 (콜드 스타트 지연 방지)
+_CLEANUP_DELAY_SEC = 30
+
 
 def _cleanup_old_periods():
-    """시작일 기준 KEEP_DAYS 이상 지난 period 삭제 (CASCADE로 연관 데이터 함께 삭제)"""
+    """시작일 기준 KEEP_DAYS 이상 지난 period 삭제 (CASCADE로 연관 데이터 함께 삭제) + 오래된 tombstone 정리"""
     try:
         from .database import get_db
         from .config import settings as cfg
@@ -27,12 +35,25 @@ def _cleanup_old_periods():
         db.table("periods").delete().eq("department_id", cfg.department_id).lt("start_date", cutoff).execute()
     except Exception:
         pass  # 정리 실패 시 서버 시작은 계속
+    try:
+        # 삭제 tombstone 정리 (보존 기간 지난 것 — 그 이전 커서는 전체 스냅샷으로 응답)
+        from .database import get_db
+        get_db().rpc("prune_request_tombstones", {}).execute()
+    except Exception:
+        pass  # 마이그레이션 전(RPC 없음) 포함, 실패해도 무시
+
+
+async def _deferred_cleanup():
+    """시작 직후가 아닌 일정 시간 뒤 스레드에서 정리 (이벤트 루프 블로킹 방지)"""
+    await asyncio.sleep(_CLEANUP_DELAY_SEC)
+    await asyncio.to_thread(_cleanup_old_periods)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    _cleanup_old_periods()
+    cleanup_task = asyncio.create_task(_deferred_cleanup())
     yield
+    cleanup_task.cancel()
 
 
 app = FastAPI(title="NurseScheduler API", version="1.0.0", lifespan=lifespan)
@@ -59,6 +80,7 @@ app.include_router(requests.router)
 app.include_router(schedule.router)
 app.include_router(export.router)
 app.include_router(holidays.router)
+app.include_router(events.router)
 
 
 @app.get("/health")
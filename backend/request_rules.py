@@ -0,0 +1,90 @@
+"""근무신청 점수·검증·변경분 계산 — 라우터 폴백 경로와 로컬 RPC 대역(local_rpc)이 공용
+
+DB 함수 submit_nurse_requests (docs/supabase_schema.sql)와 같은 규칙:
+  - 병가/법휴/필수는 차감·A조건 집계에서 제외 (condition은 항상 'B')
+  - OR 신청은 같은 날 첫 항목 1건만 집계
+  - A조건 최대 3개, 점수 = 100 - (A×1 + B×3)
+"""
+from typing import Iterable
+
+SKIP_PRIORITY_CODES = frozenset({"병가", "법휴", "필수"})
+A_CONDITION_LIMIT = 3
+A_LIMIT_HINT = "a_condition_limit"  # DB 함수가 A조건 초과 시 돌려주는 hint
+
+
+def score_request_items(items: Iterable[dict]) -> tuple[int, int]:
+    """신청 목록 → (A조건 개수, 점수)"""
+    seen_or_days: set[int] = set()
+    a_count = 0
+    deduction = 0
+    for item in items:
+        if item["code"] in SKIP_PRIORITY_CODES:
+            continue
+        if item.get("is_or"):
+            if item["day"] in seen_or_days:
+                continue
+            seen_or_days.add(item["day"])
+        if item.get("condition") == "A":
+            a_count += 1
+            deduction += 1
+        else:
+            deduction += 3
+    return a_count, 100 - deduction
+
+
+def a_limit_message(a_count: int) -> str:
+    return f"A조건은 월 최대 {A_CONDITION_LIMIT}개까지 신청 가능합니다. (현재 {a_count}개)"
+
+
+def desired_request_items(items: Iterable[dict]) -> dict[tuple[int, str], dict]:
+    """(day, code) 기준 최종 신청 목록 — 같은 키가 중복되면 마지막 항목 우선"""
+    desired: dict[tuple[int, str], dict] = {}
+    for item in items:
+        desired[(item["day"], item["code"])] = {
+            "day": item["day"],
+            "code": item["code"],
+            "is_or": bool(item.get("is_or")),
+            "note": item.get("note") or '',
+            "condition": item.get("condition", "B") if item["code"] not in SKIP_PRIORITY_CODES else 'B',
+        }
+    return desired
+
+
+def diff_request_rows(
+    existing: list[dict],
+    desired: dict[tuple[int, str], dict],
+    score: int,
+) -> tuple[list, list[dict], list[dict], list[dict]]:
+    """저장된 행과 새 신청 목록 비교
+
+    score는 변경 판단에 쓰지 않음 — 신청 하나만 추가/삭제해도 점수가 바뀌므로 점수까지 비교하면
+    매 저장마다 모든 행이 수정 대상이 됨. 행의 score는 그 행이 마지막으로 바뀐 시점의 스냅샷이고
+    현재 점수는 nurse_scores (배정 시에는 worker가 신청에서 재계산).
+
+    Returns:
+        (to_delete_ids, to_update, to_insert, kept)
+        - to_update: id 포함, 바뀐 필드 반영된 행
+        - to_insert / to_update에는 period_id, nurse_id가 없음 (호출 측에서 채움)
+        - kept: 변경 없이 유지되는 기존 행
+    """
+    current: dict[tuple[int, str], dict] = {}
+    to_delete = []
+    for r in existing:
+        key = (r["day"], r["code"])
+        if key in current or key not in desired:
+            to_delete.append(r["id"])
+        else:
+            current[key] = r
+
+    to_update, to_insert, kept = [], [], []
+    for key, item in desired.items():
+        old = current.get(key)
+        if old is None:
+            to_insert.append({**item, "score": score})
+        elif (
+            bool(old.get("is_or")), old.get("note") or '', old.get("condition", "B")
+        ) != (item["is_or"], item["note"], item["condition"]):
+            to_update.append({**item, "score": score, "id": old["id"]})
+        else:
+            kept.append(old)
+    return to_delete, to_update, to_insert, kept
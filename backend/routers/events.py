@@ -0,0 +1,99 @@
+"""SSE 스트림 — 솔버 작업 상태·신청 변경 푸시 (폴링 대체)
+
+  GET /events/job/{job_id}       : status 이벤트 (pending/running/progress → done|failed 후 종료)
+  GET /events/period/{period_id} : job / submission 이벤트 (연결 유지)
+
+이벤트 발행은 backend/events.py 버스 (단일 프로세스 전제).
+연결이 끊기거나 재접속하면 클라이언트가 기존 REST 조회로 상태를 다시 맞춤.
+"""
+import asyncio
+import json
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from ..database import get_db
+from ..deps import get_current_admin
+from ..events import bus
+
+router = APIRouter(prefix="/events", tags=["이벤트"])
+
+KEEPALIVE_SEC = 15  # 프록시 유휴 연결 종료 방지용 주석 라인 간격
+_TERMINAL = {"done", "failed"}
+_SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",  # nginx 등 리버스 프록시 버퍼링 비활성화
+}
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+
+async def _stream(request: Request, sub, first: list[dict], stop_on_terminal: bool):
+    """초기 이벤트 전송 후 구독 큐를 SSE로 흘려보냄 — 종료되면 구독 해제"""
+    try:
+        for msg in first:
+            yield _sse(msg["event"], msg["data"])
+            if stop_on_terminal and msg["data"].get("status") in _TERMINAL:
+                return
+        while True:
+            try:
+                msg = await asyncio.wait_for(sub.queue.get(), timeout=KEEPALIVE_SEC)
+            except asyncio.TimeoutError:
+                if await request.is_disconnected():
+                    return
+                yield ": ping\n\n"
+                continue
+            yield _sse(msg["event"], msg["data"])
+            if stop_on_terminal and msg["data"].get("status") in _TERMINAL:
+                return
+    finally:
+        bus.unsubscribe(sub)
+
+
+def _response(request: Request, sub, first: list[dict], stop_on_terminal: bool) -> StreamingResponse:
+    """SSE 응답 — 구독 해제는 응답 종료 시 background로도 실행
+
+    반복이 시작되기 전에 연결이 끊기면 생성기 finally가 실행되지 않으므로 응답에 묶음
+    (unsubscribe는 중복 호출해도 무해).
+    """
+    return StreamingResponse(
+        _stream(request, sub, first, stop_on_terminal),
+        media_type="text/event-stream",
+        headers=_SSE_HEADERS,
+        background=BackgroundTask(bus.unsubscribe, sub),
+    )
+
+
+@router.get("/job/{job_id}")
+async def job_events(job_id: str, request: Request, _: dict = Depends(get_current_admin)):
+    topic = f"job:{job_id}"
+    # 조회 전에 구독 → 조회와 구독 사이에 발행된 이벤트도 놓치지 않음
+    sub = bus.subscribe(topic)
+    try:
+        last = bus.retained(topic)
+        if last is None:
+            # 버스에 기록 없음 (서버 재시작 등) → DB 상태 1회 조회
+            res = await asyncio.to_thread(
+                lambda: get_db().table("solver_jobs").select("*").eq("id", job_id).limit(1).execute()
+            )
+            if not res.data:
+                raise HTTPException(404, "작업을 찾을 수 없습니다.")
+            job = res.data[0]
+            last = {"event": "status", "data": {
+                "job_id": job_id,
+                "status": job["status"],
+                "schedule_id": job.get("schedule_id"),
+                "error_msg": job.get("error_msg"),
+            }}
+    except BaseException:
+        bus.unsubscribe(sub)
+        raise
+    return _response(request, sub, [last], stop_on_terminal=True)
+
+
+@router.get("/period/{period_id}")
+async def period_events(period_id: str, request: Request, _: dict = Depends(get_current_admin)):
+    sub = bus.subscribe(f"period:{period_id}")
+    ready = {"event": "ready", "data": {"period_id": period_id}}
+    return _response(request, sub, [ready], stop_on_terminal=False)
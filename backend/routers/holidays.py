@@ -1,22 +1,44 @@
 """한국 공휴일 조회 (인증 불필요)"""
-from fastapi import APIRouter
+import hashlib
+import os
+import sys
+from functools import lru_cache
+from fastapi import APIRouter, Request, Response
 from pydantic import BaseModel
 
 router = APIRouter(prefix="/holidays", tags=["공휴일"])
 
+_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _root not in sys.path:
+    sys.path.insert(0, _root)
+
+# 공휴일 표는 연 단위로 고정 → 브라우저/프록시 캐시 허용 (하루)
+_CACHE_CONTROL = "public, max-age=86400"
+
 
 class HolidayItem(BaseModel):
     day: int
     name: str
 
 
+@lru_cache(maxsize=64)
+def _month_payload(year: int, month: int) -> tuple[tuple[tuple[int, str], ...], str]:
+    """(공휴일 목록, ETag) — 연월별 1회 계산"""
+    from engine.kr_holidays import get_holidays_for_month
+    items = tuple(get_holidays_for_month(year, month))
+    digest = hashlib.sha1(repr(items).encode("utf-8")).hexdigest()[:16]
+    return items, f'"{digest}"'
+
+
 @router.get("", response_model=list[HolidayItem])
-def get_holidays(year: int, month: int):
-    import sys, os
-    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    if root not in sys.path:
-        sys.path.insert(0, root)
+def get_holidays(year: int, month: int, request: Request, response: Response):
+    items, etag = _month_payload(year, month)
+    headers = {"ETag": etag, "Cache-Control": _CACHE_CONTROL}
 
-    from engine.kr_holidays import get_holidays_for_month
-    result = get_holidays_for_month(year, month)
-    return [HolidayItem(day=day, name=name) for day, name in result]
+    # 조건부 GET: 변경 없으면 본문 없이 304
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in {t.strip().removeprefix("W/") for t in if_none_match.split(",")} or if_none_match.strip() == "*":
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return [HolidayItem(day=day, name=name) for day, name in items]
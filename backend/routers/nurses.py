@@ -212,7 +212,9 @@ def import_prev_excel(
     if root not in sys.path:
         sys.path.insert(0, root)
     from engine.models import is_pair_first_month
-    from engine.excel_io import import_prev_schedule, detect_file_month, import_prev_menstrual
+    from engine.excel_io import (
+        WorkbookSession, import_prev_schedule, detect_file_month, import_prev_menstrual,
+    )
     from datetime import date, timedelta
 
     db = get_db()
@@ -251,20 +253,23 @@ def import_prev_excel(
         nurses_res = db_nurses(db).order("sort_order").execute()
         nurse_names = [n["name"] for n in nurses_res.data]
 
+        # 복호화·파싱 1회 → 아래 세 단계가 같은 세션 공유
+        session = WorkbookSession(tmp_path)
+
         # 이전 근무표 시작일 탐지 — import_prev_schedule에 넘겨 월별 N 분류에 사용
-        year, month = detect_file_month(tmp_path)
+        year, month = detect_file_month(session)
         prev_start_date = date(year, month, 1) if year and month else expected_prev
 
         TAIL_DAYS = 5
         tail_result, n_counts_by_month, sleep_counts, vac_days = import_prev_schedule(
-            tmp_path, nurse_names, TAIL_DAYS,
+            session, nurse_names, TAIL_DAYS,
             expected_start_date=expected_prev,
             start_date=prev_start_date,
         )
 
         # 생휴 월별 집계
         menstrual_counts = (
-            import_prev_menstrual(tmp_path, nurse_names, prev_start_date)
+            import_prev_menstrual(session, nurse_names, prev_start_date)
             if prev_start_date else {}
         )
 
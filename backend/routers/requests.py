@@ -4,13 +4,21 @@ import os
 import re
 import sys
 import tempfile
-from datetime import datetime
-from fastapi import APIRouter, HTTPException, Depends, UploadFile, File
-from fastapi.responses import StreamingResponse
-from ..database import get_db, db_nurses, get_period_by_id
+from datetime import datetime, timezone
+from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Query, Request
+from ..artifact_cache import content_key, cached_xlsx_response, data_version
+from ..database import get_db, db_nurses, get_period_by_id, is_missing_rpc
 from ..deps import get_current_admin, get_current_any
-from ..schemas import RequestOut, RequestsUpsertBody, SubmissionStatus, NurseScoreOut, AssignmentLogEntry
+from ..events import publish_submission
+from ..schemas import (
+    RequestOut, RequestDelta, RequestsUpsertBody, SubmissionStatus, SubmissionStatusDelta, NurseScoreOut,
+    AssignmentLogEntry,
+)
 from ..config import settings
+from ..request_rules import (
+    A_CONDITION_LIMIT, A_LIMIT_HINT, a_limit_message,
+    desired_request_items, diff_request_rows, score_request_items,
+)
 
 router = APIRouter(prefix="/requests", tags=["근무신청"])
 
@@ -37,6 +45,41 @@ def get_all_requests(period_id: str, _: dict = Depends(get_current_admin)):
     return [_row_to_out(r) for r in res.data]
 
 
+@router.get("/{period_id}/delta", response_model=RequestDelta)
+def get_requests_delta(
+    period_id: str,
+    cursor: str | None = Query(None, description="이전 응답의 cursor (없으면 전체 스냅샷)"),
+    _: dict = Depends(get_current_admin),
+):
+    """커서 이후 바뀐 신청 행 + 삭제 tombstone (관리자 그리드 증분 동기화)
+
+    period_request_delta RPC: 커서 = 트랜잭션 스냅샷 xmin (xid8).
+    조회 시점에 진행 중이던 트랜잭션의 변경도 다음 조회에서 빠짐없이 반환 (중복은 id 기준 병합으로 무해).
+    """
+    if cursor is not None and not cursor.isdigit():
+        raise HTTPException(400, "cursor 형식이 올바르지 않습니다.")
+
+    db = get_db()
+    try:
+        data = db.rpc("period_request_delta", {
+            "p_period_id": period_id,
+            "p_cursor": cursor,
+        }).execute().data or {}
+    except Exception as e:
+        if not is_missing_rpc(e):
+            raise
+        # 증분 미지원 환경: 항상 전체 스냅샷
+        res = db.table("requests").select("*").eq("period_id", period_id).execute()
+        return RequestDelta(full=True, rows=[_row_to_out(r) for r in res.data])
+
+    return RequestDelta(
+        cursor=data.get("cursor"),
+        full=bool(data.get("full")),
+        rows=[_row_to_out(r) for r in data.get("rows") or []],
+        deleted=[str(i) for i in data.get("deleted") or []],
+    )
+
+
 @router.get("/{period_id}/me", response_model=list[RequestOut])
 def get_my_requests(period_id: str, current: dict = Depends(get_current_any)):
     """본인 신청만 조회 (간호사)"""
@@ -52,34 +95,105 @@ def get_my_requests(period_id: str, current: dict = Depends(get_current_any)):
     return [_row_to_out(r) for r in res.data]
 
 
-@router.get("/{period_id}/status", response_model=list[SubmissionStatus])
-def get_submission_status(period_id: str, _: dict = Depends(get_current_admin)):
-    """각 간호사 제출 여부 + 제출 시각"""
+@router.get("/{period_id}/status", response_model=SubmissionStatusDelta)
+def get_submission_status(
+    period_id: str,
+    cursor: str | None = Query(None, description="이전 응답의 cursor (없으면 전체)"),
+    _: dict = Depends(get_current_admin),
+):
+    """각 간호사 제출 여부 + 제출 시각 + 신청 수·A조건 수·점수
+
+    period_submission_status RPC가 DB에서 간호사별로 집계 → 응답 크기는 간호사 수에만 비례.
+    cursor 지정 시 그 이후 신청/점수가 바뀐 간호사만 반환 (증분 새로고침).
+    커서 = 스냅샷 xmin (xid8, /delta와 같은 방식) → 조회 중 진행되던 저장도 다음 조회에 포함.
+    RPC 미배포 환경은 제출 시각 커서로 폴백 (커서 형식이 다르면 전체 반환).
+    """
     db = get_db()
-    nurses = db_nurses(db).order("sort_order").execute().data
+    try:
+        data = db.rpc("period_submission_status", {
+            "p_period_id": period_id,
+            "p_department_id": settings.department_id,
+            "p_cursor": cursor if cursor and cursor.isdigit() else None,
+        }).execute().data or {}
+    except Exception as e:
+        if not is_missing_rpc(e):
+            raise
+        data = _submission_status_fallback(db, period_id, cursor)
+
+    return SubmissionStatusDelta(
+        cursor=data.get("cursor"),
+        full=bool(data.get("full")),
+        rows=[
+            SubmissionStatus(
+                nurse_id=r["nurse_id"],
+                name=r["name"],
+                submitted_at=str(r["submitted_at"]) if r.get("submitted_at") else None,
+                request_count=r.get("request_count") or 0,
+                a_count=r.get("a_count") or 0,
+                score=r["score"] if r.get("score") is not None else 100,
+                changed_at=str(r["changed_at"]) if r.get("changed_at") else None,
+            )
+            for r in data.get("rows") or []
+        ],
+    )
+
+
+def _submission_status_fallback(db, period_id: str, cursor: str | None) -> dict:
+    """RPC 미배포 환경: 신청 행 전체를 가져와 Python에서 같은 집계
 
-    # 제출한 간호사 목록 (최신 submitted_at 기준)
-    req_res = (
+    커서 = 마지막 제출 시각 최댓값 (UTC ISO). 시각은 파싱해서 비교 (문자열 형식 차이 무관).
+    트랜잭션 순서가 아닌 시각 기준이라 조회와 겹친 저장을 놓칠 수 있음 → RPC 배포 권장.
+    """
+    try:
+        since_dt = _parse_ts(cursor) if cursor else None
+    except ValueError:
+        since_dt = None  # xid8 커서 등 다른 형식 → 전체
+
+    nurses = db_nurses(db).order("sort_order").execute().data
+    req_rows = (
         db.table("requests")
-        .select("*")
+        .select("nurse_id, day, code, is_or, condition, submitted_at")
         .eq("period_id", period_id)
-        .order("submitted_at", desc=True)
         .execute()
+        .data
     )
-    submitted_map: dict[str, str] = {}
-    for r in req_res.data:
-        nid = r["nurse_id"]
-        if nid not in submitted_map:
-            submitted_map[nid] = str(r.get("submitted_at", ""))
-
-    return [
-        SubmissionStatus(
-            nurse_id=n["id"],
-            name=n["name"],
-            submitted_at=submitted_map.get(n["id"]),
-        )
-        for n in nurses
-    ]
+    scores = {
+        r["nurse_id"]: r["score"]
+        for r in db.table("nurse_scores").select("nurse_id, score").eq("period_id", period_id).execute().data
+    }
+
+    by_nurse: dict[str, list[dict]] = {}
+    for r in req_rows:
+        by_nurse.setdefault(r["nurse_id"], []).append(r)
+
+    rows = []
+    newest = since_dt
+    for n in nurses:
+        reqs = by_nurse.get(n["id"], [])
+        last = max((_parse_ts(str(r["submitted_at"])) for r in reqs if r.get("submitted_at")), default=None)
+        if last is not None and (newest is None or last > newest):
+            newest = last
+        if since_dt is not None and (last is None or last <= since_dt):
+            continue
+        rows.append({
+            "nurse_id": n["id"],
+            "name": n["name"],
+            "submitted_at": last.isoformat() if last else None,
+            "request_count": len(reqs),
+            "a_count": score_request_items(reqs)[0],
+            "score": scores.get(n["id"], 100),
+            "changed_at": last.isoformat() if last else None,
+        })
+    return {
+        "cursor": newest.isoformat() if newest else None,
+        "full": since_dt is None,
+        "rows": rows,
+    }
+
+
+def _parse_ts(value: str) -> datetime:
+    dt = datetime.fromisoformat(value)
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
 
 
 @router.put("/{period_id}/{nurse_id}", response_model=list[RequestOut])
@@ -113,62 +227,106 @@ def upsert_requests(
             pass
 
     now_iso = datetime.utcnow().isoformat()
+    items = [
+        {"day": i.day, "code": i.code, "is_or": i.is_or, "note": i.note or '', "condition": i.condition}
+        for i in body.items
+    ]
+    desired = desired_request_items(items)
 
-    # ── 우선순위: 병가 제외 대상 코드 ──
-    _SKIP_PRIORITY = {"병가", "법휴", "필수"}
+    rows = _submit_nurse_requests(db, period_id, nurse_id, items, desired, now_iso)
+    publish_submission(period_id, nurse_id=nurse_id, request_count=len(rows))
+    order = {key: i for i, key in enumerate(desired)}
+    rows.sort(key=lambda r: order.get((r["day"], r["code"]), len(order)))
+    return [_row_to_out(r) for r in rows]
 
-    # OR 신청은 같은 날 여러 코드가 하나의 신청 → day 기준으로 중복 제거 후 집계
-    _seen_or_days: set[int] = set()
-    _counted_items = []
-    for item in body.items:
-        if item.code in _SKIP_PRIORITY:
-            continue
-        if item.is_or:
-            if item.day in _seen_or_days:
-                continue
-            _seen_or_days.add(item.day)
-        _counted_items.append(item)
+
+def _submit_nurse_requests(
+    db, period_id: str, nurse_id: str, items: list[dict],
+    desired: dict[tuple[int, str], dict], now_iso: str,
+) -> list[dict]:
+    """A조건 검증 + 점수 계산 + 신청 저장
+
+    submit_nurse_requests RPC: 검증·점수·저장을 DB 안에서 한 트랜잭션으로 처리 (1회 왕복).
+    RPC 미배포 환경에서는 같은 규칙(request_rules)을 여기서 계산한 뒤 _save_nurse_requests.
+    """
+    try:
+        res = db.rpc("submit_nurse_requests", {
+            "p_period_id": period_id,
+            "p_nurse_id": nurse_id,
+            "p_items": items,
+        }).execute()
+        return list((res.data or {}).get("rows") or [])
+    except Exception as e:
+        if getattr(e, "hint", None) == A_LIMIT_HINT:
+            raise HTTPException(400, getattr(e, "message", None) or str(e))
+        if not is_missing_rpc(e):
+            raise
 
     # A조건 최대 3개 검증 (병가 제외, OR 그룹은 1개로 카운트)
-    new_a_count = sum(1 for item in _counted_items if item.condition == 'A')
-    if new_a_count > 3:
-        raise HTTPException(400, f"A조건은 월 최대 3개까지 신청 가능합니다. (현재 {new_a_count}개)")
-
-    # 점수 = 100 - 차감액 (OR 그룹은 1번만 차감)
-    new_score = 100 - sum(
-        1 if item.condition == 'A' else 3
-        for item in _counted_items
-    )
+    a_count, score = score_request_items(items)
+    if a_count > A_CONDITION_LIMIT:
+        raise HTTPException(400, a_limit_message(a_count))
+    return _save_nurse_requests(db, period_id, nurse_id, score, desired, now_iso)
 
-    # nurse_scores upsert
-    db.table("nurse_scores").upsert({
-        "period_id": period_id,
-        "nurse_id": nurse_id,
-        "score": new_score,
-    }, on_conflict="period_id,nurse_id").execute()
 
-    # 기존 신청 전체 삭제 후 재삽입
-    db.table("requests").delete().eq("period_id", period_id).eq("nurse_id", nurse_id).execute()
+def _save_nurse_requests(
+    db, period_id: str, nurse_id: str, score: int,
+    desired: dict[tuple[int, str], dict], now_iso: str,
+) -> list[dict]:
+    """간호사 1명의 신청을 기존 행과 비교해 바뀐 행만 추가/수정/삭제 + 점수 저장
 
-    if not body.items:
-        return []
+    save_nurse_requests RPC (단일 트랜잭션, 1회 왕복) 우선.
+    RPC 미배포 환경에서는 기존 행 조회 후 같은 diff를 테이블 API로 적용.
+    변경 없는 행은 그대로 두므로 submitted_at은 실제로 바뀐 행에만 갱신됨.
 
-    rows = [
-        {
+    Returns: 저장 후 해당 간호사의 전체 신청 행
+    """
+    try:
+        res = db.rpc("save_nurse_requests", {
+            "p_period_id": period_id,
+            "p_nurse_id": nurse_id,
+            "p_score": score,
+            "p_items": list(desired.values()),
+        }).execute()
+        return list(res.data or [])
+    except Exception as e:
+        if not is_missing_rpc(e):
+            raise
+
+    existing = (
+        db.table("requests")
+        .select("*")
+        .eq("period_id", period_id)
+        .eq("nurse_id", nurse_id)
+        .execute()
+        .data
+    )
+    to_delete, to_update, to_insert, kept = diff_request_rows(existing, desired, score)
+    owner = {"period_id": period_id, "nurse_id": nurse_id, "submitted_at": now_iso}
+
+    # 트랜잭션이 없으므로 추가 → 수정 → 삭제 → 점수 순서 (첫 쓰기 실패 시 변경 없음).
+    # 중간 실패면 일부만 저장된 상태 → 500으로 알림 (다시 저장하면 남은 diff만 적용됨)
+    written = 0
+    try:
+        if to_insert:
+            kept += db.table("requests").insert([{**r, **owner} for r in to_insert]).execute().data
+            written += 1
+        if to_update:
+            kept += db.table("requests").upsert([{**r, **owner} for r in to_update]).execute().data
+            written += 1
+        if to_delete:
+            db.table("requests").delete().in_("id", to_delete).execute()
+            written += 1
+        db.table("nurse_scores").upsert({
             "period_id": period_id,
             "nurse_id": nurse_id,
-            "day": item.day,
-            "code": item.code,
-            "is_or": item.is_or,
-            "note": item.note or '',
-            "submitted_at": now_iso,
-            "condition": item.condition if item.code not in _SKIP_PRIORITY else 'B',
-            "score": new_score,  # 차감 후 점수를 스냅샷으로 저장
-        }
-        for item in body.items
-    ]
-    res = db.table("requests").insert(rows).execute()
-    return [_row_to_out(r) for r in res.data]
+            "score": score,
+        }, on_conflict="period_id,nurse_id").execute()
+    except Exception as e:
+        if not written:
+            raise
+        raise HTTPException(500, f"신청이 일부만 저장되었습니다. 다시 저장해 주세요: {e}")
+    return kept
 
 
 @router.get("/{period_id}/score/{nurse_id}", response_model=NurseScoreOut)
@@ -208,6 +366,7 @@ def reset_scores(period_id: str, _: dict = Depends(get_current_admin)):
     nurses = db_nurses(db).execute().data
     rows = [{"period_id": period_id, "nurse_id": n["id"], "score": 100} for n in nurses]
     db.table("nurse_scores").upsert(rows, on_conflict="period_id,nurse_id").execute()
+    publish_submission(period_id, source="reset-scores")
     return {"reset": len(rows)}
 
 
@@ -232,6 +391,7 @@ def recalc_scores(period_id: str, _: dict = Depends(get_current_admin)):
         for n in nurses
     ]
     db.table("nurse_scores").upsert(rows, on_conflict="period_id,nurse_id").execute()
+    publish_submission(period_id, source="recalc-scores")
     return {"recalculated": len(rows)}
 
 
@@ -266,162 +426,176 @@ def get_assignment_log(period_id: str, day: int, code: str, _: dict = Depends(ge
 
 
 @router.get("/{period_id}/export")
-def export_requests_excel(period_id: str, _: dict = Depends(get_current_admin)):
+def export_requests_excel(period_id: str, request: Request, _: dict = Depends(get_current_admin)):
     """신청현황 xlsx 다운로드 — request_example 포맷"""
     db = get_db()
-    period = get_period_by_id(db, period_id)
-    if not period:
-        raise HTTPException(404)
-
-    nurses = db_nurses(db).order("sort_order").execute().data
-    req_res = db.table("requests").select("*").eq("period_id", period_id).execute().data
+    version = data_version(db, period_id=period_id)
+
+    def load() -> tuple:
+        period = get_period_by_id(db, period_id)
+        if not period:
+            raise HTTPException(404)
+        nurses = db_nurses(db).order("sort_order").execute().data
+        req_res = db.table("requests").select("*").eq("period_id", period_id).execute().data
+        # 부서명 조회
+        try:
+            dept_res = db.table("departments").select("name").eq("id", settings.department_id).single().execute()
+            dept_name = dept_res.data.get("name", "") if dept_res.data else ""
+        except Exception:
+            dept_name = ""
+        return period, nurses, req_res, dept_name
+
+    if version is not None:
+        # 데이터 버전만으로 키 결정 → 캐시/ETag 적중 시 입력 조회 없음
+        key = content_key("requests", period_id, version["version"])
+        loaded = None
+    else:
+        # RPC 미배포: 간호사·요청·기간·부서명 내용 해시 (요청은 PostgREST 행 순서와 무관하게 정렬)
+        loaded = load()
+        period, nurses, req_res, dept_name = loaded
+        key = content_key(
+            "requests", period_id, period["start_date"], dept_name, nurses,
+            sorted(
+                (r["nurse_id"], r["day"], r["code"], r.get("is_or", False), r.get("note") or "")
+                for r in req_res
+            ),
+        )
 
-    # 부서명 조회
-    try:
-        dept_res = db.table("departments").select("name").eq("id", settings.department_id).single().execute()
-        dept_name = dept_res.data.get("name", "") if dept_res.data else ""
-    except Exception:
-        dept_name = ""
-
-    # nurse_id → {day: {codes: [...], note: str}} 맵
-    req_map: dict[str, dict[int, dict]] = {n["id"]: {} for n in nurses}
-    for r in req_res:
-        nid = r["nurse_id"]
-        day = r["day"]
-        code = r["code"]
-        is_or = r.get("is_or", False)
-        note = r.get("note") or ""
-        if day not in req_map.setdefault(nid, {}):
-            req_map[nid][day] = {"codes": [], "note": note}
-        req_map[nid][day]["codes"].append((code, is_or))
-        if note:
-            req_map[nid][day]["note"] = note
-
-    from openpyxl import Workbook
-    from openpyxl.styles import PatternFill, Font, Alignment, Border, Side
-    from openpyxl.utils import get_column_letter
     from datetime import date, timedelta
-
-    start = date.fromisoformat(period["start_date"])
+    start = date.fromisoformat((loaded[0] if loaded else version)["start_date"])
     end = start + timedelta(days=27)
-    WD = ["월", "화", "수", "목", "금", "토", "일"]
-    NUM_DAYS = 28
-
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "근무신청현황"
-
-    YELLOW_FILL = PatternFill("solid", fgColor="fcfb92")
-    WEEKEND_FILL = PatternFill("solid", fgColor="F2F2F2")
-    HEADER_FILL = PatternFill("solid", fgColor="D9D9D9")
-    TITLE_FILL = PatternFill("solid", fgColor="4472C4")
-    CENTER = Alignment(horizontal="center", vertical="center")
-    BLACK_BORDER = Border(
-        left=Side(style="thin", color="000000"),
-        right=Side(style="thin", color="000000"),
-        top=Side(style="thin", color="000000"),
-        bottom=Side(style="thin", color="000000"),
-    )
 
-    def apply_border(cell):
-        cell.border = BLACK_BORDER
-
-    # ── 행1: 타이틀 (병합)
-    total_cols = NUM_DAYS + 1  # 이름 열 + 날짜 열
-    title_text = f"{start.strftime('%Y.%m.%d')} ~ {end.strftime('%Y.%m.%d')}  {dept_name} 근무신청표"
-    ws.merge_cells(start_row=1, start_column=1, end_row=1, end_column=total_cols)
-    title_cell = ws.cell(1, 1, title_text)
-    title_cell.font = Font(bold=True, size=12, color="FFFFFF")
-    title_cell.fill = TITLE_FILL
-    title_cell.alignment = CENTER
-    ws.row_dimensions[1].height = 22
-
-    # ── 행2: 날짜
-    c0 = ws.cell(2, 1, "")
-    c0.fill = HEADER_FILL; apply_border(c0)
-    for i in range(NUM_DAYS):
-        d = start + timedelta(days=i)
-        wd = d.weekday()
-        cell = ws.cell(2, i + 2, f"{d.day}일")
-        cell.alignment = CENTER
-        cell.font = Font(bold=True, size=9, color="CC0000" if wd >= 5 else "000000")
-        cell.fill = WEEKEND_FILL if wd >= 5 else HEADER_FILL
-        apply_border(cell)
-
-    # ── 행3: 이름 헤더 + 요일
-    c1 = ws.cell(3, 1, "이름")
-    c1.font = Font(bold=True, size=10); c1.alignment = CENTER; c1.fill = HEADER_FILL; apply_border(c1)
-    for i in range(NUM_DAYS):
-        d = start + timedelta(days=i)
-        wd = d.weekday()
-        cell = ws.cell(3, i + 2, WD[wd])
-        cell.alignment = CENTER
-        cell.font = Font(size=9, color="CC0000" if wd >= 5 else "333333")
-        cell.fill = WEEKEND_FILL if wd >= 5 else HEADER_FILL
-        apply_border(cell)
-
-    # ── 행4+: 간호사별
-    for nurse in nurses:
-        row_idx = ws.max_row + 1
-        shifts_raw = req_map.get(nurse["id"], {})
-
-        nc = ws.cell(row_idx, 1, nurse["name"])
-        nc.font = Font(size=10); nc.alignment = CENTER; apply_border(nc)
+    def build() -> bytes:
+        period, nurses, req_res, dept_name = loaded or load()
+        # nurse_id → {day: {codes: [...], note: str}} 맵
+        req_map: dict[str, dict[int, dict]] = {n["id"]: {} for n in nurses}
+        for r in req_res:
+            nid = r["nurse_id"]
+            day = r["day"]
+            code = r["code"]
+            is_or = r.get("is_or", False)
+            note = r.get("note") or ""
+            if day not in req_map.setdefault(nid, {}):
+                req_map[nid][day] = {"codes": [], "note": note}
+            req_map[nid][day]["codes"].append((code, is_or))
+            if note:
+                req_map[nid][day]["note"] = note
+
+        from openpyxl import Workbook
+        from openpyxl.styles import PatternFill, Font, Alignment, Border, Side
+        from openpyxl.utils import get_column_letter
+        WD = ["월", "화", "수", "목", "금", "토", "일"]
+        NUM_DAYS = 28
+
+        wb = Workbook()
+        ws = wb.active
+        ws.title = "근무신청현황"
+
+        YELLOW_FILL = PatternFill("solid", fgColor="fcfb92")
+        WEEKEND_FILL = PatternFill("solid", fgColor="F2F2F2")
+        HEADER_FILL = PatternFill("solid", fgColor="D9D9D9")
+        TITLE_FILL = PatternFill("solid", fgColor="4472C4")
+        CENTER = Alignment(horizontal="center", vertical="center")
+        BLACK_BORDER = Border(
+            left=Side(style="thin", color="000000"),
+            right=Side(style="thin", color="000000"),
+            top=Side(style="thin", color="000000"),
+            bottom=Side(style="thin", color="000000"),
+        )
 
+        def apply_border(cell):
+            cell.border = BLACK_BORDER
+
+        # ── 행1: 타이틀 (병합)
+        total_cols = NUM_DAYS + 1  # 이름 열 + 날짜 열
+        title_text = f"{start.strftime('%Y.%m.%d')} ~ {end.strftime('%Y.%m.%d')}  {dept_name} 근무신청표"
+        ws.merge_cells(start_row=1, start_column=1, end_row=1, end_column=total_cols)
+        title_cell = ws.cell(1, 1, title_text)
+        title_cell.font = Font(bold=True, size=12, color="FFFFFF")
+        title_cell.fill = TITLE_FILL
+        title_cell.alignment = CENTER
+        ws.row_dimensions[1].height = 22
+
+        # ── 행2: 날짜
+        c0 = ws.cell(2, 1, "")
+        c0.fill = HEADER_FILL; apply_border(c0)
         for i in range(NUM_DAYS):
-            day = i + 1
             d = start + timedelta(days=i)
             wd = d.weekday()
-            col = i + 2
-            cell = ws.cell(row_idx, col)
-
-            fixed_off = nurse.get("fixed_weekly_off")
-            is_fixed_off = fixed_off is not None and fixed_off != "" and int(fixed_off) == wd
-
-            if is_fixed_off:
-                cell.value = "주"
-                cell.fill = WEEKEND_FILL if wd >= 5 else PatternFill("solid", fgColor="FFFFFF")
-                cell.alignment = CENTER
-                cell.font = Font(size=9, color="666666")
-            elif shifts_raw.get(day):
-                entry = shifts_raw[day]
-                codes = entry["codes"]
-                note = entry.get("note", "")
-                or_entries = [c for c, is_or in codes if is_or]
-                non_or = [c for c, is_or in codes if not is_or]
-                if or_entries:
-                    cell.value = "/".join(or_entries)
-                else:
-                    cell.value = non_or[0] if non_or else ""
-                cell.fill = YELLOW_FILL
-                cell.alignment = CENTER
-                if note:
-                    from openpyxl.comments import Comment
-                    cell.comment = Comment(note, "간호사")
-            else:
-                cell.value = ""
-                if wd >= 5:
-                    cell.fill = WEEKEND_FILL
-                cell.alignment = CENTER
+            cell = ws.cell(2, i + 2, f"{d.day}일")
+            cell.alignment = CENTER
+            cell.font = Font(bold=True, size=9, color="CC0000" if wd >= 5 else "000000")
+            cell.fill = WEEKEND_FILL if wd >= 5 else HEADER_FILL
             apply_border(cell)
 
-    # ── 열 너비
-    ws.column_dimensions["A"].width = 12
-    for i in range(NUM_DAYS):
-        ws.column_dimensions[get_column_letter(i + 2)].width = 6
+        # ── 행3: 이름 헤더 + 요일
+        c1 = ws.cell(3, 1, "이름")
+        c1.font = Font(bold=True, size=10); c1.alignment = CENTER; c1.fill = HEADER_FILL; apply_border(c1)
+        for i in range(NUM_DAYS):
+            d = start + timedelta(days=i)
+            wd = d.weekday()
+            cell = ws.cell(3, i + 2, WD[wd])
+            cell.alignment = CENTER
+            cell.font = Font(size=9, color="CC0000" if wd >= 5 else "333333")
+            cell.fill = WEEKEND_FILL if wd >= 5 else HEADER_FILL
+            apply_border(cell)
+
+        # ── 행4+: 간호사별
+        for nurse in nurses:
+            row_idx = ws.max_row + 1
+            shifts_raw = req_map.get(nurse["id"], {})
+
+            nc = ws.cell(row_idx, 1, nurse["name"])
+            nc.font = Font(size=10); nc.alignment = CENTER; apply_border(nc)
+
+            for i in range(NUM_DAYS):
+                day = i + 1
+                d = start + timedelta(days=i)
+                wd = d.weekday()
+                col = i + 2
+                cell = ws.cell(row_idx, col)
+
+                fixed_off = nurse.get("fixed_weekly_off")
+                is_fixed_off = fixed_off is not None and fixed_off != "" and int(fixed_off) == wd
+
+                if is_fixed_off:
+                    cell.value = "주"
+                    cell.fill = WEEKEND_FILL if wd >= 5 else PatternFill("solid", fgColor="FFFFFF")
+                    cell.alignment = CENTER
+                    cell.font = Font(size=9, color="666666")
+                elif shifts_raw.get(day):
+                    entry = shifts_raw[day]
+                    codes = entry["codes"]
+                    note = entry.get("note", "")
+                    or_entries = [c for c, is_or in codes if is_or]
+                    non_or = [c for c, is_or in codes if not is_or]
+                    if or_entries:
+                        cell.value = "/".join(or_entries)
+                    else:
+                        cell.value = non_or[0] if non_or else ""
+                    cell.fill = YELLOW_FILL
+                    cell.alignment = CENTER
+                    if note:
+                        from openpyxl.comments import Comment
+                        cell.comment = Comment(note, "간호사")
+                else:
+                    cell.value = ""
+                    if wd >= 5:
+                        cell.fill = WEEKEND_FILL
+                    cell.alignment = CENTER
+                apply_border(cell)
+
+        # ── 열 너비
+        ws.column_dimensions["A"].width = 12
+        for i in range(NUM_DAYS):
+            ws.column_dimensions[get_column_letter(i + 2)].width = 6
 
-    buf = io.BytesIO()
-    wb.save(buf)
-    buf.seek(0)
+        buf = io.BytesIO()
+        wb.save(buf)
+        return buf.getvalue()
 
-    from urllib.parse import quote
     filename = f"{start.strftime('%Y.%m.%d')}~{end.strftime('%Y.%m.%d')}_신청표.xlsx"
-    encoded = quote(filename, safe='')
-    return StreamingResponse(
-        buf,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": f"attachment; filename*=UTF-8''{encoded}"},
-    )
+    return cached_xlsx_response(request, key, build, filename)
 
 
 @router.post("/{period_id}/import")
@@ -516,9 +690,10 @@ def import_requests_excel(
                 data_start = check_row[0].row + 1
                 break
 
-        # 데이터 파싱
+        # 데이터 파싱 — 시트 전체를 먼저 읽고 DB 반영은 마지막에 한 번에
         now_iso = datetime.utcnow().isoformat()
         imported, skipped = 0, []
+        parsed: dict[str, list[dict]] = {}  # nurse_id → 신청 행 (같은 이름 재등장 시 마지막 행 우선)
 
         for row in ws.iter_rows(min_row=data_start):
             row_dict = {cell.column: cell.value for cell in row if hasattr(cell, 'column')}
@@ -561,9 +736,14 @@ def import_requests_excel(
                         "condition": "B", "score": 100,
                     })
 
-            db.table("requests").delete().eq("period_id", period_id).eq("nurse_id", nurse_id).execute()
-            if items:
-                db.table("requests").insert(items).execute()
+            # 같은 날 같은 코드 중복 제거 (UNIQUE(period_id, nurse_id, day, code))
+            seen: set[tuple[int, str]] = set()
+            unique_items = []
+            for it in items:
+                if (it["day"], it["code"]) not in seen:
+                    seen.add((it["day"], it["code"]))
+                    unique_items.append(it)
+            parsed[nurse_id] = unique_items
             imported += 1
 
         wb.close()
@@ -573,7 +753,86 @@ def import_requests_excel(
         except Exception:
             pass
 
+    diff = _replace_period_requests(db, period_id, parsed)
+    publish_submission(period_id, source="import", nurse_ids=list(parsed))
+
     msg = f"{imported}명 신청 가져오기 완료"
+    msg += f" (추가 {diff['added']} · 삭제 {diff['removed']} · 유지 {diff['unchanged']})"
     if skipped:
         msg += f" (미매칭 {len(skipped)}명: {', '.join(skipped[:5])}{'...' if len(skipped) > 5 else ''})"
-    return {"imported": imported, "skipped": skipped, "message": msg}
+    return {"imported": imported, "skipped": skipped, "diff": diff, "message": msg}
+
+
+def _request_key(r: dict) -> tuple:
+    return (r["nurse_id"], r["day"], r["code"], bool(r.get("is_or")), r.get("note") or "")
+
+
+def _replace_period_requests(db, period_id: str, parsed: dict[str, list[dict]]) -> dict:
+    """가져온 간호사들의 기간 신청을 한 번에 교체하고 변경 요약 반환
+
+    replace_period_requests RPC (단일 트랜잭션, 1회 왕복) 우선.
+    RPC 미배포 환경에서는 트랜잭션이 없으므로 바뀐 행만 조회 1회 + upsert 1회 + 삭제 1회:
+      - upsert(추가·수정)를 먼저 → 실패하면 아무것도 바뀌지 않음
+      - 이어지는 삭제가 실패하면 일부만 반영된 상태 → 500으로 알리고 재가져오기 안내
+        (같은 파일을 다시 가져오면 남은 삭제만 적용됨)
+    """
+    empty = {"added": 0, "removed": 0, "unchanged": 0, "deleted": 0, "inserted": 0}
+    if not parsed:
+        return empty
+    nurse_ids = list(parsed)
+    rows = [r for items in parsed.values() for r in items]
+
+    try:
+        res = db.rpc("replace_period_requests", {
+            "p_period_id": period_id,
+            "p_nurse_ids": nurse_ids,
+            "p_rows": [
+                {k: r[k] for k in ("nurse_id", "day", "code", "is_or", "note")}
+                for r in rows
+            ],
+        }).execute()
+        return {**empty, **(res.data or {})}
+    except Exception as e:
+        if not is_missing_rpc(e):
+            raise HTTPException(500, f"신청 가져오기 저장 실패: {e}")
+
+    old = (
+        db.table("requests")
+        .select("id, nurse_id, day, code, is_or, note")
+        .eq("period_id", period_id)
+        .in_("nurse_id", nurse_ids)
+        .execute()
+        .data
+    )
+    old_by_slot = {_request_key(r)[:3]: r for r in old}
+    new_by_slot = {_request_key(r)[:3]: r for r in rows}
+    to_upsert = [
+        r for slot, r in new_by_slot.items()
+        if slot not in old_by_slot or _request_key(old_by_slot[slot]) != _request_key(r)
+    ]
+    to_delete = [r["id"] for slot, r in old_by_slot.items() if slot not in new_by_slot]
+
+    if to_upsert:
+        try:
+            db.table("requests").upsert(to_upsert, on_conflict="period_id,nurse_id,day,code").execute()
+        except Exception as e:
+            raise HTTPException(500, f"신청 가져오기 저장 실패 (변경 없음): {e}")
+    if to_delete:
+        try:
+            db.table("requests").delete().in_("id", to_delete).execute()
+        except Exception as e:
+            raise HTTPException(
+                500,
+                f"신청 가져오기가 일부만 반영되었습니다 (추가·수정 {len(to_upsert)}건 저장, "
+                f"삭제 {len(to_delete)}건 실패). 같은 파일을 다시 가져오세요: {e}",
+            )
+
+    old_keys = {_request_key(r) for r in old}
+    new_keys = {_request_key(r) for r in rows}
+    return {
+        "added": len(new_keys - old_keys),
+        "removed": len(old_keys - new_keys),
+        "unchanged": len(new_keys & old_keys),
+        "deleted": len(to_delete),
+        "inserted": len(to_upsert),
+    }
@@ -11,6 +11,7 @@ from ..schemas import (
 )
 from ..config import settings
 from ..worker import run_solver_job, _convert_rules
+from ..events import publish_job
 
 router = APIRouter(prefix="/schedule", tags=["근무표"])
 
@@ -121,6 +122,7 @@ async def generate_schedule(
         "status": "pending",
     }).execute()
     job_id = job_res.data[0]["id"]
+    publish_job(job_id, body.period_id, "pending")
 
     background_tasks.add_task(run_solver_job, job_id, body.period_id, db)
     return JobStatusOut(job_id=job_id, status="pending")
@@ -139,6 +141,7 @@ def get_latest_job_by_period(period_id: str, _: dict = Depends(get_current_admin
         status=job["status"],
         schedule_id=job.get("schedule_id"),
         error_msg=job.get("error_msg"),
+        telemetry=job.get("telemetry"),
     )
 
 
@@ -160,6 +163,7 @@ def get_job_status(job_id: str, _: dict = Depends(get_current_admin)):
         status=job["status"],
         schedule_id=schedule_id,
         error_msg=job.get("error_msg"),
+        telemetry=job.get("telemetry"),
     )
 
 
@@ -119,6 +119,21 @@ class SubmissionStatus(BaseModel):
     nurse_id: str
     name: str
     submitted_at: str | None = None   # None이면 미제출
+    request_count: int = 0
+    a_count: int = 0                  # OR 그룹은 1개로 집계, 병가/법휴/필수 제외
+    score: int = 100
+    changed_at: str | None = None     # 신청·점수 마지막 변경 시각 (표시용 — 증분 조회는 커서 사용)
+
+class SubmissionStatusDelta(BaseModel):
+    cursor: str | None = None            # 다음 조회에 넘길 커서 (서버가 정한 불투명 문자열)
+    full: bool = False                   # True면 rows가 전체 → 클라이언트는 교체
+    rows: list[SubmissionStatus] = []    # 커서 이후 신청·점수가 바뀐 간호사
+
+class RequestDelta(BaseModel):
+    cursor: str | None = None     # 다음 조회에 넘길 커서 (None이면 증분 미지원 → 매번 전체)
+    full: bool = False            # True면 rows가 전체 스냅샷 → 클라이언트는 교체
+    rows: list[RequestOut] = []   # 커서 이후 추가·수정된 행
+    deleted: list[str] = []       # 커서 이후 삭제된 신청 id (tombstone)
 
 class RequestsUpsertBody(BaseModel):
     items: list[RequestItem]
@@ -150,6 +165,7 @@ class JobStatusOut(BaseModel):
     status: str                     # pending|running|done|failed
     schedule_id: str | None = None
     error_msg: str | None = None
+    telemetry: dict | None = None   # 솔버 실행 통계 (구축/presolve/첫 해 시간, 목적값 추이, gap 등)
 
 class CellUpdate(BaseModel):
     nurse_id: str
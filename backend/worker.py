@@ -7,6 +7,25 @@ from datetime import datetime, timezone
 
 _executor = ProcessPoolExecutor(max_workers=1)
 
+PROGRESS_INTERVAL_SEC = 2.0  # 실행 중 progress 이벤트 발행 간격 (SSE 구독자용)
+
+
+class SolverFailed(RuntimeError):
+    """해 없음/솔버 오류 — 실패한 실행의 텔레메트리도 함께 전달
+
+    프로세스 경계를 넘어 pickle되므로 값은 모두 args에 보관.
+    """
+
+    def __init__(self, message: str, telemetry: dict | None = None):
+        super().__init__(message, telemetry)
+
+    def __str__(self) -> str:
+        return self.args[0]
+
+    @property
+    def telemetry(self) -> dict | None:
+        return self.args[1]
+
 
 def _run_solver_sync(
     nurses_data: list[dict],
@@ -14,8 +33,19 @@ def _run_solver_sync(
     rules_data: dict,
     start_date_str: str,
     timeout_seconds: int,
+    solver_options: dict | None = None,
+    bundle_path: str | None = None,
+    bundle_meta: dict | None = None,
+    anonymize: bool = True,
 ) -> dict:
-    """별도 프로세스에서 실행 — engine/ 직접 호출"""
+    """별도 프로세스에서 실행 — engine/ 직접 호출
+
+    solver_options: solve_schedule 추가 인자 (native_encoding, symmetry_breaking, redundant_constraints,
+                    search_strategy, solve_mode — _solver_options)
+    반환: {"schedule": {nurse_id: {day: shift}}, "telemetry": solve_schedule stats}
+    실패 시 SolverFailed (telemetry 포함).
+    bundle_path 지정 시 입력·결과·실행 통계를 번들로 저장 (실패해도 저장 → 재현용)
+    """
     # 프로세스 내에서 engine 경로를 sys.path에 추가
     root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     if root not in sys.path:
@@ -42,33 +72,78 @@ def _run_solver_sync(
     if warnings:
         logging.warning("[solver] validate_requests 경고:\n" + "\n".join(f"  - {w}" for w in warnings))
 
-    schedule = solve_schedule(nurses, requests, rules, start_date, timeout_seconds)
+    solver_options = solver_options or {}
+    params = {"timeout_seconds": timeout_seconds, **solver_options}
+    stats: dict = {**params, "num_warnings": len(warnings)}
+    result: dict | None = None
+    error: str | None = None
+    try:
+        schedule = solve_schedule(nurses, requests, rules, start_date, timeout_seconds,
+                                  stats=stats, **solver_options)
+        if schedule.schedule_data:
+            result = _serialize_schedule(schedule.schedule_data)
+        else:
+            error = _no_solution_message(warnings)
+    except Exception as e:
+        error = str(e)
+    finally:
+        if bundle_path:
+            _write_bundle(
+                bundle_path, nurses_data, requests_data, rules_data, start_date_str,
+                params, result, stats, error,
+                bundle_meta, anonymize,
+            )
 
-    if not schedule.schedule_data:
-        warn_str = ("사전 경고:\n" + "\n".join(f"  - {w}" for w in warnings)) if warnings else "사전 경고 없음"
-        raise RuntimeError(
-            "해를 찾지 못했습니다.\n"
-            "타임아웃이거나 제약 충돌일 수 있습니다. "
-            "hard 신청(번표·수면·병가) 또는 인원 규칙을 확인하거나 타임아웃을 늘려보세요.\n"
-            + warn_str
-        )
+    if result is None:
+        raise SolverFailed(error, stats)
+    return {"schedule": result, "telemetry": stats}
+
+
+def _serialize_schedule(schedule_data: dict) -> dict:
+    """직렬화 가능한 dict로 변환: {nurse_id(str): {day(str): shift}}"""
+    return {
+        str(nid): {str(d): s for d, s in days.items()}
+        for nid, days in schedule_data.items()
+    }
 
-    # 직렬화 가능한 dict로 변환: {nurse_id(str): {day(str): shift}}
-    result: dict = {}
-    for nid, days in schedule.schedule_data.items():
-        result[str(nid)] = {str(d): s for d, s in days.items()}
-    return result
+
+def _no_solution_message(warnings: list[str]) -> str:
+    warn_str = ("사전 경고:\n" + "\n".join(f"  - {w}" for w in warnings)) if warnings else "사전 경고 없음"
+    return (
+        "해를 찾지 못했습니다.\n"
+        "타임아웃이거나 제약 충돌일 수 있습니다. "
+        "hard 신청(번표·수면·병가) 또는 인원 규칙을 확인하거나 타임아웃을 늘려보세요.\n"
+        + warn_str
+    )
+
+
+def _write_bundle(path, nurses_data, requests_data, rules_data, start_date_str,
+                  params, result, stats, error, meta, anonymize) -> None:
+    """번들 저장 — 실패해도 솔버 작업에는 영향 없음"""
+    import logging
+    from engine.bundle import anonymize as _anonymize, make_bundle, save_bundle
+
+    try:
+        bundle = make_bundle(
+            nurses_data, requests_data, rules_data, start_date_str, params,
+            result=result, stats=stats, error=error, meta=meta,
+        )
+        save_bundle(_anonymize(bundle) if anonymize else bundle, path)
+    except Exception as e:
+        logging.warning(f"[solver] 번들 저장 실패 ({path}): {e}")
 
 
 async def run_solver_job(job_id: str, period_id: str, db) -> None:
-    """BackgroundTasks에서 호출"""
+    """BackgroundTasks에서 호출 — 상태 변화는 DB와 함께 events 버스로 발행"""
     from .database import get_db
+    from .events import publish_job
 
     if db is None:
         db = get_db()
 
     now_iso = datetime.now(timezone.utc).isoformat()
     db.table("solver_jobs").update({"status": "running", "started_at": now_iso}).eq("id", job_id).execute()
+    publish_job(job_id, period_id, "running", started_at=now_iso)
 
     try:
         # 입력 데이터 로드
@@ -84,11 +159,15 @@ async def run_solver_job(job_id: str, period_id: str, db) -> None:
 
         timeout_sec = rules_res.data[0].get("solver_timeout", 300) if rules_res.data else 300
         loop   = asyncio.get_event_loop()
-        result = await loop.run_in_executor(
+        future = loop.run_in_executor(
             _executor,
             _run_solver_sync,
             nurses_data, requests_data, rules_data, start_date_str, timeout_sec,
+            _solver_options(),
+            *_bundle_args(job_id, period_id, start_date_str),
         )
+        solved = await _await_with_progress(future, job_id, period_id, timeout_sec)
+        result = solved["schedule"]
 
         # 결과 저장
         done_iso = datetime.now(timezone.utc).isoformat()
@@ -106,9 +185,11 @@ async def run_solver_job(job_id: str, period_id: str, db) -> None:
             "status": "done",
             "finished_at": done_iso,
         }).eq("id", job_id).execute()
+        _save_telemetry(db, job_id, solved["telemetry"])
 
         # schedule_id를 job에 저장해서 폴링 응답에 포함
         db.table("solver_jobs").update({"schedule_id": schedule_id}).eq("id", job_id).execute()
+        publish_job(job_id, period_id, "done", finished_at=done_iso, schedule_id=schedule_id)
 
     except Exception as e:
         done_iso = datetime.now(timezone.utc).isoformat()
@@ -117,6 +198,73 @@ async def run_solver_job(job_id: str, period_id: str, db) -> None:
             "finished_at": done_iso,
             "error_msg": str(e),
         }).eq("id", job_id).execute()
+        _save_telemetry(db, job_id, getattr(e, "telemetry", None))
+        publish_job(job_id, period_id, "failed", finished_at=done_iso, error_msg=str(e))
+
+
+def _save_telemetry(db, job_id: str, telemetry: dict | None) -> None:
+    """텔레메트리는 상태 갱신과 별도로 저장 — 실패해도 무시
+
+    solver_jobs.telemetry 컬럼 마이그레이션 전이면 update가 실패하는데,
+    상태 갱신에 함께 넣으면 job이 running으로 남아 폴링/SSE가 끝나지 않음.
+    """
+    if telemetry is None:
+        return
+    try:
+        db.table("solver_jobs").update({"telemetry": telemetry}).eq("id", job_id).execute()
+    except Exception:
+        pass
+
+
+async def _await_with_progress(future, job_id: str, period_id: str, timeout_sec: int):
+    """솔버 future 대기 — 끝날 때까지 PROGRESS_INTERVAL_SEC마다 경과 시간 발행
+
+    solver는 별도 프로세스라 내부 진행률을 알 수 없으므로 경과/제한 시간 비율만 전달.
+    """
+    from .events import publish_job
+
+    loop = asyncio.get_event_loop()
+    t0 = loop.time()
+    while True:
+        done, _ = await asyncio.wait({future}, timeout=PROGRESS_INTERVAL_SEC)
+        if done:
+            return future.result()
+        elapsed = loop.time() - t0
+        publish_job(
+            job_id, period_id, "running",
+            elapsed_sec=round(elapsed, 1),
+            timeout_sec=timeout_sec,
+            progress=min(elapsed / timeout_sec, 0.99) if timeout_sec else None,
+        )
+
+
+def _solver_options() -> dict:
+    """settings의 솔버 옵션 → solve_schedule 인자 (번들 params·텔레메트리에도 기록)"""
+    from .config import settings
+
+    return {
+        "native_encoding": settings.solver_native_encoding,
+        "symmetry_breaking": settings.solver_symmetry_breaking,
+        "redundant_constraints": settings.solver_redundant_constraints,
+        "search_strategy": settings.solver_search_strategy,
+        "solve_mode": settings.solver_solve_mode,
+    }
+
+
+def _bundle_args(job_id: str, period_id: str, start_date_str: str) -> tuple:
+    """settings.solver_bundle_dir 지정 시 (번들 경로, 메타, 익명화 여부), 아니면 ()"""
+    from .config import settings
+
+    if not settings.solver_bundle_dir:
+        return ()
+    os.makedirs(settings.solver_bundle_dir, exist_ok=True)
+    path = os.path.join(settings.solver_bundle_dir, f"{start_date_str}_{job_id}.json")
+    meta = {
+        "job_id": job_id,
+        "period_id": period_id,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+    }
+    return path, meta, settings.solver_bundle_anonymize
 
 
 def _get_department_id(db, period_id: str) -> str:
@@ -0,0 +1,5 @@
+"""pytest 설정 — 루트를 import 경로에 두고 tests/ 아래 테스트만 수집
+
+test_solver_direct.py는 실제 DB로 솔버를 돌리는 진단 스크립트(import 시 .env 필요)라 제외.
+"""
+collect_ignore = ["test_solver_direct.py"]
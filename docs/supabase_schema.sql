@@ -131,3 +131,483 @@ CREATE INDEX idx_periods_dept      ON periods(department_id, start_date DESC);
 -- ══════════════════════════════════════════
 -- INSERT INTO departments (name, admin_pw_hash)
 -- VALUES ('응급실', '$2b$12$<bcrypt_hash_here>');
+
+
+-- ══════════════════════════════════════════
+-- 근무신청 RPC (트랜잭션 단위 저장)
+-- 함수 하나 = 트랜잭션 하나 → 중간 실패 시 전체 롤백
+-- 백엔드는 함수가 없으면(PGRST202) 기존 테이블 API 경로로 폴백
+-- ══════════════════════════════════════════
+
+-- 신청 우선순위 (백엔드에서 사용 — 이미 있으면 건너뜀)
+CREATE TABLE IF NOT EXISTS nurse_scores (
+    period_id UUID REFERENCES periods(id) ON DELETE CASCADE,
+    nurse_id  UUID REFERENCES nurses(id) ON DELETE CASCADE,
+    score     INT NOT NULL DEFAULT 100,
+    PRIMARY KEY (period_id, nurse_id)
+);
+ALTER TABLE requests ADD COLUMN IF NOT EXISTS condition TEXT DEFAULT 'B';  -- 'A' | 'B'
+ALTER TABLE requests ADD COLUMN IF NOT EXISTS score     INT  DEFAULT 100;  -- 저장 시점 점수 스냅샷
+
+-- 엑셀 가져오기: 지정 간호사들의 해당 기간 신청을 한 번에 교체
+--   p_nurse_ids: 파일에서 매칭된 간호사 (신청 0건 포함)
+--   p_rows:      [{"nurse_id", "day", "code", "is_or", "note"}, ...]
+--   반환:        {"added", "removed", "unchanged", "deleted", "inserted"}
+CREATE OR REPLACE FUNCTION replace_period_requests(
+    p_period_id UUID,
+    p_nurse_ids UUID[],
+    p_rows      JSONB
+) RETURNS JSONB
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_added     INT;
+    v_removed   INT;
+    v_unchanged INT;
+    v_deleted   INT;
+    v_inserted  INT;
+BEGIN
+    -- 변경 요약 (교체 전 상태 기준)
+    WITH new_rows AS (
+        SELECT x.nurse_id, x.day, x.code,
+               COALESCE(x.is_or, FALSE) AS is_or, COALESCE(x.note, '') AS note
+          FROM jsonb_to_recordset(p_rows)
+               AS x(nurse_id UUID, day INT, code TEXT, is_or BOOLEAN, note TEXT)
+    ), old_rows AS (
+        SELECT nurse_id, day, code, COALESCE(is_or, FALSE), COALESCE(note, '')
+          FROM requests
+         WHERE period_id = p_period_id AND nurse_id = ANY(p_nurse_ids)
+    )
+    SELECT (SELECT count(*) FROM (SELECT * FROM new_rows EXCEPT SELECT * FROM old_rows) a),
+           (SELECT count(*) FROM (SELECT * FROM old_rows EXCEPT SELECT * FROM new_rows) r),
+           (SELECT count(*) FROM (SELECT * FROM new_rows INTERSECT SELECT * FROM old_rows) u)
+      INTO v_added, v_removed, v_unchanged;
+
+    DELETE FROM requests
+     WHERE period_id = p_period_id AND nurse_id = ANY(p_nurse_ids);
+    GET DIAGNOSTICS v_deleted = ROW_COUNT;
+
+    INSERT INTO requests (period_id, nurse_id, day, code, is_or, note, submitted_at, condition, score)
+    SELECT p_period_id, x.nurse_id, x.day, x.code,
+           COALESCE(x.is_or, FALSE), COALESCE(x.note, ''), NOW(), 'B', 100
+      FROM jsonb_to_recordset(p_rows)
+           AS x(nurse_id UUID, day INT, code TEXT, is_or BOOLEAN, note TEXT);
+    GET DIAGNOSTICS v_inserted = ROW_COUNT;
+
+    -- 일괄 교체는 기간 전체 행을 tombstone으로 남기므로 여기서 오래된 tombstone 정리
+    IF to_regprocedure('prune_request_tombstones(interval)') IS NOT NULL THEN
+        PERFORM prune_request_tombstones();
+    END IF;
+
+    RETURN jsonb_build_object(
+        'added', v_added, 'removed', v_removed, 'unchanged', v_unchanged,
+        'deleted', v_deleted, 'inserted', v_inserted
+    );
+END;
+$$;
+
+-- 간호사 1명 신청 저장: 기존 행과 비교해 바뀐 행만 삭제/수정/삽입 + 점수 upsert
+--   행의 score는 변경 판단에서 제외 (바뀐 행에만 스냅샷 기록, 현재 점수는 nurse_scores)
+--   p_items: [{"day", "code", "is_or", "note", "condition"}, ...]  ((day, code) 중복 없음)
+--   반환:    저장 후 해당 간호사의 전체 신청 행
+CREATE OR REPLACE FUNCTION save_nurse_requests(
+    p_period_id UUID,
+    p_nurse_id  UUID,
+    p_score     INT,
+    p_items     JSONB
+) RETURNS SETOF requests
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    -- 같은 간호사의 동시 저장 직렬화
+    PERFORM pg_advisory_xact_lock(hashtext(p_period_id::TEXT || p_nurse_id::TEXT));
+
+    INSERT INTO nurse_scores (period_id, nurse_id, score)
+    VALUES (p_period_id, p_nurse_id, p_score)
+    ON CONFLICT (period_id, nurse_id) DO UPDATE SET score = EXCLUDED.score;
+
+    DELETE FROM requests r
+     WHERE r.period_id = p_period_id AND r.nurse_id = p_nurse_id
+       AND NOT EXISTS (
+           SELECT 1 FROM jsonb_to_recordset(p_items) AS x(day INT, code TEXT)
+            WHERE x.day = r.day AND x.code = r.code
+       );
+
+    UPDATE requests r
+       SET is_or = COALESCE(x.is_or, FALSE),
+           note = COALESCE(x.note, ''),
+           condition = COALESCE(x.condition, 'B'),
+           score = p_score,
+           submitted_at = NOW()
+      FROM jsonb_to_recordset(p_items)
+           AS x(day INT, code TEXT, is_or BOOLEAN, note TEXT, condition TEXT)
+     WHERE r.period_id = p_period_id AND r.nurse_id = p_nurse_id
+       AND r.day = x.day AND r.code = x.code
+       AND (COALESCE(r.is_or, FALSE), COALESCE(r.note, ''), r.condition)
+           IS DISTINCT FROM
+           (COALESCE(x.is_or, FALSE), COALESCE(x.note, ''), COALESCE(x.condition, 'B'));
+
+    INSERT INTO requests (period_id, nurse_id, day, code, is_or, note, condition, score, submitted_at)
+    SELECT p_period_id, p_nurse_id, x.day, x.code,
+           COALESCE(x.is_or, FALSE), COALESCE(x.note, ''), COALESCE(x.condition, 'B'), p_score, NOW()
+      FROM jsonb_to_recordset(p_items)
+           AS x(day INT, code TEXT, is_or BOOLEAN, note TEXT, condition TEXT)
+     WHERE NOT EXISTS (
+           SELECT 1 FROM requests r
+            WHERE r.period_id = p_period_id AND r.nurse_id = p_nurse_id
+              AND r.day = x.day AND r.code = x.code
+     );
+
+    RETURN QUERY
+    SELECT * FROM requests
+     WHERE period_id = p_period_id AND nurse_id = p_nurse_id;
+END;
+$$;
+
+-- 간호사 신청 제출: A조건 검증 + 점수 계산 + 저장을 한 번에 (backend/request_rules.py와 같은 규칙)
+--   - 병가/법휴/필수: 집계 제외, condition = 'B'
+--   - OR 신청: 같은 날 첫 항목만 집계
+--   - A조건 > 3 → 예외 (HINT 'a_condition_limit', 아무것도 저장하지 않음)
+--   - 점수 = 100 - (A×1 + B×3)
+--   p_items: [{"day", "code", "is_or", "note", "condition"}, ...]  (제출 순서 그대로)
+--   반환:    {"score", "a_count", "rows": [저장 후 전체 신청 행]}
+CREATE OR REPLACE FUNCTION submit_nurse_requests(
+    p_period_id UUID,
+    p_nurse_id  UUID,
+    p_items     JSONB
+) RETURNS JSONB
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_a_count INT;
+    v_score   INT;
+    v_items   JSONB;
+    v_rows    JSONB;
+BEGIN
+    WITH items AS (
+        SELECT (e->>'day')::INT AS day, e->>'code' AS code,
+               COALESCE((e->>'is_or')::BOOLEAN, FALSE) AS is_or,
+               COALESCE(e->>'condition', 'B') AS condition, ord
+          FROM jsonb_array_elements(p_items) WITH ORDINALITY AS t(e, ord)
+         WHERE e->>'code' NOT IN ('병가', '법휴', '필수')
+    ), counted AS (
+        SELECT condition FROM items WHERE NOT is_or
+        UNION ALL
+        -- OR 그룹: 같은 날 첫 항목 (ORDER BY가 UNION 전체에 걸리지 않도록 서브쿼리로 분리)
+        SELECT condition FROM (
+            SELECT DISTINCT ON (day) day, condition FROM items WHERE is_or ORDER BY day, ord
+        ) first_or
+    )
+    SELECT count(*) FILTER (WHERE condition = 'A'),
+           100 - COALESCE(sum(CASE WHEN condition = 'A' THEN 1 ELSE 3 END), 0)
+      INTO v_a_count, v_score
+      FROM counted;
+
+    IF v_a_count > 3 THEN
+        RAISE EXCEPTION 'A조건은 월 최대 3개까지 신청 가능합니다. (현재 %개)', v_a_count
+              USING HINT = 'a_condition_limit';
+    END IF;
+
+    -- (day, code) 중복은 마지막 항목 우선, 제외 코드는 condition 'B'
+    SELECT COALESCE(jsonb_agg(jsonb_build_object(
+               'day', day, 'code', code, 'is_or', is_or, 'note', note,
+               'condition', CASE WHEN code IN ('병가', '법휴', '필수') THEN 'B' ELSE condition END
+           )), '[]'::JSONB)
+      INTO v_items
+      FROM (
+        SELECT DISTINCT ON ((e->>'day')::INT, e->>'code')
+               (e->>'day')::INT AS day, e->>'code' AS code,
+               COALESCE((e->>'is_or')::BOOLEAN, FALSE) AS is_or,
+               COALESCE(e->>'note', '') AS note,
+               COALESCE(e->>'condition', 'B') AS condition
+          FROM jsonb_array_elements(p_items) WITH ORDINALITY AS t(e, ord)
+         ORDER BY (e->>'day')::INT, e->>'code', ord DESC
+      ) d;
+
+    SELECT COALESCE(jsonb_agg(to_jsonb(r)), '[]'::JSONB)
+      INTO v_rows
+      FROM save_nurse_requests(p_period_id, p_nurse_id, v_score, v_items) r;
+
+    RETURN jsonb_build_object('score', v_score, 'a_count', v_a_count, 'rows', v_rows);
+END;
+$$;
+
+-- 제출 현황 집계: 간호사별 신청 수 / A조건 수 / 점수 / 마지막 제출 시각
+--   nurse_scores.updated_at(트리거로 갱신)까지 포함해 changed_at 계산
+--   증분 조회 커서는 아래 period_submission_status (신청 델타와 같은 xid8 커서)
+ALTER TABLE nurse_scores ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ DEFAULT NOW();
+
+CREATE OR REPLACE FUNCTION touch_updated_at() RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    NEW.updated_at := NOW();
+    RETURN NEW;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_nurse_scores_touch ON nurse_scores;
+CREATE TRIGGER trg_nurse_scores_touch
+    BEFORE UPDATE ON nurse_scores
+    FOR EACH ROW EXECUTE FUNCTION touch_updated_at();
+
+CREATE INDEX IF NOT EXISTS idx_requests_period_nurse ON requests(period_id, nurse_id);
+
+-- 신청 델타 동기화: 행마다 마지막 변경 트랜잭션 id(xid8) + 삭제 tombstone
+--   커서 = 조회 시점 스냅샷 xmin → 그보다 오래된 트랜잭션은 모두 확정되었으므로
+--   change_xid >= 커서 인 행만 다시 보면 늦게 커밋된 변경도 놓치지 않음
+ALTER TABLE requests ADD COLUMN IF NOT EXISTS change_xid XID8;
+CREATE INDEX IF NOT EXISTS idx_requests_period_change ON requests(period_id, change_xid);
+
+CREATE OR REPLACE FUNCTION stamp_request_change() RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    NEW.change_xid := pg_current_xact_id();
+    RETURN NEW;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_requests_stamp ON requests;
+CREATE TRIGGER trg_requests_stamp
+    BEFORE INSERT OR UPDATE ON requests
+    FOR EACH ROW EXECUTE FUNCTION stamp_request_change();
+
+-- period 삭제(CASCADE)로 지워지는 행은 기록하지 않음 → FK 없이 period_id만 보관
+CREATE TABLE IF NOT EXISTS request_tombstones (
+    request_id UUID PRIMARY KEY,
+    period_id  UUID NOT NULL,
+    nurse_id   UUID,
+    change_xid XID8 NOT NULL DEFAULT pg_current_xact_id(),
+    deleted_at TIMESTAMPTZ DEFAULT NOW()
+);
+ALTER TABLE request_tombstones ADD COLUMN IF NOT EXISTS nurse_id UUID;  -- 제출 현황 증분용
+CREATE INDEX IF NOT EXISTS idx_request_tombstones_period ON request_tombstones(period_id, change_xid);
+
+CREATE OR REPLACE FUNCTION record_request_tombstone() RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM periods WHERE id = OLD.period_id) THEN
+        INSERT INTO request_tombstones (request_id, period_id, nurse_id)
+        VALUES (OLD.id, OLD.period_id, OLD.nurse_id)
+        ON CONFLICT (request_id) DO NOTHING;
+    END IF;
+    RETURN OLD;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_requests_tombstone ON requests;
+CREATE TRIGGER trg_requests_tombstone
+    AFTER DELETE ON requests
+    FOR EACH ROW EXECUTE FUNCTION record_request_tombstone();
+
+-- tombstone 정리: 보존 기간(기본 7일)이 지난 tombstone 삭제
+--   지운 tombstone 중 가장 최근 xid를 horizon에 기록 → 커서가 horizon 이하인 조회는
+--   삭제 목록이 불완전하므로 전체 스냅샷(full = true)으로 응답
+--   호출: replace_period_requests 끝 + 백엔드 시작 시 정리 작업 (backend/main.py)
+CREATE TABLE IF NOT EXISTS request_tombstone_horizon (
+    id         BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (id),  -- 항상 1행
+    pruned_xid XID8 NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_request_tombstones_deleted ON request_tombstones(deleted_at);
+
+CREATE OR REPLACE FUNCTION prune_request_tombstones(
+    p_keep INTERVAL DEFAULT INTERVAL '7 days'
+) RETURNS INT
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_pruned INT;
+    v_max    XID8;
+BEGIN
+    WITH gone AS (
+        DELETE FROM request_tombstones
+         WHERE deleted_at < NOW() - p_keep
+        RETURNING change_xid
+    )
+    SELECT count(*), (SELECT g.change_xid FROM gone g ORDER BY g.change_xid DESC LIMIT 1)
+      INTO v_pruned, v_max
+      FROM gone;
+
+    IF v_max IS NOT NULL THEN
+        INSERT INTO request_tombstone_horizon (id, pruned_xid) VALUES (TRUE, v_max)
+        ON CONFLICT (id) DO UPDATE
+           SET pruned_xid = GREATEST(request_tombstone_horizon.pruned_xid, EXCLUDED.pruned_xid);
+    END IF;
+    RETURN v_pruned;
+END;
+$$;
+
+-- 커서가 정리된 tombstone 범위에 걸치면(= horizon 이하) TRUE → 호출 측은 전체 스냅샷으로 응답
+CREATE OR REPLACE FUNCTION tombstone_cursor_expired(p_since XID8) RETURNS BOOLEAN
+LANGUAGE sql STABLE
+AS $$
+    SELECT COALESCE((SELECT p_since <= h.pruned_xid FROM request_tombstone_horizon h), FALSE);
+$$;
+
+--   p_cursor: NULL이면 전체 스냅샷 (full = true)
+--   반환:     {"cursor", "full", "rows": [...], "deleted": [request_id, ...]}
+CREATE OR REPLACE FUNCTION period_request_delta(
+    p_period_id UUID,
+    p_cursor    TEXT DEFAULT NULL
+) RETURNS JSONB
+LANGUAGE plpgsql STABLE
+AS $$
+DECLARE
+    v_next  XID8 := pg_snapshot_xmin(pg_current_snapshot());
+    v_since XID8 := p_cursor::XID8;
+BEGIN
+    IF v_since IS NOT NULL AND tombstone_cursor_expired(v_since) THEN
+        v_since := NULL;  -- 정리된 삭제 기록 이전 커서 → 전체 스냅샷
+    END IF;
+    RETURN jsonb_build_object(
+        'cursor', v_next::TEXT,
+        'full', v_since IS NULL,
+        'rows', COALESCE((
+            SELECT jsonb_agg(to_jsonb(r) - 'change_xid')
+              FROM requests r
+             WHERE r.period_id = p_period_id
+               AND (v_since IS NULL OR r.change_xid >= v_since)
+        ), '[]'::JSONB),
+        'deleted', CASE WHEN v_since IS NULL THEN '[]'::JSONB ELSE COALESCE((
+            SELECT jsonb_agg(t.request_id)
+              FROM request_tombstones t
+             WHERE t.period_id = p_period_id AND t.change_xid >= v_since
+        ), '[]'::JSONB) END
+    );
+END;
+$$;
+
+-- 제출 현황 증분 조회: 커서 = 스냅샷 xmin (period_request_delta와 같은 방식)
+--   간호사별 변경 xid = GREATEST(신청 행 change_xid, 삭제 tombstone, nurse_scores change_xid)
+--   → NOW()(트랜잭션 시작 시각) 기준과 달리, 조회보다 먼저 시작해 늦게 커밋된 저장도 다음 조회에 포함
+ALTER TABLE nurse_scores ADD COLUMN IF NOT EXISTS change_xid XID8;
+
+DROP TRIGGER IF EXISTS trg_nurse_scores_stamp ON nurse_scores;
+CREATE TRIGGER trg_nurse_scores_stamp
+    BEFORE INSERT OR UPDATE ON nurse_scores
+    FOR EACH ROW EXECUTE FUNCTION stamp_request_change();
+
+-- 이전 버전(p_since TIMESTAMPTZ, 행 집합 반환) 제거 — 인자 타입이 달라 REPLACE 불가
+DROP FUNCTION IF EXISTS period_submission_status(UUID, UUID, TIMESTAMPTZ);
+
+--   p_cursor: NULL이면 전체 (full = true)
+--   반환:     {"cursor", "full", "rows": [{"nurse_id", "name", "request_count", "a_count",
+--              "score", "submitted_at", "changed_at"}, ...]}  (rows는 sort_order 순)
+CREATE OR REPLACE FUNCTION period_submission_status(
+    p_period_id     UUID,
+    p_department_id UUID,
+    p_cursor        TEXT DEFAULT NULL
+) RETURNS JSONB
+LANGUAGE plpgsql STABLE
+AS $$
+DECLARE
+    v_next  XID8 := pg_snapshot_xmin(pg_current_snapshot());
+    v_since XID8 := p_cursor::XID8;
+BEGIN
+    IF v_since IS NOT NULL AND tombstone_cursor_expired(v_since) THEN
+        v_since := NULL;  -- 정리된 삭제 기록 이전 커서 → 전체
+    END IF;
+    RETURN jsonb_build_object(
+        'cursor', v_next::TEXT,
+        'full', v_since IS NULL,
+        'rows', COALESCE((
+            SELECT jsonb_agg(jsonb_build_object(
+                       'nurse_id', n.id, 'name', n.name,
+                       'request_count', COALESCE(a.request_count, 0),
+                       'a_count', COALESCE(a.a_count, 0),
+                       'score', COALESCE(s.score, 100),
+                       'submitted_at', a.submitted_at,
+                       'changed_at', GREATEST(a.submitted_at, s.updated_at)
+                   ) ORDER BY n.sort_order)
+              FROM nurses n
+              LEFT JOIN LATERAL (
+                  SELECT count(*)::INT AS request_count,
+                         -- OR 그룹(같은 날 is_or)은 1개로 집계
+                         count(DISTINCT CASE WHEN r.is_or THEN 'or:' || r.day ELSE r.id::TEXT END)
+                             FILTER (WHERE r.condition = 'A' AND r.code NOT IN ('병가', '법휴', '필수'))::INT
+                             AS a_count,
+                         max(r.submitted_at) AS submitted_at
+                    FROM requests r
+                   WHERE r.period_id = p_period_id AND r.nurse_id = n.id
+              ) a ON TRUE
+              LEFT JOIN nurse_scores s ON s.period_id = p_period_id AND s.nurse_id = n.id
+             WHERE n.department_id = p_department_id
+               AND (v_since IS NULL
+                    OR s.change_xid >= v_since
+                    OR EXISTS (SELECT 1 FROM requests r
+                                WHERE r.period_id = p_period_id AND r.nurse_id = n.id
+                                  AND r.change_xid >= v_since)
+                    OR EXISTS (SELECT 1 FROM request_tombstones t
+                                WHERE t.period_id = p_period_id AND t.nurse_id = n.id
+                                  AND t.change_xid >= v_since))
+        ), '[]'::JSONB)
+    );
+END;
+$$;
+
+-- 솔버 실행 텔레메트리 (job마다 기록, GET /schedule/job/* 응답에 포함)
+--   {"build_sec", "build_groups": [{"group", "sec", "constraints"}], "num_vars", "num_constraints",
+--    "presolve_sec", "first_solution_sec", "trajectory": [{"sec", "objective", "bound"}],
+--    "status", "objective", "best_bound", "gap", "response_stats", ...}
+ALTER TABLE solver_jobs ADD COLUMN IF NOT EXISTS telemetry JSONB;
+
+-- 엑셀 산출물 데이터 버전 (backend/artifact_cache.py data_version)
+--   다운로드마다 입력(근무표·간호사·규칙·신청)을 모두 읽지 않고 이 함수 1회로 캐시 키 결정
+--   간호사·근무표·규칙·부서는 updated_at(트리거), 신청은 change_xid + 삭제 tombstone으로 변경 감지
+ALTER TABLE nurses      ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ DEFAULT NOW();
+ALTER TABLE schedules   ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ DEFAULT NOW();
+ALTER TABLE departments ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ DEFAULT NOW();
+
+DROP TRIGGER IF EXISTS trg_nurses_touch ON nurses;
+CREATE TRIGGER trg_nurses_touch
+    BEFORE UPDATE ON nurses
+    FOR EACH ROW EXECUTE FUNCTION touch_updated_at();
+
+DROP TRIGGER IF EXISTS trg_schedules_touch ON schedules;
+CREATE TRIGGER trg_schedules_touch
+    BEFORE UPDATE ON schedules
+    FOR EACH ROW EXECUTE FUNCTION touch_updated_at();
+
+DROP TRIGGER IF EXISTS trg_rules_touch ON rules;
+CREATE TRIGGER trg_rules_touch
+    BEFORE UPDATE ON rules
+    FOR EACH ROW EXECUTE FUNCTION touch_updated_at();
+
+DROP TRIGGER IF EXISTS trg_departments_touch ON departments;
+CREATE TRIGGER trg_departments_touch
+    BEFORE UPDATE ON departments
+    FOR EACH ROW EXECUTE FUNCTION touch_updated_at();
+
+--   p_schedule_id 지정 시 그 근무표의 기간 기준 (p_period_id 무시)
+--   반환: {"version", "start_date"} — 기간/근무표가 없으면 NULL
+CREATE OR REPLACE FUNCTION export_version(
+    p_department_id UUID,
+    p_period_id     UUID DEFAULT NULL,
+    p_schedule_id   UUID DEFAULT NULL
+) RETURNS JSONB
+LANGUAGE sql STABLE
+AS $$
+    WITH target AS (
+        SELECT p.id AS period_id, p.start_date, s.updated_at AS schedule_at
+          FROM periods p
+          LEFT JOIN schedules s ON s.id = p_schedule_id
+         WHERE p.id = CASE WHEN p_schedule_id IS NULL THEN p_period_id ELSE s.period_id END
+    )
+    SELECT jsonb_build_object(
+        'start_date', t.start_date,
+        'version', concat_ws('|',
+            t.start_date, t.schedule_at,
+            (SELECT d.name || ':' || d.updated_at FROM departments d WHERE d.id = p_department_id),
+            (SELECT count(*) || ':' || max(n.updated_at) FROM nurses n WHERE n.department_id = p_department_id),
+            (SELECT max(r.updated_at) FROM rules r WHERE r.department_id = p_department_id),
+            (SELECT count(*) FROM requests r WHERE r.period_id = t.period_id),
+            (SELECT r.change_xid::TEXT FROM requests r WHERE r.period_id = t.period_id
+              ORDER BY r.change_xid DESC NULLS LAST LIMIT 1),
+            (SELECT x.change_xid::TEXT FROM request_tombstones x WHERE x.period_id = t.period_id
+              ORDER BY x.change_xid DESC LIMIT 1)
+        )
+    )
+      FROM target t;
+$$;
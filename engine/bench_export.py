@@ -0,0 +1,92 @@
+"""근무표 엑셀 내보내기 벤치마크 — 시간 + 최대 메모리
+
+사용법 (프로젝트 루트에서):
+    python -m engine.bench_export                  # 60명, 5회
+    python -m engine.bench_export --nurses 100 --runs 10
+
+비교 대상:
+  - file : export_schedule(…, 임시파일 경로) 후 다시 읽기 (기존 API 경로)
+  - bytes: export_schedule_bytes() 메모리 직접 생성 (현재 API 경로)
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+import tracemalloc
+from datetime import date
+
+from engine.models import Nurse, Request, Rules, Schedule, WORK_SHIFTS, OFF_TYPES
+from engine.excel_io import export_schedule, export_schedule_bytes
+
+
+def _synthetic_schedule(num_nurses: int, seed: int = 0) -> tuple[Schedule, Rules]:
+    """무작위 근무표 + 요청 (간호사당 요청 약 6건)"""
+    rng = random.Random(seed)
+    rules = Rules(public_holidays=[3, 17])
+    nurses = [
+        Nurse(
+            id=i, name=f"간호사{i:03d}",
+            grade=rng.choice(["책임", "서브차지", "", "", ""]),
+            role=rng.choice(["", "", "외상", "혼자 관찰", "급성구역"]),
+            vacation_days=rng.randint(0, 10),
+            pending_sleep=rng.random() < 0.1,
+        )
+        for i in range(num_nurses)
+    ]
+    pool = ["D", "D", "E", "E", "N", "OFF", "주"] + [c for c in WORK_SHIFTS if c not in ("D", "E", "N")] + OFF_TYPES
+    schedule_data = {n.id: {d: rng.choice(pool) for d in range(1, 29)} for n in nurses}
+    requests = []
+    for n in nurses:
+        for d in rng.sample(range(1, 29), 6):
+            code = rng.choice(["OFF", "D", "E", "N", "휴가", "N 제외"])
+            requests.append(Request(nurse_id=n.id, day=d, code=code))
+    schedule = Schedule(
+        start_date=date(2026, 9, 21), nurses=nurses, rules=rules,
+        requests=requests, schedule_data=schedule_data,
+    )
+    return schedule, rules
+
+
+def _export_via_file(schedule: Schedule, rules: Rules) -> bytes:
+    with tempfile.NamedTemporaryFile(suffix=".xlsx", delete=False) as tmp:
+        path = tmp.name
+    try:
+        export_schedule(schedule, rules, path)
+        with open(path, "rb") as f:
+            return f.read()
+    finally:
+        os.unlink(path)
+
+
+def _measure(fn, schedule, rules, runs: int) -> tuple[float, float, int]:
+    """(중앙값 초, 최대 메모리 MB, 결과 크기 bytes)"""
+    times = []
+    size = 0
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        size = len(fn(schedule, rules))
+        times.append(time.perf_counter() - t0)
+    tracemalloc.start()
+    fn(schedule, rules)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(times), peak / 1024 / 1024, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="엑셀 내보내기 벤치마크")
+    parser.add_argument("--nurses", type=int, default=60)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    schedule, rules = _synthetic_schedule(args.nurses)
+    print(f"간호사 {args.nurses}명, 요청 {len(schedule.requests)}건, {args.runs}회 중앙값")
+    for label, fn in (("file", _export_via_file), ("bytes", export_schedule_bytes)):
+        median, peak_mb, size = _measure(fn, schedule, rules, args.runs)
+        print(f"  {label:5s}: {median * 1000:7.1f} ms | peak {peak_mb:6.1f} MB | {size / 1024:.0f} KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""솔버 규모별 벤치마크 — 합성 병동(engine.synthetic)으로 오프라인 실행, JSON 리포트
+
+사용법 (프로젝트 루트에서):
+    python -m engine.bench_solver                                  # 20,38,60,100,150명, 각 60초
+    python -m engine.bench_solver --sizes 20,60 --timeout 30 --out bench.json
+    python -m engine.bench_solver --out new.json --compare base.json   # 이전 리포트와 비교
+    python -m engine.bench_solver --native-encoding --out native.json --compare base.json  # CP-SAT 전용 불리언 제약
+    python -m engine.bench_solver --spec requests_per_nurse=2 --spec fixed_off_ratio=0 \
+        --no-symmetry-breaking --out nosym.json        # 교환 가능한 간호사가 많은 병동, 대칭 제거 끄기
+    python -m engine.bench_solver --redundant-constraints --out red.json --compare base.json  # 함의 제약 R1~R5
+    python -m engine.bench_solver --search night_first --out night.json --compare base.json   # 야간 우선 분기
+    python -m engine.bench_solver --mode two_phase --out two.json --compare base.json          # 야간 → 주간 2단계 분해
+
+측정 (solve_schedule(stats=…)):
+  - build_sec          : 모델 구축 시간 (변수·제약 생성)
+  - num_vars / num_constraints
+  - first_solution_sec : 첫 해까지 걸린 탐색 시간
+  - objective / best_bound / gap : 최종 목적값, 상한, 상대 gap (최대화)
+  - status, solve_sec, total_sec
+
+같은 --seed·--sizes면 같은 입력이 생성되므로 솔버 변경 전후 리포트를 그대로 비교 가능.
+CP-SAT은 멀티스레드 탐색이라 목적값은 실행마다 조금씩 달라질 수 있음 (--repeat로 중앙값 사용).
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+from datetime import datetime, timezone
+
+from engine.solver import SEARCH_STRATEGIES, SOLVE_MODES, solve_schedule
+from engine.synthetic import SyntheticSpec, generate
+
+DEFAULT_SIZES = (20, 38, 60, 100, 150)
+
+# 비교 출력 대상 (이름, 작을수록 좋은가)
+_COMPARE_KEYS = [
+    ("build_sec", True), ("num_constraints", True), ("first_solution_sec", True),
+    ("objective", False), ("gap", True),
+]
+
+
+def _median(values: list):
+    values = [v for v in values if v is not None]
+    return statistics.median(values) if values else None
+
+
+def _parse_spec(items: list[str]) -> dict:
+    """--spec KEY=VALUE → SyntheticSpec 필드 덮어쓰기 (값은 JSON으로 해석 가능하면 JSON)"""
+    overrides = {}
+    for item in items:
+        key, sep, value = item.partition("=")
+        if not sep:
+            raise SystemExit(f"--spec 형식 오류: {item} (KEY=VALUE)")
+        try:
+            overrides[key.strip()] = json.loads(value)
+        except ValueError:
+            overrides[key.strip()] = value.strip()
+    return overrides
+
+
+def bench_size(num_nurses: int, timeout: int, seed: int, repeat: int,
+               native_encoding: bool = False, symmetry_breaking: bool = True,
+               redundant_constraints: bool = False, search_strategy: str = "default",
+               solve_mode: str = "monolithic", spec_overrides: dict | None = None) -> dict:
+    dept = generate(SyntheticSpec(num_nurses=num_nurses, seed=seed, **(spec_overrides or {})))
+    runs = []
+    for _ in range(repeat):
+        stats: dict = {}
+        solve_schedule(dept.nurses, dept.requests, dept.rules, dept.start_date,
+                       timeout_seconds=timeout, stats=stats, native_encoding=native_encoding,
+                       symmetry_breaking=symmetry_breaking,
+                       redundant_constraints=redundant_constraints,
+                       search_strategy=search_strategy, solve_mode=solve_mode)
+        runs.append(stats)
+    numeric = [k for k, v in runs[0].items() if isinstance(v, (int, float)) and not isinstance(v, bool)]
+    result = {"input": dept.summary(), "status": [r["status"] for r in runs],
+              "symmetry_classes": runs[0].get("symmetry_classes")}
+    result.update({k: _median([r.get(k) for r in runs]) for k in numeric})
+    if repeat > 1:
+        result["runs"] = runs
+    return result
+
+
+def _meta(args) -> dict:
+    from ortools import __version__ as ortools_version
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "ortools": ortools_version,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "timeout": args.timeout,
+        "seed": args.seed,
+        "repeat": args.repeat,
+        "native_encoding": args.native_encoding,
+        "symmetry_breaking": not args.no_symmetry_breaking,
+        "redundant_constraints": args.redundant_constraints,
+        "search_strategy": args.search,
+        "solve_mode": args.mode,
+        "spec": _parse_spec(args.spec),
+    }
+
+
+def _fmt(v) -> str:
+    if v is None:
+        return "-"
+    if isinstance(v, float):
+        return f"{v:.3f}" if abs(v) < 100 else f"{v:.0f}"
+    return str(v)
+
+
+def print_report(report: dict) -> None:
+    print(f"{'nurses':>6} {'status':>10} {'build':>7} {'vars':>8} {'cons':>8} "
+          f"{'first':>7} {'objective':>10} {'gap':>7}")
+    for size, r in report["results"].items():
+        print(f"{size:>6} {r['status'][0]:>10} {_fmt(r.get('build_sec')):>7} "
+              f"{_fmt(r.get('num_vars')):>8} {_fmt(r.get('num_constraints')):>8} "
+              f"{_fmt(r.get('first_solution_sec')):>7} {_fmt(r.get('objective')):>10} "
+              f"{_fmt(r.get('gap')):>7}")
+
+
+def print_compare(base: dict, new: dict) -> None:
+    print("\n비교 (base → new)")
+    for size, r in new["results"].items():
+        b = base["results"].get(size)
+        if b is None:
+            continue
+        parts = []
+        for key, lower_better in _COMPARE_KEYS:
+            old, cur = b.get(key), r.get(key)
+            if old is None or cur is None:
+                continue
+            pct = (cur - old) / abs(old) * 100 if old else 0.0
+            better = (cur < old) == lower_better if cur != old else None
+            mark = "" if better is None else (" ✓" if better else " ✗")
+            parts.append(f"{key} {_fmt(old)}→{_fmt(cur)} ({pct:+.1f}%){mark}")
+        print(f"  {size}명: " + " | ".join(parts))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="솔버 규모별 벤치마크 (합성 병동)")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="간호사 수 목록 (쉼표 구분)")
+    parser.add_argument("--timeout", type=int, default=60, help="규모별 솔버 제한 시간(초)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=1, help="규모별 반복 횟수 (중앙값 보고)")
+    parser.add_argument("--native-encoding", action="store_true",
+                        help="불리언 제약을 CP-SAT 전용 제약으로 (solve_schedule native_encoding=True)")
+    parser.add_argument("--no-symmetry-breaking", action="store_true",
+                        help="교환 가능한 간호사 대칭 제거 끄기 (solve_schedule symmetry_breaking=False)")
+    parser.add_argument("--redundant-constraints", action="store_true",
+                        help="함의 제약 R1~R5 추가 (solve_schedule redundant_constraints=True)")
+    parser.add_argument("--search", choices=SEARCH_STRATEGIES, default="default",
+                        help="탐색 전략 (solve_schedule search_strategy)")
+    parser.add_argument("--mode", choices=SOLVE_MODES, default="monolithic",
+                        help="풀이 방식 (solve_schedule solve_mode)")
+    parser.add_argument("--spec", action="append", default=[], metavar="KEY=VALUE",
+                        help="합성 병동 SyntheticSpec 덮어쓰기 (반복 가능, 예: requests_per_nurse=2)")
+    parser.add_argument("--out", help="JSON 리포트 저장 경로")
+    parser.add_argument("--compare", help="비교할 이전 JSON 리포트")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)  # 솔버 진행 로그 숨김
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    spec_overrides = _parse_spec(args.spec)
+    report = {"meta": _meta(args), "results": {}}
+    for n in sizes:
+        print(f"[bench] {n}명 …", flush=True)
+        report["results"][str(n)] = bench_size(n, args.timeout, args.seed, args.repeat,
+                                               native_encoding=args.native_encoding,
+                                               symmetry_breaking=not args.no_symmetry_breaking,
+                                               redundant_constraints=args.redundant_constraints,
+                                               search_strategy=args.search,
+                                               solve_mode=args.mode,
+                                               spec_overrides=spec_overrides)
+
+    print_report(report)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n리포트 저장: {args.out}")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            print_compare(json.load(f), report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""솔버 입력 번들 — 한 번의 solve_schedule 실행을 재현 가능한 JSON 하나로 저장
+
+번들 구성 (engine 형식, DB 접근 없이 그대로 from_dict 가능):
+  - nurses / requests / rules : worker가 변환한 솔버 입력
+  - start_date, params        : 시작일, 솔버 파라미터 (timeout_seconds)
+  - result                    : {nurse_id: {day: shift}} (해 없음이면 None)
+  - stats                     : solve_schedule(stats=…) 결과 (구축/탐색 시간, 목적값, gap)
+  - error                     : 실패 메시지 (성공이면 None)
+
+anonymize()는 간호사 id·이름·비고를 순번으로 치환 (신청·결과의 id도 같이 치환).
+솔버는 이름/비고를 쓰지 않으므로 익명화 전후 해 탐색 입력은 동일.
+
+재실행: python -m engine.replay bundle.json
+"""
+import json
+from datetime import date
+
+from engine.models import Nurse, Request, Rules
+
+BUNDLE_VERSION = 1
+
+
+def make_bundle(
+    nurses_data: list[dict],
+    requests_data: list[dict],
+    rules_data: dict,
+    start_date_str: str,
+    params: dict,
+    result: dict | None = None,
+    stats: dict | None = None,
+    error: str | None = None,
+    meta: dict | None = None,
+) -> dict:
+    """worker 입력(dict 형식)으로 번들 생성 — Nurse.from_dict 기준 필드만 남김"""
+    return {
+        "version": BUNDLE_VERSION,
+        "meta": meta or {},
+        "start_date": start_date_str,
+        "params": params,
+        "nurses": [Nurse.from_dict(n).to_dict() for n in nurses_data],
+        "requests": [Request.from_dict(r).to_dict() for r in requests_data],
+        "rules": Rules.from_dict(rules_data).to_dict(),
+        "result": result,
+        "stats": stats or {},
+        "error": error,
+    }
+
+
+def anonymize(bundle: dict) -> dict:
+    """간호사 id → n001…, 이름 → 간호사001…, 비고 삭제 (입력 순서 유지)"""
+    id_map = {n["id"]: f"n{i:03d}" for i, n in enumerate(bundle["nurses"], start=1)}
+    nurses = [
+        {**n, "id": id_map[n["id"]], "name": f"간호사{i:03d}", "note": ""}
+        for i, n in enumerate(bundle["nurses"], start=1)
+    ]
+    requests = [
+        {**r, "nurse_id": id_map.get(r["nurse_id"], r["nurse_id"])}
+        for r in bundle["requests"]
+    ]
+    result = bundle.get("result")
+    if result is not None:
+        # 결과 키는 JSON 직렬화 시 문자열이 되므로 문자열 기준으로도 매핑
+        str_map = {str(k): v for k, v in id_map.items()}
+        result = {str_map.get(str(nid), nid): days for nid, days in result.items()}
+    meta = {k: v for k, v in bundle.get("meta", {}).items() if k not in ("period_id", "job_id")}
+    return {
+        **bundle, "meta": {**meta, "anonymized": True},
+        "nurses": nurses, "requests": requests, "result": result,
+    }
+
+
+def save_bundle(bundle: dict, path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(bundle, f, ensure_ascii=False, indent=1, default=str)
+
+
+def load_bundle(path: str) -> dict:
+    with open(path, encoding="utf-8") as f:
+        bundle = json.load(f)
+    version = bundle.get("version")
+    if version != BUNDLE_VERSION:
+        raise ValueError(f"지원하지 않는 번들 버전: {version} (현재 {BUNDLE_VERSION})")
+    return bundle
+
+
+def bundle_inputs(bundle: dict, rule_overrides: dict | None = None) -> tuple[list[Nurse], list[Request], Rules, date]:
+    """번들 → solve_schedule 입력 (rule_overrides로 규칙 일부 교체)"""
+    nurses = [Nurse.from_dict(n) for n in bundle["nurses"]]
+    requests = [Request.from_dict(r) for r in bundle["requests"]]
+    rules = Rules.from_dict({**bundle["rules"], **(rule_overrides or {})})
+    return nurses, requests, rules, date.fromisoformat(bundle["start_date"])
@@ -0,0 +1,65 @@
+"""bytes LRU 캐시 — 항목 수 + 총 용량 제한 (+ 선택적 TTL), 스레드 안전
+
+사용처:
+  - engine/excel_io.py   : 암호 파일 복호화 결과 (TTL 적용)
+  - backend/artifact_cache.py : 생성된 xlsx 산출물 (메모리 계층)
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Hashable
+
+
+class ByteLRU:
+    """키 → bytes LRU (가장 오래 안 쓴 항목부터 제거)
+
+    max_bytes보다 큰 값은 저장하지 않음. ttl_sec을 주면 저장 후 그 시간이 지난 항목은 만료.
+    """
+
+    def __init__(self, max_items: int, max_bytes: int, ttl_sec: float | None = None):
+        self._items: OrderedDict[Hashable, tuple[float, bytes]] = OrderedDict()
+        self._size = 0
+        self._max_items = max_items
+        self._max_bytes = max_bytes
+        self._ttl = ttl_sec
+        self._lock = threading.Lock()
+
+    def _expired(self, stored_at: float, now: float) -> bool:
+        return self._ttl is not None and now - stored_at > self._ttl
+
+    def get(self, key: Hashable) -> bytes | None:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is None:
+                return None
+            stored_at, data = entry
+            if self._expired(stored_at, now):
+                del self._items[key]
+                self._size -= len(data)
+                return None
+            self._items.move_to_end(key)
+            return data
+
+    def put(self, key: Hashable, data: bytes) -> None:
+        if len(data) > self._max_bytes:
+            return
+        now = time.monotonic()
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._size -= len(old[1])
+            self._items[key] = (now, data)
+            self._size += len(data)
+            # 만료 항목 → 오래된 항목 순으로 정리
+            if self._ttl is not None:
+                for k in [k for k, (t, _) in self._items.items() if self._expired(t, now)]:
+                    self._size -= len(self._items.pop(k)[1])
+            while len(self._items) > self._max_items or self._size > self._max_bytes:
+                _, (_, evicted) = self._items.popitem(last=False)
+                self._size -= len(evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self._size = 0
@@ -1,13 +1,20 @@
 """공정성 점수 평가 — 응급실 간호사 근무표 (D/E/N)"""
 from engine.models import (
-    Schedule, Rules, WORK_SHIFTS, OFF_TYPES, SHIFT_ORDER, ROLE_TIERS,
+    Schedule, Rules, ShiftCode, OFF_SET, ROLE_TIERS,
+    NUM_CODES, CODE_LEVELS, CODE_NAMES, CODE_OF, WORK_MASK,
 )
 
+_D = int(ShiftCode.D)
+_M = int(ShiftCode.중2)
+_E = int(ShiftCode.E)
+_N = int(ShiftCode.N)
+
 
 def evaluate_schedule(schedule: Schedule, rules: Rules) -> dict:
     """근무표 공정성 종합 평가"""
     nurses = schedule.nurses
     num_days = schedule.num_days
+    cal = schedule.calendar
 
     empty_result = {
         "grade": "-", "score": 0, "shift_stats": {},
@@ -20,23 +27,28 @@ def evaluate_schedule(schedule: Schedule, rules: Rules) -> dict:
     if not nurses or not schedule.schedule_data:
         return empty_result
 
+    # ── 정수 코드 행 + 일자별 코드 인원 (1회 계산 후 재사용) ──
+    # rows[nid][d - 1] = d일 코드, day_counts[d - 1][code] = 해당 코드 인원
+    rows = {nid: schedule.encoded_row(nid) for nid in schedule.schedule_data}
+    for nurse in nurses:
+        if nurse.id not in rows:
+            rows[nurse.id] = schedule.encoded_row(nurse.id)
+    day_counts = [[0] * (NUM_CODES + 1) for _ in range(num_days)]
+    for nid in schedule.schedule_data:
+        for di, c in enumerate(rows[nid]):
+            day_counts[di][c] += 1
+
     # ── 개인별 근무 횟수 ──
     shift_stats = {}
     for nurse in nurses:
-        stats = {"D": 0, "중2": 0, "E": 0, "N": 0, "OFF": 0, "총근무": 0}
-        for d in range(1, num_days + 1):
-            s = schedule.get_shift(nurse.id, d)
-            if s == "D":
-                stats["D"] += 1
-            elif s == "중2":
-                stats["중2"] += 1
-            elif s == "E":
-                stats["E"] += 1
-            elif s == "N":
-                stats["N"] += 1
-            else:
-                stats["OFF"] += 1
+        row = rows[nurse.id]
+        stats = {
+            "D": row.count(_D), "중2": row.count(_M),
+            "E": row.count(_E), "N": row.count(_N),
+            "OFF": 0, "총근무": 0,
+        }
         stats["총근무"] = stats["D"] + stats["중2"] + stats["E"] + stats["N"]
+        stats["OFF"] = num_days - stats["총근무"]
         shift_stats[nurse.id] = stats
 
     # ── 편차 ──
@@ -51,12 +63,13 @@ def evaluate_schedule(schedule: Schedule, rules: Rules) -> dict:
     night_deviation = n_dev
 
     # ── 주말 편차 ──
-    weekend_days = [d for d in range(1, num_days + 1) if schedule.is_weekend(d)]
+    weekend_days = [di + 1 for di in cal.weekend_indices]
     weekend_counts = []
     for nurse in nurses:
+        row = rows[nurse.id]
         wk = sum(
             1 for d in weekend_days
-            if schedule.get_shift(nurse.id, d) in WORK_SHIFTS
+            if (WORK_MASK >> row[d - 1]) & 1
         )
         weekend_counts.append(wk)
     weekend_deviation = deviation(weekend_counts)
@@ -64,13 +77,12 @@ def evaluate_schedule(schedule: Schedule, rules: Rules) -> dict:
     # ── 역순 패턴 ──
     bad_patterns = {}
     for nurse in nurses:
-        for d in range(1, num_days):
-            s1 = schedule.get_shift(nurse.id, d)
-            s2 = schedule.get_shift(nurse.id, d + 1)
-            if s1 in SHIFT_ORDER and s2 in SHIFT_ORDER:
-                if SHIFT_ORDER[s1] > SHIFT_ORDER[s2]:
-                    key = f"{s1}→{s2}"
-                    bad_patterns[key] = bad_patterns.get(key, 0) + 1
+        row = rows[nurse.id]
+        for di in range(num_days - 1):
+            lv1, lv2 = CODE_LEVELS[row[di]], CODE_LEVELS[row[di + 1]]
+            if lv1 and lv2 and lv1 > lv2:
+                key = f"{CODE_NAMES[row[di]]}→{CODE_NAMES[row[di + 1]]}"
+                bad_patterns[key] = bad_patterns.get(key, 0) + 1
 
     # ── 요청 반영률 ──
     req_total = 0
@@ -94,7 +106,7 @@ def evaluate_schedule(schedule: Schedule, rules: Rules) -> dict:
             continue
         req_total += 1
         actual = schedule.get_shift(r.nurse_id, r.day)
-        if r.code in OFF_TYPES and actual in OFF_TYPES:
+        if r.code in OFF_SET and actual in OFF_SET:
             req_fulfilled += 1
         elif actual == r.code:
             req_fulfilled += 1
@@ -104,7 +116,7 @@ def evaluate_schedule(schedule: Schedule, rules: Rules) -> dict:
         req_total += 1
         actual = schedule.get_shift(nid, day)
         if any(
-            (c in OFF_TYPES and actual in OFF_TYPES) or actual == c
+            (c in OFF_SET and actual in OFF_SET) or actual == c
             for c in codes
         ):
             req_fulfilled += 1
@@ -116,11 +128,12 @@ def evaluate_schedule(schedule: Schedule, rules: Rules) -> dict:
 
     for nurse in nurses:
         nid = nurse.id
+        row = rows[nid]
 
         # 연속 근무
         consec = 0
-        for d in range(1, num_days + 1):
-            if schedule.get_shift(nid, d) in WORK_SHIFTS:
+        for c in row:
+            if (WORK_MASK >> c) & 1:
                 consec += 1
                 if consec > rules.max_consecutive_work:
                     rule_violations += 1
@@ -129,8 +142,8 @@ def evaluate_schedule(schedule: Schedule, rules: Rules) -> dict:
 
         # 연속 N
         consec_n = 0
-        for d in range(1, num_days + 1):
-            if schedule.get_shift(nid, d) == "N":
+        for c in row:
+            if c == _N:
                 consec_n += 1
                 if consec_n > rules.max_consecutive_N:
                     rule_violations += 1
@@ -143,19 +156,19 @@ def evaluate_schedule(schedule: Schedule, rules: Rules) -> dict:
 
         # NN 후 휴무
         for d in range(1, num_days - 1):
-            if (schedule.get_shift(nid, d) == "N" and
-                    schedule.get_shift(nid, d + 1) == "N"):
+            if row[d - 1] == _N and row[d] == _N:
                 for k in range(rules.off_after_2N):
                     check = d + 2 + k
                     if check <= num_days:
-                        if schedule.get_shift(nid, check) in WORK_SHIFTS:
+                        if (WORK_MASK >> row[check - 1]) & 1:
                             rule_violations += 1
 
     # 일일 인원
     for d in range(1, num_days + 1):
-        d_staff = schedule.get_staff_count(d, "D")
-        e_staff = schedule.get_staff_count(d, "E")
-        n_staff = schedule.get_staff_count(d, "N")
+        counts = day_counts[d - 1]
+        d_staff = counts[_D]
+        e_staff = counts[_E]
+        n_staff = counts[_N]
         if d_staff < rules.daily_D:
             rule_violations += 1
         if e_staff < rules.daily_E:
@@ -163,24 +176,18 @@ def evaluate_schedule(schedule: Schedule, rules: Rules) -> dict:
         if n_staff < rules.daily_N:
             rule_violations += 1
         # 중2: 평일만 체크 (주말은 0이 정상)
-        if not schedule.is_weekend(d):
-            m_staff = schedule.get_staff_count(d, "중2")
+        if not cal.weekend[d - 1]:
+            m_staff = counts[_M]
             if m_staff < rules.daily_M:
                 rule_violations += 1
 
     # 직급 (D/E/N만, 중2 제외)
-    for d in range(1, num_days + 1):
-        for shift_type in ["D", "E", "N"]:
-            chief_cnt = sum(
-                1 for n in nurses
-                if n.grade == "책임"
-                and schedule.get_shift(n.id, d) == shift_type
-            )
-            senior_cnt = sum(
-                1 for n in nurses
-                if n.grade in ("책임", "서브차지")
-                and schedule.get_shift(n.id, d) == shift_type
-            )
+    chief_rows = [rows[n.id] for n in nurses if n.grade == "책임"]
+    senior_rows = [rows[n.id] for n in nurses if n.grade in ("책임", "서브차지")]
+    for di in range(num_days):
+        for code in (_D, _E, _N):
+            chief_cnt = sum(1 for row in chief_rows if row[di] == code)
+            senior_cnt = sum(1 for row in senior_rows if row[di] == code)
             if chief_cnt < rules.min_chief_per_shift:
                 rule_violations += 1
             if senior_cnt < rules.min_senior_per_shift:
@@ -254,10 +261,11 @@ def evaluate_schedule(schedule: Schedule, rules: Rules) -> dict:
     violation_details = []
     for nurse in nurses:
         nid = nurse.id
+        row = rows[nid]
         # 연속 근무 초과
         consec = 0
         for d in range(1, num_days + 1):
-            if schedule.get_shift(nid, d) in WORK_SHIFTS:
+            if (WORK_MASK >> row[d - 1]) & 1:
                 consec += 1
                 if consec == rules.max_consecutive_work + 1:
                     violation_details.append(f"{nurse.name}: {d}일 연속근무 {consec}일 초과")
@@ -267,7 +275,7 @@ def evaluate_schedule(schedule: Schedule, rules: Rules) -> dict:
         # 연속 N 초과
         consec_n = 0
         for d in range(1, num_days + 1):
-            if schedule.get_shift(nid, d) == "N":
+            if row[d - 1] == _N:
                 consec_n += 1
                 if consec_n == rules.max_consecutive_N + 1:
                     violation_details.append(f"{nurse.name}: {d}일 연속N {consec_n}회 초과")
@@ -280,13 +288,14 @@ def evaluate_schedule(schedule: Schedule, rules: Rules) -> dict:
 
     # 일일 인원 부족
     for d in range(1, num_days + 1):
+        counts = day_counts[d - 1]
         for st, req_val in [("D", rules.daily_D), ("E", rules.daily_E), ("N", rules.daily_N)]:
-            cnt = schedule.get_staff_count(d, st)
+            cnt = counts[CODE_OF[st]]
             if cnt < req_val:
                 violation_details.append(f"{d}일 {st} 인원 {cnt}명 (필요 {req_val})")
         # 중2: 평일만 체크
-        if not schedule.is_weekend(d):
-            cnt = schedule.get_staff_count(d, "중2")
+        if not cal.weekend[d - 1]:
+            cnt = counts[_M]
             if cnt < rules.daily_M:
                 violation_details.append(f"{d}일 중2 인원 {cnt}명 (필요 {rules.daily_M})")
 
@@ -9,17 +9,20 @@
   - 통계 시트
 """
 import calendar
+import hashlib
 import io
 import re
+from collections import Counter
 from datetime import date, timedelta
 from openpyxl import Workbook, load_workbook
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
 from openpyxl.styles.colors import Color
 from openpyxl.comments import Comment
 from openpyxl.utils import get_column_letter
+from engine.byte_cache import ByteLRU
 from engine.models import (
     Nurse, Request, Rules, Schedule,
-    WORK_SHIFTS, OFF_TYPES, ALL_CODES,
+    OFF_SET, ALL_CODES, WEEKDAY_NAMES,
 )
 
 
@@ -27,11 +30,27 @@ class EncryptedFileError(Exception):
     """파일이 암호화(비밀번호 보호)되어 있습니다."""
 
 
+# 복호화 결과 캐시 — 같은 암호 파일을 반복 업로드할 때 msoffcrypto 복호화 생략
+DECRYPT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+DECRYPT_CACHE_MAX_ITEMS = 16
+DECRYPT_CACHE_TTL_SEC = 30 * 60
+
+
+# (파일 내용 해시, 비밀번호 해시) → 복호화된 bytes
+_decrypt_cache = ByteLRU(DECRYPT_CACHE_MAX_ITEMS, DECRYPT_CACHE_MAX_BYTES, DECRYPT_CACHE_TTL_SEC)
+
+
+def clear_decrypt_cache() -> None:
+    """복호화 캐시 비우기"""
+    _decrypt_cache.clear()
+
+
 def load_workbook_safe(filepath: str, password: str | None = None, **kw):
     """암호화 여부를 감지하고, 필요하면 복호화 후 workbook 반환.
 
     - 암호화 없음: 일반 load_workbook 호출
     - 암호화 + password 있음: msoffcrypto로 복호화 후 BytesIO에서 열기
+      (같은 파일 내용 + 같은 비밀번호면 캐시된 복호화 결과 재사용)
     - 암호화 + password 없음: EncryptedFileError 발생
     """
     # 파일을 먼저 메모리로 읽어 OS 파일 핸들을 즉시 해제 (Windows 잠금 방지)
@@ -48,11 +67,94 @@ def load_workbook_safe(filepath: str, password: str | None = None, **kw):
         return load_workbook(io.BytesIO(raw), **kw)
     if password is None:
         raise EncryptedFileError("파일이 암호화되어 있습니다. 비밀번호가 필요합니다.")
-    office_file.load_key(password=password)
-    buf = io.BytesIO()
-    office_file.decrypt(buf)
-    buf.seek(0)
-    return load_workbook(buf, **kw)
+
+    # 키에는 비밀번호 원문 대신 해시만 보관
+    key = (
+        hashlib.sha256(raw).hexdigest(),
+        hashlib.sha256(password.encode("utf-8")).hexdigest(),
+    )
+    decrypted = _decrypt_cache.get(key)
+    if decrypted is None:
+        office_file.load_key(password=password)
+        buf = io.BytesIO()
+        office_file.decrypt(buf)
+        decrypted = buf.getvalue()
+        _decrypt_cache.put(key, decrypted)
+    return load_workbook(io.BytesIO(decrypted), **kw)
+
+
+class _Cell:
+    """파싱된 셀 값 (행/열 번호 포함)"""
+    __slots__ = ("row", "column", "value")
+
+    def __init__(self, row: int, column: int, value):
+        self.row = row
+        self.column = column
+        self.value = value
+
+
+class _SheetSnapshot:
+    """활성 시트 셀 값 메모리 사본 — openpyxl 워크시트의 읽기 API 일부를 흉내냄
+
+    read_only 워크시트는 iter_rows 호출마다 XML을 다시 파싱하므로,
+    한 번 읽어 둔 행을 여러 번 순회할 때 사용.
+    """
+    __slots__ = ("_rows",)
+
+    def __init__(self, ws):
+        self._rows = [
+            tuple(_Cell(r, c, cell.value) for c, cell in enumerate(row, 1))
+            for r, row in enumerate(ws.iter_rows(), 1)
+        ]
+
+    @property
+    def max_row(self) -> int:
+        return len(self._rows)
+
+    def __getitem__(self, row: int) -> tuple[_Cell, ...]:
+        return self._rows[row - 1] if 1 <= row <= len(self._rows) else ()
+
+    def iter_rows(self, min_row: int = 1, max_row: int | None = None, max_col: int | None = None):
+        stop = len(self._rows) if max_row is None else min(max_row, len(self._rows))
+        for r in range(max(min_row, 1) - 1, stop):
+            row = self._rows[r]
+            yield row if max_col is None else row[:max_col]
+
+
+class WorkbookSession:
+    """엑셀 파일을 1회만 복호화·파싱하고 여러 가져오기 함수가 공유
+
+    예: 이전 근무표 가져오기 (detect_file_month → import_prev_schedule → import_prev_menstrual)
+        session = WorkbookSession(path, password)
+        detect_file_month(session)
+        import_prev_schedule(session, names, ...)
+
+    - ws: 활성 시트 값 사본 (_SheetSnapshot)
+    - day_columns(): _find_day_columns 결과 캐시
+    """
+
+    def __init__(self, filepath: str, password: str | None = None):
+        wb = load_workbook_safe(filepath, password, read_only=True, data_only=True)
+        try:
+            self.ws = _SheetSnapshot(wb.active)
+        finally:
+            wb.close()
+        self._day_columns = None
+        self._day_columns_done = False
+
+    def day_columns(self) -> tuple[int, dict[int, int], int, int] | None:
+        """(header_row, day_cols, name_col, data_start) — 최초 1회만 탐색"""
+        if not self._day_columns_done:
+            self._day_columns = _find_day_columns(self.ws)
+            self._day_columns_done = True
+        return self._day_columns
+
+
+def _open_session(filepath: "str | WorkbookSession", password: str | None) -> WorkbookSession:
+    """경로면 새 세션 생성, 이미 세션이면 그대로 사용"""
+    if isinstance(filepath, WorkbookSession):
+        return filepath
+    return WorkbookSession(filepath, password)
 
 
 # ══════════════════════════════════════════
@@ -123,59 +225,98 @@ RED_BORDER = Border(
 )
 CENTER = Alignment(horizontal="center", vertical="center")
 
+# 셀마다 새로 만들지 않고 공유하는 스타일 객체
+TITLE_FONT = Font(bold=True, size=14, color="FFFFFF")
+TITLE_ALIGN = Alignment(horizontal="center")
+HEADER_FONT_SMALL = Font(bold=True, size=9)
+BODY_FONT = Font(size=10)
+WEEKDAY_FONT = Font(size=9, color="333333")
+WEEKEND_DAY_FONT = Font(size=9, color="CC0000")
+SHORTAGE_FONT = Font(size=10, color="CC0000")
+MATCHED_FILL = PatternFill(start_color="FFFF66", fill_type="solid")
+WHITE_FILL = PatternFill(start_color="FFFFFF", fill_type="solid")
+
 
 
 # ══════════════════════════════════════════
 # 내보내기
 # ══════════════════════════════════════════
 
-def export_schedule(schedule: Schedule, rules: Rules, filepath: str):
-    """근무표 + 통계를 엑셀로 내보내기"""
+def export_schedule(schedule: Schedule, rules: Rules, filepath):
+    """근무표 + 통계를 엑셀로 내보내기
+
+    filepath: 파일 경로 또는 쓰기 가능한 바이너리 스트림 (BytesIO 등)
+    """
+    wb = _build_export_workbook(schedule, rules)
+    wb.save(filepath)
+
+
+def export_schedule_bytes(schedule: Schedule, rules: Rules) -> bytes:
+    """근무표 + 통계 xlsx를 메모리에서 생성해 bytes로 반환 (임시 파일 없음)"""
+    buf = io.BytesIO()
+    export_schedule(schedule, rules, buf)
+    return buf.getvalue()
+
+
+def _nurse_shift_counts(schedule: Schedule, nurse_id: int, num_days: int) -> tuple[list[str], Counter]:
+    """간호사 1명의 날짜별 근무 목록 + 코드별 횟수 (1회 순회)"""
+    shifts = [schedule.get_shift(nurse_id, d) for d in range(1, num_days + 1)]
+    return shifts, Counter(shifts)
+
+
+def _build_export_workbook(schedule: Schedule, rules: Rules) -> Workbook:
     wb = Workbook()
 
     # ── Sheet 1: 근무표 ──
     ws = wb.active
     ws.title = "근무표"
 
+    cal = schedule.calendar
     start_date = schedule.start_date
-    end_date = schedule.date_of(28)
-    num_days = schedule.num_days
+    num_days = cal.num_days
+    end_date = cal.date_of(num_days)
     nurses = schedule.nurses
-    weekday_names = ["월", "화", "수", "목", "금", "토", "일"]
+    weekday_names = WEEKDAY_NAMES
+
+    # 간호사별 근무/횟수는 1회만 계산해 두 시트에서 공유
+    nurse_shifts: dict[int, list[str]] = {}
+    nurse_counts: dict[int, Counter] = {}
+    for nurse in nurses:
+        nurse_shifts[nurse.id], nurse_counts[nurse.id] = _nurse_shift_counts(schedule, nurse.id, num_days)
 
     # 타이틀
     ws.merge_cells(start_row=1, start_column=1, end_row=1, end_column=num_days + 8)
     title = f"{start_date.strftime('%Y.%m.%d')} ~ {end_date.strftime('%Y.%m.%d')} 응급실 근무표"
     ws.cell(1, 1, title)
-    ws.cell(1, 1).font = Font(bold=True, size=14, color="FFFFFF")
+    ws.cell(1, 1).font = TITLE_FONT
     ws.cell(1, 1).fill = TITLE_FILL
-    ws.cell(1, 1).alignment = Alignment(horizontal="center")
+    ws.cell(1, 1).alignment = TITLE_ALIGN
 
     # 헤더 (행3)
     stat_cols = ["총 근무", "D", "중2", "E", "N", "OFF", "휴가", "생휴", "수면", "법휴",
                  "공가", "경가", "보수", "필수", "잔여수면", "잔여휴가"]
-    headers = ["이름"] + [f"{(start_date + timedelta(days=d-1)).day}일" for d in range(1, num_days + 1)] + stat_cols
+    headers = ["이름"] + [f"{dt.day}일" for dt in cal.dates] + stat_cols
     for c, h in enumerate(headers, 1):
         cell = ws.cell(3, c, h)
         cell.fill = HEADER_FILL
         # 이름 열(1)과 통계 열은 10pt, 날짜 열은 9pt
         if c == 1 or c > num_days + 1:
-            cell.font = Font(bold=True, size=10)
+            cell.font = HEADER_FONT
         else:
-            cell.font = Font(bold=True, size=9)
+            cell.font = HEADER_FONT_SMALL
         cell.alignment = CENTER
         cell.border = THIN_BORDER
 
     # 요일 행 (행4)
     ws.cell(4, 1, "요일")
-    ws.cell(4, 1).font = Font(size=10)
+    ws.cell(4, 1).font = BODY_FONT
     ws.cell(4, 1).alignment = CENTER
     ws.cell(4, 1).border = THIN_BORDER
     for d in range(1, num_days + 1):
-        wd = schedule.weekday_index(d)
+        wd = cal.weekdays[d - 1]
         cell = ws.cell(4, d + 1, weekday_names[wd])
         cell.alignment = CENTER
-        cell.font = Font(size=9, color="CC0000" if wd >= 5 else "333333")
+        cell.font = WEEKEND_DAY_FONT if wd >= 5 else WEEKDAY_FONT
         cell.border = THIN_BORDER
         if wd >= 5:
             cell.fill = WEEKEND_FILL
@@ -183,7 +324,6 @@ def export_schedule(schedule: Schedule, rules: Rules, filepath: str):
         ws.cell(4, num_days + 2 + j).border = THIN_BORDER
 
     # 요청사항 조회 맵 구성
-    _off_set = set(OFF_TYPES)
     req_map: dict[tuple[int, int], list[str]] = {}
     is_or_map: dict[tuple[int, int], bool] = {}
     for r in schedule.requests:
@@ -196,19 +336,18 @@ def export_schedule(schedule: Schedule, rules: Rules, filepath: str):
             is_or_map[key] = False
 
     # 간호사별 데이터
-    weekend_days = [d for d in range(1, num_days + 1) if schedule.is_weekend(d)]
-
     for i, nurse in enumerate(nurses):
         row = 5 + i
         ws.cell(row, 1, nurse.name)
-        ws.cell(row, 1).font = Font(size=10)
+        ws.cell(row, 1).font = BODY_FONT
         ws.cell(row, 1).alignment = CENTER
         ws.cell(row, 1).border = THIN_BORDER
 
-        d_cnt, 중2_cnt, e_cnt, n_cnt, off_cnt = 0, 0, 0, 0, 0
+        shifts = nurse_shifts[nurse.id]
+        counts = nurse_counts[nurse.id]
 
         for d in range(1, num_days + 1):
-            shift = schedule.get_shift(nurse.id, d)
+            shift = shifts[d - 1]
             cell = ws.cell(row, d + 1, shift)
             cell.alignment = CENTER
 
@@ -234,7 +373,7 @@ def export_schedule(schedule: Schedule, rules: Rules, filepath: str):
                         is_matched = True
                 else:
                     for c in req_codes:
-                        if c in _off_set and shift in _off_set:
+                        if c in OFF_SET and shift in OFF_SET:
                             is_matched = True
                             break
                         if c == shift:
@@ -245,89 +384,67 @@ def export_schedule(schedule: Schedule, rules: Rules, filepath: str):
 
             # 배경/테두리: 매칭 → 노란색, 불일치 → 흰색+빨간테두리, 없음 → 흰색(주말 연회색)
             if is_matched:
-                cell.fill = PatternFill(start_color="FFFF66", fill_type="solid")
+                cell.fill = MATCHED_FILL
                 cell.border = THIN_BORDER
             elif is_violation:
-                cell.fill = PatternFill(start_color="FFFFFF", fill_type="solid")
+                cell.fill = WHITE_FILL
                 cell.border = RED_BORDER
                 cell.comment = Comment(f"요청: {req_display}", "시스템")
             else:
-                if schedule.weekday_index(d) >= 5:
+                if cal.weekend[d - 1]:
                     cell.fill = WEEKEND_FILL
                 else:
-                    cell.fill = PatternFill(start_color="FFFFFF", fill_type="solid")
+                    cell.fill = WHITE_FILL
                 cell.border = THIN_BORDER
 
             if shift in FONTS:
                 cell.font = FONTS[shift]
 
-            if shift == "D":
-                d_cnt += 1
-            elif shift == "중2":
-                중2_cnt += 1
-            elif shift == "E":
-                e_cnt += 1
-            elif shift == "N":
-                n_cnt += 1
-            elif shift in OFF_TYPES or shift == "OFF":
-                off_cnt += 1
-
+        d_cnt, 중2_cnt, e_cnt, n_cnt = counts["D"], counts["중2"], counts["E"], counts["N"]
         total_work = d_cnt + 중2_cnt + e_cnt + n_cnt
-        wk_work = sum(
-            1 for d in weekend_days
-            if schedule.get_shift(nurse.id, d) in WORK_SHIFTS
-        )
 
         # 휴가잔여/생휴/잔여수면 계산
-        vac_used = sum(1 for d in range(1, num_days + 1)
-                       if schedule.get_shift(nurse.id, d) == "휴가")
+        vac_used = counts["휴가"]
         vac_remain = nurse.vacation_days - vac_used
-        menst_cnt = sum(1 for d in range(1, num_days + 1)
-                        if schedule.get_shift(nurse.id, d) == "생휴")
-        sleep_cnt = sum(1 for d in range(1, num_days + 1)
-                        if schedule.get_shift(nurse.id, d) == "수면")
+        sleep_cnt = counts["수면"]
         sleep_earned = (1 if n_cnt >= rules.sleep_N_monthly else 0) + (1 if nurse.pending_sleep else 0)
         sleep_remain = sleep_earned - sleep_cnt
 
-        only_off_cnt = sum(1 for d in range(1, num_days + 1) if schedule.get_shift(nurse.id, d) == "OFF")
-        beophyu_cnt = sum(1 for d in range(1, num_days + 1) if schedule.get_shift(nurse.id, d) == "법휴")
-        gong_cnt  = sum(1 for d in range(1, num_days + 1) if schedule.get_shift(nurse.id, d) == "공가")
-        gyeong_cnt= sum(1 for d in range(1, num_days + 1) if schedule.get_shift(nurse.id, d) == "경가")
-        bosu_cnt  = sum(1 for d in range(1, num_days + 1) if schedule.get_shift(nurse.id, d) == "보수")
-        pilsu_cnt = sum(1 for d in range(1, num_days + 1) if schedule.get_shift(nurse.id, d) == "필수")
         # stat_cols order: 총 근무, D, 중2, E, N, OFF, 휴가, 생휴, 수면, 법휴, 공가, 경가, 보수, 필수, 잔여수면, 잔여휴가
         stat_vals = [total_work, d_cnt, 중2_cnt, e_cnt, n_cnt,
-                     only_off_cnt or "", vac_used or "", menst_cnt or "", sleep_cnt or "", beophyu_cnt or "",
-                     gong_cnt or "", gyeong_cnt or "", bosu_cnt or "", pilsu_cnt or "",
+                     counts["OFF"] or "", vac_used or "", counts["생휴"] or "", sleep_cnt or "", counts["법휴"] or "",
+                     counts["공가"] or "", counts["경가"] or "", counts["보수"] or "", counts["필수"] or "",
                      sleep_remain if sleep_remain > 0 else "", vac_remain]
         for j, val in enumerate(stat_vals):
             cell = ws.cell(row, num_days + 2 + j, val)
             cell.alignment = CENTER
             cell.border = THIN_BORDER
-            cell.font = Font(size=10)
+            cell.font = BODY_FONT
+
+    # 집계 행 — 날짜별 근무 인원 1회 집계
+    day_counts = [Counter() for _ in range(num_days)]
+    for nurse in nurses:
+        for di, shift in enumerate(nurse_shifts[nurse.id]):
+            day_counts[di][shift] += 1
 
-    # 집계 행
     sep_row = 5 + len(nurses)
     for si, shift_type in enumerate(["D", "중2", "E", "N"]):
         agg_row = sep_row + 1 + si
         ws.cell(agg_row, 1, f"{shift_type} 인원")
-        ws.cell(agg_row, 1).font = Font(size=10)
+        ws.cell(agg_row, 1).font = BODY_FONT
         ws.cell(agg_row, 1).alignment = CENTER
 
+        min_req = rules.get_daily_staff(shift_type)
         for d in range(1, num_days + 1):
-            count = sum(
-                1 for n in nurses
-                if schedule.get_shift(n.id, d) == shift_type
-            )
+            count = day_counts[d - 1][shift_type]
             cell = ws.cell(agg_row, d + 1, count)
             cell.alignment = CENTER
             cell.border = THIN_BORDER
-            cell.font = Font(size=10)
+            cell.font = BODY_FONT
 
-            min_req = rules.get_daily_staff(shift_type)
             if count < min_req:
                 cell.fill = SHORTAGE_FILL
-                cell.font = Font(size=10, color="CC0000")
+                cell.font = SHORTAGE_FONT
 
     # 컬럼 너비
     ws.column_dimensions["A"].width = 12
@@ -339,9 +456,9 @@ def export_schedule(schedule: Schedule, rules: Rules, filepath: str):
     # ── Sheet 2: 통계 ──
     ws2 = wb.create_sheet("통계")
     ws2.cell(1, 1, f"{start_date.strftime('%Y.%m.%d')} ~ {end_date.strftime('%Y.%m.%d')} 개인별 통계")
-    ws2.cell(1, 1).font = Font(bold=True, size=14, color="FFFFFF")
+    ws2.cell(1, 1).font = TITLE_FONT
     ws2.cell(1, 1).fill = TITLE_FILL
-    ws2.cell(1, 1).alignment = Alignment(horizontal="center")
+    ws2.cell(1, 1).alignment = TITLE_ALIGN
 
     stat_headers = ["이름", "직급", "역할", "총근무", "D", "중2", "E", "N",
                     "OFF", "휴가", "생휴", "수면", "법휴", "공가", "경가", "보수", "필수",
@@ -356,48 +473,22 @@ def export_schedule(schedule: Schedule, rules: Rules, filepath: str):
 
     for i, nurse in enumerate(nurses):
         row = 4 + i
-        d_cnt = sum(
-            1 for d in range(1, num_days + 1)
-            if schedule.get_shift(nurse.id, d) == "D"
-        )
-        중2_cnt = sum(
-            1 for d in range(1, num_days + 1)
-            if schedule.get_shift(nurse.id, d) == "중2"
-        )
-        e_cnt = sum(
-            1 for d in range(1, num_days + 1)
-            if schedule.get_shift(nurse.id, d) == "E"
-        )
-        n_cnt = schedule.get_day_count(nurse.id, "N")
-        off_cnt = num_days - d_cnt - 중2_cnt - e_cnt - n_cnt
+        counts = nurse_counts[nurse.id]
+        d_cnt, 중2_cnt, e_cnt, n_cnt = counts["D"], counts["중2"], counts["E"], counts["N"]
         total_work = d_cnt + 중2_cnt + e_cnt + n_cnt
         n_ratio = f"{n_cnt / total_work * 100:.0f}%" if total_work > 0 else "0%"
-        wk_work = sum(
-            1 for d in weekend_days
-            if schedule.get_shift(nurse.id, d) in WORK_SHIFTS
-        )
 
         # 휴가잔여/생휴/수면 계산
-        vac_used = sum(1 for d in range(1, num_days + 1)
-                       if schedule.get_shift(nurse.id, d) == "휴가")
+        vac_used = counts["휴가"]
         vac_remain = nurse.vacation_days - vac_used
-        menst_cnt = sum(1 for d in range(1, num_days + 1)
-                        if schedule.get_shift(nurse.id, d) == "생휴")
-        sleep_cnt = sum(1 for d in range(1, num_days + 1)
-                        if schedule.get_shift(nurse.id, d) == "수면")
+        sleep_cnt = counts["수면"]
         sleep_earned = (1 if n_cnt >= rules.sleep_N_monthly else 0) + (1 if nurse.pending_sleep else 0)
         sleep_remain = sleep_earned - sleep_cnt
 
-        only_off_cnt = sum(1 for d in range(1, num_days + 1) if schedule.get_shift(nurse.id, d) == "OFF")
-        beophyu_cnt2 = sum(1 for d in range(1, num_days + 1) if schedule.get_shift(nurse.id, d) == "법휴")
-        gong_cnt2   = sum(1 for d in range(1, num_days + 1) if schedule.get_shift(nurse.id, d) == "공가")
-        gyeong_cnt2 = sum(1 for d in range(1, num_days + 1) if schedule.get_shift(nurse.id, d) == "경가")
-        bosu_cnt2   = sum(1 for d in range(1, num_days + 1) if schedule.get_shift(nurse.id, d) == "보수")
-        pilsu_cnt2  = sum(1 for d in range(1, num_days + 1) if schedule.get_shift(nurse.id, d) == "필수")
         data = [nurse.name, nurse.grade or "일반", nurse.role or "-",
                 total_work, d_cnt, 중2_cnt, e_cnt, n_cnt,
-                only_off_cnt or "", vac_used or "", menst_cnt or "", sleep_cnt or "",
-                beophyu_cnt2 or "", gong_cnt2 or "", gyeong_cnt2 or "", bosu_cnt2 or "", pilsu_cnt2 or "",
+                counts["OFF"] or "", vac_used or "", counts["생휴"] or "", sleep_cnt or "",
+                counts["법휴"] or "", counts["공가"] or "", counts["경가"] or "", counts["보수"] or "", counts["필수"] or "",
                 n_ratio, sleep_remain if sleep_remain > 0 else "", vac_remain]
         for c, val in enumerate(data, 1):
             cell = ws2.cell(row, c, val)
@@ -407,14 +498,14 @@ def export_schedule(schedule: Schedule, rules: Rules, filepath: str):
     for c in range(1, len(stat_headers) + 1):
         ws2.column_dimensions[get_column_letter(c)].width = 10
 
-    wb.save(filepath)
+    return wb
 
 
 # ══════════════════════════════════════════
 # 가져오기: 근무 규칙 엑셀 → 간호사 속성
 # ══════════════════════════════════════════
 
-def import_nurse_rules(filepath: str, password: str | None = None) -> list[Nurse]:
+def import_nurse_rules(filepath: "str | WorkbookSession", password: str | None = None) -> list[Nurse]:
     """근무표_규칙.xlsx에서 간호사 목록 + 속성 불러오기
 
     형식:
@@ -426,8 +517,8 @@ def import_nurse_rules(filepath: str, password: str | None = None) -> list[Nurse
     """
     WD_MAP = {"월": 0, "화": 1, "수": 2, "목": 3, "금": 4, "토": 5, "일": 6}
 
-    wb = load_workbook_safe(filepath, password, read_only=True, data_only=True)
-    ws = wb.active
+    session = _open_session(filepath, password)
+    ws = session.ws
 
     # 헤더 행 찾기 ("이름" 포함 행)
     header_row = None
@@ -443,7 +534,6 @@ def import_nurse_rules(filepath: str, password: str | None = None) -> list[Nurse
             break
 
     if not header_row or not name_col:
-        wb.close()
         return []
 
     # 비고 컬럼 위치 (이름 기준 상대)
@@ -522,7 +612,6 @@ def import_nurse_rules(filepath: str, password: str | None = None) -> list[Nurse
         nurses.append(nurse)
         nurse_id += 1
 
-    wb.close()
     return nurses
 
 
@@ -679,7 +768,7 @@ def _find_day_columns(ws) -> tuple[int, dict[int, int], int, int] | None:
 
 
 def import_requests(
-    filepath: str,
+    filepath: "str | WorkbookSession",
     nurses: list[Nurse],
     start_date: date,
     password: str | None = None,
@@ -687,7 +776,7 @@ def import_requests(
     """근무신청표 엑셀에서 요청사항 + 간호사 속성 읽기
 
     Args:
-        filepath: 엑셀 파일 경로
+        filepath: 엑셀 파일 경로 또는 WorkbookSession
         nurses: 간호사 목록 (이름 매칭용, 속성도 업데이트됨)
         start_date: 스케줄 시작일
 
@@ -709,15 +798,14 @@ def import_requests(
       D열: 수면 (값 있으면 전월 이월)
       E~AF열: 1일~28일 (코드 입력)
     """
-    wb = load_workbook_safe(filepath, password, read_only=True, data_only=True)
-    ws = wb.active
+    session = _open_session(filepath, password)
+    ws = session.ws
 
     nurse_name_map = {n.name.strip(): n for n in nurses}
     num_days = 28
 
-    result = _find_day_columns(ws)
+    result = session.day_columns()
     if result is None:
-        wb.close()
         return [], {}
 
     header_row, day_cols, name_col, data_start = result
@@ -831,21 +919,19 @@ def import_requests(
         if first_weekly is not None:
             weekly_off_map[nid] = first_weekly
 
-    wb.close()
     return requests, weekly_off_map
 
 
-def import_nurses_from_request(filepath: str, password: str | None = None) -> list[str]:
+def import_nurses_from_request(filepath: "str | WorkbookSession", password: str | None = None) -> list[str]:
     """근무신청표에서 간호사 이름 목록만 추출
 
     Returns: 이름 리스트 (순서 유지)
     """
-    wb = load_workbook_safe(filepath, password, read_only=True, data_only=True)
-    ws = wb.active
+    session = _open_session(filepath, password)
+    ws = session.ws
 
-    result = _find_day_columns(ws)
+    result = session.day_columns()
     if result is None:
-        wb.close()
         return []
 
     _header_row, _day_cols, name_col, data_start = result
@@ -864,7 +950,6 @@ def import_nurses_from_request(filepath: str, password: str | None = None) -> li
             break  # 집계 행 도달
         names.append(val)
 
-    wb.close()
     return names
 
 
@@ -873,7 +958,7 @@ def import_nurses_from_request(filepath: str, password: str | None = None) -> li
 # ══════════════════════════════════════════
 
 def import_prev_schedule(
-    filepath: str,
+    filepath: "str | WorkbookSession",
     nurse_names: list[str],
     tail_days: int = 5,
     password: str | None = None,
@@ -887,7 +972,7 @@ def import_prev_schedule(
       행5+: 간호사별 (A열: 이름, B~AC열: 근무)
 
     Args:
-        filepath: 엑셀 파일 경로
+        filepath: 엑셀 파일 경로 또는 WorkbookSession
         nurse_names: 매칭할 간호사 이름 리스트
         tail_days: 추출할 마지막 일수 (기본 5)
 
@@ -898,12 +983,11 @@ def import_prev_schedule(
         - sleep_counts: {이름: 전월 수면 사용 횟수}
         - vac_days: {이름: 휴가잔여 일수}
     """
-    wb = load_workbook_safe(filepath, password, read_only=True, data_only=True)
-    ws = wb.active
+    session = _open_session(filepath, password)
+    ws = session.ws
 
-    result = _find_day_columns(ws)
+    result = session.day_columns()
     if result is None:
-        wb.close()
         raise ValueError(
             "날짜 열(1~28일)을 찾을 수 없습니다. "
             "이전 달 근무표 엑셀 파일이 아닙니다."
@@ -912,7 +996,6 @@ def import_prev_schedule(
     header_row, day_cols, name_col, data_start = result
 
     if len(day_cols) < 20:
-        wb.close()
         raise ValueError(
             f"날짜 열이 {len(day_cols)}개뿐입니다 (최소 20개 필요). "
             "28일 근무표 형식의 파일이 아닙니다."
@@ -932,7 +1015,6 @@ def import_prev_schedule(
                     except ValueError:
                         pass
         if first_cal_day is not None and first_cal_day != expected_start_date.day:
-            wb.close()
             raise ValueError(
                 f"파일 시작일({first_cal_day}일)이 직전 기간 시작일({expected_start_date.day}일)과 다릅니다.\n"
                 f"직전 기간({expected_start_date.year}년 {expected_start_date.month}월 "
@@ -1010,12 +1092,11 @@ def import_prev_schedule(
                 except (ValueError, TypeError):
                     pass
 
-    wb.close()
     return tail_result, n_counts, sleep_counts, vac_days
 
 
 def import_prev_menstrual(
-    filepath: str,
+    filepath: "str | WorkbookSession",
     nurse_names: list[str],
     start_date: date,
     password: str | None = None,
@@ -1023,19 +1104,18 @@ def import_prev_menstrual(
     """이전 근무표에서 간호사별 월별 생휴 횟수 추출
 
     Args:
-        filepath: 엑셀 파일 경로
+        filepath: 엑셀 파일 경로 또는 WorkbookSession
         nurse_names: 매칭할 간호사 이름 리스트
         start_date: 이전 근무표 시작일 (실제 달력 날짜 계산용)
 
     Returns:
         {nurse_name: {month: count}} — 월별 생휴 사용 횟수
     """
-    wb = load_workbook_safe(filepath, password, read_only=True, data_only=True)
-    ws = wb.active
+    session = _open_session(filepath, password)
+    ws = session.ws
 
-    result = _find_day_columns(ws)
+    result = session.day_columns()
     if result is None:
-        wb.close()
         return {}
 
     header_row, day_cols, name_col, data_start = result
@@ -1062,7 +1142,6 @@ def import_prev_menstrual(
                 counts[actual.month] = counts.get(actual.month, 0) + 1
         menstrual_by_nurse[name] = counts
 
-    wb.close()
     return menstrual_by_nurse
 
 
@@ -1070,7 +1149,7 @@ def import_prev_menstrual(
 # 파일 날짜 탐지
 # ══════════════════════════════════════════
 
-def detect_file_month(filepath: str, password: str | None = None) -> tuple[int | None, int | None]:
+def detect_file_month(filepath: "str | WorkbookSession", password: str | None = None) -> tuple[int | None, int | None]:
     """엑셀 파일에서 연도/월 정보를 탐지
 
     파일 내용(셀 텍스트)에서 검색.
@@ -1081,8 +1160,8 @@ def detect_file_month(filepath: str, password: str | None = None) -> tuple[int |
         (year, month) — 탐지 실패 시 각각 None
     """
     # ── 파일 내용에서 탐지 ──
-    wb = load_workbook_safe(filepath, password, read_only=True, data_only=True)
-    ws = wb.active
+    session = _open_session(filepath, password)
+    ws = session.ws
 
     # Pass 1: 고신뢰 — "YYYY년 M월" 또는 "YYYY.MM"
     for row in ws.iter_rows(min_row=1, max_row=10):
@@ -1094,7 +1173,6 @@ def detect_file_month(filepath: str, password: str | None = None) -> tuple[int |
             # "2026년 3월" or "2026년3월"
             m = re.search(r'(\d{4})\s*년\s*(\d{1,2})\s*월', val)
             if m:
-                wb.close()
                 return int(m.group(1)), int(m.group(2))
 
             # "2026.03.01" or "2026-03-01" or "2026/3"
@@ -1102,7 +1180,6 @@ def detect_file_month(filepath: str, password: str | None = None) -> tuple[int |
             if m:
                 y, mo = int(m.group(1)), int(m.group(2))
                 if 1 <= mo <= 12 and 2000 <= y <= 2099:
-                    wb.close()
                     return y, mo
 
     # Pass 2: 저신뢰 — 짧은 셀(제목 등)에서 "X월" 탐색
@@ -1116,8 +1193,6 @@ def detect_file_month(filepath: str, password: str | None = None) -> tuple[int |
             if m:
                 mo = int(m.group(1))
                 if 1 <= mo <= 12:
-                    wb.close()
                     return None, mo
 
-    wb.close()
     return None, None
@@ -1,6 +1,11 @@
-"""한국 공휴일 자동 감지 (holidays 패키지 사용)"""
+"""한국 공휴일 자동 감지 (holidays 패키지 사용)
+
+연도별 공휴일 표는 프로세스 전역 LRU 캐시에 보관 (holidays 객체 생성 비용 1회)
+"""
 
 from datetime import date, timedelta
+from functools import lru_cache
+from types import MappingProxyType
 import holidays
 
 
@@ -12,38 +17,51 @@ def _make_kr(years) -> holidays.HolidayBase:
         return holidays.KR(years=years)
 
 
-def get_holidays_for_period(start_date: date, num_days: int = 28) -> list[tuple[date, str]]:
-    """시작일~시작일+num_days 기간의 공휴일 [(date, name), ...] 반환
+@lru_cache(maxsize=16)
+def get_year_holidays(year: int) -> MappingProxyType:
+    """해당 연도 공휴일 {date: name} (읽기 전용, 연도별 캐시)"""
+    kr = _make_kr(year)
+    return MappingProxyType(dict(sorted(kr.items())))
 
-    기간이 2개 월에 걸칠 수 있으므로 관련 연도/월 모두 조회
-    """
-    end_date = start_date + timedelta(days=num_days - 1)
-    years = {start_date.year, end_date.year}
-    kr = _make_kr(years)
 
+@lru_cache(maxsize=64)
+def _period_holidays(start_date: date, num_days: int) -> tuple[tuple[date, str], ...]:
     result = []
     for offset in range(num_days):
         dt = start_date + timedelta(days=offset)
-        if dt in kr:
-            result.append((dt, kr[dt]))
-    return result
+        name = get_year_holidays(dt.year).get(dt)
+        if name is not None:
+            result.append((dt, name))
+    return tuple(result)
 
 
-def get_holidays_for_month(year: int, month: int) -> list[tuple[int, str]]:
-    """해당 연월의 공휴일 [(day, name), ...] 반환 (하위 호환)"""
-    kr = _make_kr(year)
-    return sorted(
+def get_holidays_for_period(start_date: date, num_days: int = 28) -> list[tuple[date, str]]:
+    """시작일~시작일+num_days 기간의 공휴일 [(date, name), ...] 반환
+
+    기간이 2개 월에 걸칠 수 있으므로 관련 연도/월 모두 조회
+    """
+    return list(_period_holidays(start_date, num_days))
+
+
+@lru_cache(maxsize=64)
+def _month_holidays(year: int, month: int) -> tuple[tuple[int, str], ...]:
+    return tuple(
         (dt.day, name)
-        for dt, name in kr.items()
+        for dt, name in get_year_holidays(year).items()
         if dt.month == month
     )
 
 
+def get_holidays_for_month(year: int, month: int) -> list[tuple[int, str]]:
+    """해당 연월의 공휴일 [(day, name), ...] 반환 (하위 호환)"""
+    return list(_month_holidays(year, month))
+
+
 def get_holiday_days(year: int, month: int) -> list[int]:
     """해당 월 공휴일 날짜(day)만 반환"""
-    return [day for day, _ in get_holidays_for_month(year, month)]
+    return [day for day, _ in _month_holidays(year, month)]
 
 
 def get_holidays_with_names(year: int, month: int) -> dict[int, str]:
     """해당 월 {day: name} 딕셔너리"""
-    return dict(get_holidays_for_month(year, month))
+    return dict(_month_holidays(year, month))
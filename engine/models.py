@@ -4,7 +4,10 @@
   - D: 주간 / D9·D1·중1·중2: 중간(입력전용: D9·D1·중1, 솔버배정: 중2) / E: 저녁 / N: 야간
 휴무 14종: 주, OFF, POFF, 법휴, 수면, 생휴, 휴가, 병가, 특휴, 공가, 경가, 보수, 필수, 번표
 """
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
+from enum import IntEnum
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Optional
 from datetime import date, timedelta
 import json
@@ -76,6 +79,115 @@ SHIFT_ORDER = {
     "N": 4,
 }
 
+# ══════════════════════════════════════════
+# 정수 근무 코드 (엔진 내부 표현)
+# 입출력(DB/엑셀/API)은 문자열 그대로, 엔진 내부 루프는 정수 코드 + 비트마스크 사용
+# 값은 solver 변수 인덱스와 동일 (shifts[(ni, di, si)]의 si)
+# ══════════════════════════════════════════
+
+class ShiftCode(IntEnum):
+    """근무/휴무 코드 ↔ 정수 (solver 타입 인덱스와 동일)"""
+    D = 0
+    중2 = 1
+    E = 2
+    N = 3
+    주 = 4
+    OFF = 5
+    법휴 = 6
+    수면 = 7
+    생휴 = 8
+    휴가 = 9
+    특휴 = 10
+    공가 = 11
+    경가 = 12
+    보수 = 13
+    POFF = 14
+    필수 = 15
+    번표 = 16
+    병가 = 17
+    D9 = 18
+    D1 = 19
+    중1 = 20
+
+
+NUM_CODES = len(ShiftCode)
+
+# 우선순위 조건과 무관하게 항상 hard로 처리할 코드 (의료/법적/행정 필수)
+_ALWAYS_HARD_CODES = {"병가", "D9", "D1", "번표", "수면"}
+
+# 빈칸/미지정/알 수 없는 코드 — 어떤 마스크에도 속하지 않는 비트 위치
+NO_CODE = NUM_CODES
+
+# 인덱스 → 문자열 코드
+CODE_NAMES: tuple[str, ...] = tuple(c.name for c in ShiftCode)
+
+# 문자열 코드 → 정수 코드
+CODE_OF: dict[str, int] = {c.name: int(c) for c in ShiftCode}
+
+
+def _mask(codes) -> int:
+    """코드 목록 → 비트마스크 (bit i = ShiftCode i)"""
+    m = 0
+    for c in codes:
+        m |= 1 << CODE_OF[c]
+    return m
+
+
+# 카테고리 비트마스크 — (MASK >> code) & 1 로 O(1) 판정
+WORK_MASK = _mask(WORK_SHIFTS)
+OFF_MASK = _mask(OFF_TYPES)
+AUTO_OFF_MASK = _mask(AUTO_OFF_CODES)
+HARD_MASK = _mask(_ALWAYS_HARD_CODES)               # Request.is_hard 대상
+MID_MASK = _mask(["D9", "D1", "중1", "중2"])         # 중간 계열
+D_MID_MASK = _mask(["D"]) | MID_MASK                # N→1휴무 뒤 금지 (D + 중간)
+NEAR_WORK_OFF_MASK = _mask(["보수", "필수", "번표"])  # N 다음날 금지 휴무 (실질 근무 준함)
+
+# 코드별 근무 순서 레벨 (역순 금지용, 휴무·NO_CODE는 0)
+CODE_LEVELS: tuple[int, ...] = tuple(SHIFT_ORDER.get(name, 0) for name in CODE_NAMES) + (0,)
+
+# 문자열 코드별 카테고리 플래그 — 문자열을 그대로 다루는 경계(요청/엑셀)에서 사용
+F_WORK = 1
+F_OFF = 2
+F_AUTO = 4
+F_HARD = 8
+F_EXCLUDE = 16
+CODE_FLAGS: dict[str, int] = {}
+for _name, _code in CODE_OF.items():
+    CODE_FLAGS[_name] = (
+        (F_WORK if (WORK_MASK >> _code) & 1 else 0)
+        | (F_OFF if (OFF_MASK >> _code) & 1 else 0)
+        | (F_AUTO if (AUTO_OFF_MASK >> _code) & 1 else 0)
+        | (F_HARD if (HARD_MASK >> _code) & 1 else 0)
+    )
+for _s in ("D", "E", "N"):
+    CODE_FLAGS[f"{_s} 제외"] = F_EXCLUDE
+del _name, _code, _s
+
+# 문자열 집합 (list 대신 O(1) 멤버십)
+WORK_SET = frozenset(WORK_SHIFTS)
+OFF_SET = frozenset(OFF_TYPES)
+
+
+def encode_shift(name: str | None) -> int:
+    """문자열 코드 → 정수 코드 (빈칸/알 수 없는 코드 → NO_CODE)"""
+    return CODE_OF.get(name, NO_CODE)
+
+
+def decode_shift(code: int) -> str:
+    """정수 코드 → 문자열 코드 (NO_CODE → "")"""
+    return CODE_NAMES[code] if code < NUM_CODES else ""
+
+
+def is_work_code(name: str | None) -> bool:
+    """근무 코드인가? (D/D9/D1/중1/중2/E/N)"""
+    return bool(CODE_FLAGS.get(name, 0) & F_WORK)
+
+
+def is_off_code(name: str | None) -> bool:
+    """휴무 코드인가? (빈칸 제외)"""
+    return bool(CODE_FLAGS.get(name, 0) & F_OFF)
+
+
 # 역할(비고1) 목록
 ROLES = ["", "책임만", "외상", "혼자 관찰불가", "혼자 관찰", "급성구역", "준급성", "격리구역", "중2"]
 
@@ -99,9 +211,14 @@ ROLE_TIERS = [
 # ══════════════════════════════════════════
 
 # @dataclass 사용 시 __init__이 자동 생성
-@dataclass
+# slots=True: 인스턴스 __dict__ 없음 → 생성/속성 접근이 빠르고 메모리 절약 (DB 수백~수천 행 변환용)
+@dataclass(slots=True)
 class Nurse:
-    """간호사"""
+    """간호사
+
+    엑셀 가져오기에서 필드를 채워 나가므로 frozen 아님.
+    해시는 id 기준 (같은 id = 같은 간호사) → dict/set 키, 캐시 키로 사용 가능
+    """
     id: int
     name: str
 
@@ -133,6 +250,9 @@ class Nurse:
 
     note: str = ""
 
+    def __hash__(self) -> int:
+        return hash((Nurse, self.id))
+
     def to_dict(self):
         """저장용"""
         return {
@@ -156,17 +276,33 @@ class Nurse:
     @classmethod
     def from_dict(cls, d):
         """복원용"""
-        valid = {"id", "name", "role", "grade", "is_pregnant", "is_male",
-                 "is_4day_week", "fixed_weekly_off",  "vacation_days", "prev_month_N", "pending_sleep",  "menstrual_used",
-                 "prev_tail_shifts", "note"}
-        filtered = {k: v for k, v in d.items() if k in valid}
+        filtered = {k: v for k, v in d.items() if k in _NURSE_FIELDS}
         return cls(**filtered)
 
 
-# 우선순위 조건과 무관하게 항상 hard로 처리할 코드 (의료/법적/행정 필수)
-_ALWAYS_HARD_CODES = {"병가", "D9", "D1", "번표", "수면"}
+_NURSE_FIELDS = frozenset(f.name for f in fields(Nurse))
 
-@dataclass
+
+@lru_cache(maxsize=512)
+def normalize_request_code(code: str) -> str:
+    """요청 코드 정규화 (코드 문자열 종류가 적으므로 결과 캐시)
+
+    "D제외" → "D 제외", "수면(1,2월)"/"수면 (3,4월)" → "수면", 앞뒤 공백 제거
+    """
+    code = code.strip()  # 공백 제거
+    # "D제외" → "D 제외", "N제외" → "N 제외" 등 통일
+    compact = code.replace(" ", "")
+    for s in ("D", "E", "N"):
+        if compact == f"{s}제외":
+            return f"{s} 제외"
+    # "수면(1,2월)", "수면(2월)", "수면 (3,4월)" 등 → "수면"
+    if code.startswith("수면"):
+        return "수면"
+    return code
+
+
+# frozen=True: 생성 후 변경 불가 + 필드 기반 __hash__ → 캐시 키/집합 원소로 사용 가능
+@dataclass(frozen=True, slots=True)
 class Request:
     """개인 요청 1건
 
@@ -189,15 +325,9 @@ class Request:
     score: int = 100                # 신청 시점 점수 스냅샷
 
     def __post_init__(self):
-        self.code = self.code.strip()  # 공백 제거
-        # "D제외" → "D 제외", "N제외" → "N 제외" 등 통일
-        for s in ["D", "E", "N"]:
-            if self.code.replace(" ", "") == f"{s}제외":
-                self.code = f"{s} 제외"
-                break
-        # "수면(1,2월)", "수면(2월)", "수면 (3,4월)" 등 → "수면"
-        if self.code.startswith("수면"):
-            self.code = "수면"
+        code = normalize_request_code(self.code)
+        if code is not self.code:
+            object.__setattr__(self, "code", code)  # frozen → 생성 시점에만 정규화
 
     # @property : 함수인데 변수처럼 -> 사용할 때 ()가 필요 없음 request.is_hard
     @property
@@ -212,7 +342,7 @@ class Request:
         """
         if self.is_or:
             return False
-        return self.code in _ALWAYS_HARD_CODES  # 병가/법휴/필수/D9/D1만 hard
+        return bool(CODE_FLAGS.get(self.code, 0) & F_HARD)  # 병가/번표/수면/D9/D1만 hard
 
     @property
     def is_exclude(self) -> bool:
@@ -233,12 +363,17 @@ class Request:
     @property
     def is_work_request(self) -> bool:
         """근무 희망 요청인가?"""
-        return self.code in WORK_SHIFTS
+        return bool(CODE_FLAGS.get(self.code, 0) & F_WORK)
 
     @property
     def is_off_request(self) -> bool:
         """휴무 관련 요청인가?"""
-        return self.code in OFF_TYPES or self.code == "OFF"
+        return bool(CODE_FLAGS.get(self.code, 0) & F_OFF)
+
+    @property
+    def shift_code(self) -> int:
+        """요청 코드의 정수 코드 (제외 요청 등 → NO_CODE)"""
+        return CODE_OF.get(self.code, NO_CODE)
 
     def to_dict(self):
         result = {"nurse_id": self.nurse_id, "day": self.day, "code": self.code}
@@ -261,9 +396,12 @@ class Request:
             score=d.get("score", 100),
         )
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Rules:
-    """근무표 규칙"""
+    """근무표 규칙
+
+    생성 후 변경 불가. public_holidays가 list라서 해시는 tuple로 변환해 계산
+    """
 
     # ── 일일 인원 ──
     daily_D: int = 7            # D 근무 인원
@@ -301,20 +439,109 @@ class Rules:
     # ── 법정공휴일 ──
     public_holidays: list = field(default_factory=list)    # 해당 월 공휴일 날짜 [1, 15, ...]
 
+    def __hash__(self) -> int:
+        return hash(tuple(
+            tuple(v) if isinstance(v, list) else v
+            for v in (getattr(self, name) for name in _RULES_FIELDS)
+        ))
+
     def get_daily_staff(self, shift: str) -> int:
         """근무별 일일 필요 인원"""
         return {"D": self.daily_D, "중2": self.daily_M, "E": self.daily_E, "N": self.daily_N}.get(shift, 0)
 
     def to_dict(self):
-        return {k: v for k, v in self.__dict__.items()}
+        return {name: getattr(self, name) for name in _RULES_FIELDS}
 
     @classmethod
     def from_dict(cls, d):
-        valid = {f.name for f in __import__('dataclasses').fields(cls)}
-        filtered = {k: v for k, v in d.items() if k in valid}
+        filtered = {k: v for k, v in d.items() if k in _RULES_FIELD_SET}
         return cls(**filtered)
 
 
+# 필드 목록은 클래스 정의 후 1회만 계산 (from_dict/to_dict 호출마다 fields() 재계산 방지)
+_RULES_FIELDS: tuple[str, ...] = tuple(f.name for f in fields(Rules))
+_RULES_FIELD_SET = frozenset(_RULES_FIELDS)
+
+
+# ══════════════════════════════════════════
+# 기간 달력 (28일 고정 가정을 한 곳에 모음)
+# ══════════════════════════════════════════
+
+PERIOD_DAYS = 28
+WEEKDAY_NAMES = ("월", "화", "수", "목", "금", "토", "일")
+
+
+@dataclass(frozen=True, slots=True)
+class PeriodCalendar:
+    """시작일 기준 28일 기간의 날짜 정보 (시작일·공휴일 조합당 1회 생성 후 공유)
+
+    인덱스 규칙: di = 0-based (solver), day = 1-based (Schedule/요청)
+      dates[di], weekdays[di], weekend[di], holiday[di], month_ids[di]
+    """
+    start_date: date
+    num_days: int
+    dates: tuple            # tuple[date]
+    weekdays: tuple         # tuple[int] 0=월 ... 6=일
+    weekend: tuple          # tuple[bool] 토/일
+    holiday: tuple          # tuple[bool] 법정공휴일 (rules.public_holidays 기준)
+    month_ids: tuple        # tuple[int] 날짜별 월
+    week_ranges: tuple      # ((1,7), (8,14), (15,21), (22,28)) — 1-based
+    month_days: MappingProxyType  # {월: (di, ...)} — 기간 내 등장 순서 (월 경계, 읽기 전용)
+
+    @property
+    def month_day_counts(self) -> dict[int, int]:
+        """{월: 기간 내 일수} — 등장 순서"""
+        return {m: len(dis) for m, dis in self.month_days.items()}
+
+    @property
+    def weekday_indices(self) -> list[int]:
+        """평일(월~금) di 목록"""
+        return [di for di in range(self.num_days) if not self.weekend[di]]
+
+    @property
+    def weekend_indices(self) -> list[int]:
+        """주말(토/일) di 목록"""
+        return [di for di in range(self.num_days) if self.weekend[di]]
+
+    def date_of(self, day: int) -> date:
+        """day(1-based) → 실제 날짜"""
+        return self.dates[day - 1]
+
+    def fmt_day(self, day: int) -> str:
+        """day(1-based) → "M/D" """
+        dt = self.dates[day - 1]
+        return f"{dt.month}/{dt.day}"
+
+
+@lru_cache(maxsize=64)
+def _build_period_calendar(start_date: date, holidays: tuple, num_days: int) -> PeriodCalendar:
+    dates = tuple(start_date + timedelta(days=di) for di in range(num_days))
+    weekdays = tuple(dt.weekday() for dt in dates)
+    holiday_set = set(holidays)
+    month_days: dict[int, list[int]] = {}
+    for di, dt in enumerate(dates):
+        month_days.setdefault(dt.month, []).append(di)
+    return PeriodCalendar(
+        start_date=start_date,
+        num_days=num_days,
+        dates=dates,
+        weekdays=weekdays,
+        weekend=tuple(wd >= 5 for wd in weekdays),   # 토=5, 일=6
+        holiday=tuple(di + 1 in holiday_set for di in range(num_days)),
+        month_ids=tuple(dt.month for dt in dates),
+        week_ranges=tuple((w * 7 + 1, min(w * 7 + 7, num_days)) for w in range((num_days + 6) // 7)),
+        month_days=MappingProxyType({m: tuple(dis) for m, dis in month_days.items()}),
+    )
+
+
+def period_calendar(start_date: date, public_holidays=(), num_days: int = PERIOD_DAYS) -> PeriodCalendar:
+    """기간 달력 조회 (같은 시작일·공휴일이면 캐시된 동일 객체 반환)
+
+    public_holidays: 기간 내 공휴일 day 목록 (1-based, rules.public_holidays)
+    """
+    return _build_period_calendar(start_date, tuple(sorted(set(public_holidays))), num_days)
+
+
 @dataclass
 class Schedule:
     """
@@ -329,6 +556,8 @@ class Schedule:
     requests: list              # list[Request]
     # 결과: schedule_data[nurse_id][day] = "D"/"E"/"N"/"OFF"/"주"/...
     schedule_data: dict = field(default_factory=dict)   # 객체를 만들때 마다 dict()를 새로 호출해서 빈 딕셔너리 생성
+    # (start_date, rules, 달력) — calendar 첫 조회 시 채움
+    _calendar: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)
 
     @property
     def year(self) -> int:
@@ -342,24 +571,35 @@ class Schedule:
 
     @property
     def num_days(self) -> int:
-        return 28
+        return PERIOD_DAYS
+
+    @property
+    def calendar(self) -> PeriodCalendar:
+        """기간 달력 — 첫 조회 시 인스턴스에 보관 (start_date·rules를 바꾸면 다시 조회)
+
+        Rules는 불변이라 같은 rules 객체면 공휴일도 같음
+        """
+        cached = self._calendar
+        if cached is None or cached[0] != self.start_date or cached[1] is not self.rules:
+            cal = period_calendar(self.start_date, self.rules.public_holidays if self.rules else ())
+            cached = self._calendar = (self.start_date, self.rules, cal)
+        return cached[2]
 
     def date_of(self, day: int) -> date:
         """day(1-based) → 실제 날짜"""
-        return self.start_date + timedelta(days=day - 1)
+        return self.calendar.dates[day - 1]
 
     def is_weekend(self, day: int) -> bool:
         """주말 여부"""
-        return self.date_of(day).weekday() >= 5   # 토=5, 일=6
+        return self.calendar.weekend[day - 1]
 
     def weekday_index(self, day: int) -> int:
         """0=월, 1=화, ..., 6=일"""
-        return self.date_of(day).weekday()
+        return self.calendar.weekdays[day - 1]
 
     def weekday_name(self, day: int) -> str:
         """요일 구분"""
-        names = ["월", "화", "수", "목", "금", "토", "일"]
-        return names[self.weekday_index(day)]
+        return WEEKDAY_NAMES[self.weekday_index(day)]
 
     def get_shift(self, nurse_id: int, day: int) -> str:
         """해당 간호사의 해당 날짜의 근무가 뭔지"""
@@ -381,7 +621,7 @@ class Schedule:
         """특정 간호사의 총 근무일 수 (근무만, 휴무 제외)"""
         if nurse_id not in self.schedule_data:
             return 0
-        return sum(1 for s in self.schedule_data[nurse_id].values() if s in WORK_SHIFTS)
+        return sum(1 for s in self.schedule_data[nurse_id].values() if s in WORK_SET)
 
     def get_staff_count(self, day: int, shift: str) -> int:
         """특정 날짜의 특정 근무 배정 인원 수"""
@@ -398,16 +638,21 @@ class Schedule:
 
     def is_work(self, nurse_id: int, day: int) -> bool:
         """해당 날짜가 근무인가?"""
-        return self.get_shift(nurse_id, day) in WORK_SHIFTS
+        return self.get_shift(nurse_id, day) in WORK_SET
 
     def is_off(self, nurse_id: int, day: int) -> bool:
         """해당 날짜가 휴무인가?"""
         s = self.get_shift(nurse_id, day)
-        return s in OFF_TYPES or s == ""
+        return s in OFF_SET or s == ""
+
+    def encoded_row(self, nurse_id: int) -> list[int]:
+        """간호사 1명의 28일 근무를 정수 코드 리스트로 (index 0 = day 1)"""
+        row = self.schedule_data.get(nurse_id, {})
+        return [CODE_OF.get(row.get(d), NO_CODE) for d in range(1, self.num_days + 1)]
 
     def get_week_ranges(self) -> list[tuple[int, int]]:
         """4주 고정: [(1,7), (8,14), (15,21), (22,28)]"""
-        return [(1, 7), (8, 14), (15, 21), (22, 28)]
+        return list(self.calendar.week_ranges)
 
 
 class DataManager:
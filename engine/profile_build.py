@@ -0,0 +1,84 @@
+"""솔버 모델 구축 프로파일러 — 제약 그룹별 시간·제약 수, cProfile, CpModel 내보내기
+
+탐색 없이 solve_schedule(build_only=True)로 모델만 구축.
+
+사용법 (프로젝트 루트에서):
+    python -m engine.profile_build --nurses 60                 # 합성 병동 60명, 그룹별 구축 시간
+    python -m engine.profile_build bundle.json                 # 번들(engine.replay와 같은 형식)
+    python -m engine.profile_build --nurses 100 --cprofile --top 30 --prof build.prof
+    python -m engine.profile_build bundle.json --export model.pbtxt   # + model.params.pbtxt
+    python -m engine.profile_build --nurses 100 --native-encoding      # CP-SAT 전용 불리언 제약
+
+내보낸 모델은 CP-SAT 도구로 직접 벤치마크/튜닝 가능 (.pb 바이너리는 C++ solve 도구용), 예:
+    from ortools.sat.python import cp_model
+    m = cp_model.CpModel(); m.proto.parse_text_format(open("model.pbtxt").read())
+    s = cp_model.CpSolver(); s.parameters.parse_text_format(open("model.params.pbtxt").read())
+    s.solve(m)
+"""
+import argparse
+import cProfile
+import io
+import logging
+import pstats
+
+from engine.solver import solve_schedule
+
+
+def _load_inputs(args):
+    if args.bundle:
+        from engine.bundle import bundle_inputs, load_bundle
+        return bundle_inputs(load_bundle(args.bundle))
+    from engine.synthetic import SyntheticSpec, generate
+    dept = generate(SyntheticSpec(num_nurses=args.nurses, seed=args.seed))
+    return dept.nurses, dept.requests, dept.rules, dept.start_date
+
+
+def print_groups(stats: dict) -> None:
+    groups = stats["build_groups"]
+    total = sum(g["sec"] for g in groups) or 1.0
+    print(f"{'group':<28} {'sec':>8} {'%':>6} {'constraints':>12}")
+    for g in sorted(groups, key=lambda g: g["sec"], reverse=True):
+        print(f"{g['group']:<28} {g['sec']:>8.3f} {g['sec'] / total * 100:>5.1f}% {g['constraints']:>12}")
+    print(f"\n구축 {stats['build_sec']:.3f}s | 변수 {stats['num_vars']} | 제약 {stats['num_constraints']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="솔버 모델 구축 프로파일러")
+    parser.add_argument("bundle", nargs="?", help="번들 JSON 경로 (없으면 합성 병동)")
+    parser.add_argument("--nurses", type=int, default=38, help="합성 병동 간호사 수")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cprofile", action="store_true", help="구축 과정 cProfile")
+    parser.add_argument("--top", type=int, default=25, help="cProfile 출력 함수 수")
+    parser.add_argument("--prof", help="cProfile 결과 저장 경로 (snakeviz 등으로 열람)")
+    parser.add_argument("--export", help="CpModel 저장 경로 (.pb 바이너리 / .pbtxt 텍스트)")
+    parser.add_argument("--native-encoding", action="store_true",
+                        help="불리언 제약을 CP-SAT 전용 제약으로 (solve_schedule native_encoding=True)")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)  # 솔버 진단 로그 숨김
+    nurses, requests, rules, start_date = _load_inputs(args)
+
+    stats: dict = {}
+    profiler = cProfile.Profile() if args.cprofile or args.prof else None
+    if profiler:
+        profiler.enable()
+    solve_schedule(nurses, requests, rules, start_date,
+                   stats=stats, export_path=args.export, build_only=True,
+                   native_encoding=args.native_encoding)
+    if profiler:
+        profiler.disable()
+
+    print_groups(stats)
+    if profiler:
+        if args.prof:
+            profiler.dump_stats(args.prof)
+            print(f"cProfile 저장: {args.prof}")
+        out = io.StringIO()
+        pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(args.top)
+        print(out.getvalue())
+    if args.export:
+        print(f"모델 저장: {args.export} (+ 솔버 파라미터 .params.pbtxt)")
+
+
+if __name__ == "__main__":
+    main()
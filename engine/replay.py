@@ -0,0 +1,153 @@
+"""솔버 번들 오프라인 재실행 — 네트워크/DB 없이 운영 달을 그대로 재현
+
+사용법 (프로젝트 루트에서):
+    python -m engine.replay bundle.json                         # 기록된 파라미터로 재실행
+    python -m engine.replay bundle.json --timeout 60
+    python -m engine.replay bundle.json --rule daily_N=6 --rule max_N_per_month=7
+    python -m engine.replay bundles/*.json --timeout 30 --out replay.json   # 여러 달 일괄
+    python -m engine.replay bundle.json --native-encoding        # CP-SAT 전용 불리언 제약으로 비교
+    python -m engine.replay bundle.json --no-symmetry-breaking   # 간호사 대칭 제거 없이
+    python -m engine.replay bundle.json --redundant-constraints  # 함의 제약 R1~R5 추가 (불가능 달 증명 시간 비교)
+    python -m engine.replay bundle.json --search night_first     # 야간 우선 분기
+    python -m engine.replay bundle.json --mode two_phase         # 야간 → 주간 2단계 분해
+
+기록된 stats가 있으면 이번 실행과 나란히 출력 (구축/첫 해/목적값/gap).
+번들 생성은 backend worker (settings.solver_bundle_dir) 또는 engine.bundle.make_bundle.
+"""
+import argparse
+import json
+import logging
+
+from engine.bundle import bundle_inputs, load_bundle
+from engine.solver import SEARCH_STRATEGIES, SOLVE_MODES, solve_schedule
+
+# 출력 대상 (이름, 표시 라벨)
+_COLUMNS = [
+    ("status", "status"), ("build_sec", "build"), ("num_vars", "vars"),
+    ("num_constraints", "cons"), ("presolve_sec", "presolve"), ("first_solution_sec", "first"),
+    ("solve_sec", "solve"), ("objective", "objective"), ("gap", "gap"),
+]
+
+
+def _parse_value(text: str):
+    """--rule 값: JSON으로 해석 가능하면 JSON (숫자·bool·리스트), 아니면 문자열"""
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+def _parse_rules(items: list[str]) -> dict:
+    overrides = {}
+    for item in items:
+        key, sep, value = item.partition("=")
+        if not sep:
+            raise SystemExit(f"--rule 형식 오류: {item} (KEY=VALUE)")
+        overrides[key.strip()] = _parse_value(value.strip())
+    return overrides
+
+
+def replay(bundle: dict, timeout: int | None = None, rule_overrides: dict | None = None,
+           native_encoding: bool | None = None, redundant_constraints: bool | None = None,
+           search_strategy: str | None = None, solve_mode: str | None = None,
+           symmetry_breaking: bool | None = None) -> dict:
+    """번들 1개 재실행 → stats (+ 기록된 결과와 배정 차이 셀 수)
+
+    timeout / native_encoding / redundant_constraints / search_strategy / solve_mode /
+    symmetry_breaking이 None이면 번들에 기록된 params 사용
+    (symmetry_breaking 기록이 없는 번들은 기록 당시 기본값인 True)
+    """
+    nurses, requests, rules, start_date = bundle_inputs(bundle, rule_overrides)
+    params = bundle.get("params", {})
+    if timeout is None:
+        timeout = params.get("timeout_seconds", 180)
+    if native_encoding is None:
+        native_encoding = params.get("native_encoding", False)
+    if redundant_constraints is None:
+        redundant_constraints = params.get("redundant_constraints", False)
+    if search_strategy is None:
+        search_strategy = params.get("search_strategy", "default")
+    if solve_mode is None:
+        solve_mode = params.get("solve_mode", "monolithic")
+    if symmetry_breaking is None:
+        symmetry_breaking = params.get("symmetry_breaking", True)
+    stats: dict = {"timeout_seconds": timeout, "native_encoding": native_encoding,
+                   "symmetry_breaking": symmetry_breaking,
+                   "redundant_constraints": redundant_constraints, "search_strategy": search_strategy,
+                   "solve_mode": solve_mode}
+    schedule = solve_schedule(nurses, requests, rules, start_date,
+                              timeout_seconds=timeout, stats=stats,
+                              native_encoding=native_encoding,
+                              symmetry_breaking=symmetry_breaking,
+                              redundant_constraints=redundant_constraints,
+                              search_strategy=search_strategy, solve_mode=solve_mode)
+
+    recorded = bundle.get("result")
+    if recorded is not None and schedule.schedule_data:
+        stats["changed_cells"] = sum(
+            1
+            for nid, days in schedule.schedule_data.items()
+            for d, shift in days.items()
+            if recorded.get(str(nid), {}).get(str(d)) != shift
+        )
+    return stats
+
+
+def _fmt(v) -> str:
+    if v is None:
+        return "-"
+    if isinstance(v, float):
+        return f"{v:.3f}" if abs(v) < 100 else f"{v:.0f}"
+    return str(v)
+
+
+def print_row(label: str, stats: dict) -> None:
+    print(f"  {label:<9}" + " ".join(f"{_fmt(stats.get(k)):>10}" for k, _ in _COLUMNS))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="솔버 번들 오프라인 재실행")
+    parser.add_argument("bundles", nargs="+", help="번들 JSON 경로")
+    parser.add_argument("--timeout", type=int, help="솔버 제한 시간(초), 기본: 번들 기록값")
+    parser.add_argument("--rule", action="append", default=[], metavar="KEY=VALUE",
+                        help="규칙 덮어쓰기 (반복 가능, 예: daily_N=6)")
+    parser.add_argument("--native-encoding", action="store_true",
+                        help="불리언 제약을 CP-SAT 전용 제약으로 (solve_schedule native_encoding=True)")
+    parser.add_argument("--no-symmetry-breaking", action="store_true",
+                        help="교환 가능한 간호사 대칭 제거 끄기 (solve_schedule symmetry_breaking=False)")
+    parser.add_argument("--redundant-constraints", action="store_true",
+                        help="함의 제약 R1~R5 추가 (solve_schedule redundant_constraints=True)")
+    parser.add_argument("--search", choices=SEARCH_STRATEGIES, help="탐색 전략, 기본: 번들 기록값")
+    parser.add_argument("--mode", choices=SOLVE_MODES, help="풀이 방식, 기본: 번들 기록값")
+    parser.add_argument("--out", help="재실행 결과 JSON 저장 경로")
+    parser.add_argument("-v", "--verbose", action="store_true", help="솔버 진행 로그 표시")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        logging.disable(logging.WARNING)
+    overrides = _parse_rules(args.rule)
+
+    report = {"overrides": overrides, "results": {}}
+    for path in args.bundles:
+        bundle = load_bundle(path)
+        print(f"[replay] {path}  (시작일 {bundle['start_date']}, "
+              f"간호사 {len(bundle['nurses'])}명, 신청 {len(bundle['requests'])}건)", flush=True)
+        stats = replay(bundle, args.timeout, overrides, True if args.native_encoding else None,
+                       True if args.redundant_constraints else None, args.search, args.mode,
+                       False if args.no_symmetry_breaking else None)
+        print(f"  {'':<9}" + " ".join(f"{label:>10}" for _, label in _COLUMNS))
+        if bundle.get("stats"):
+            print_row("recorded", bundle["stats"])
+        print_row("replay", stats)
+        if "changed_cells" in stats:
+            print(f"  기록된 결과 대비 변경 셀: {stats['changed_cells']}")
+        report["results"][path] = {"recorded": bundle.get("stats") or None, "replay": stats}
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n리포트 저장: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -39,6 +39,8 @@ Hard Constraints:
  H20. 휴무 편차 제한 (일반 ±2, 주4일제 +4)
  H21. 신청 휴무 샌드위치 금지 (휴무 신청한 날이 양쪽 모두 휴무 배정이면 해당 날도 반드시 휴무)
  특수 휴무 갯수 (생휴/수면 조건부 하드, 특휴/공가/경가/보수 하드요청분, 휴가 catch-all)
+ 대칭 제거 (교환 가능한 간호사끼리 근무 배열 사전식 정렬 — 최적값 불변, symmetry_breaking)
+ 함의 제약 R1~R5 (기존 제약 합산 — 해 공간 불변, redundant_constraints)
 
 Soft Constraints:
  S1. 희망 요청 반영 (A: +800+score×5, B: +250+score×5)
@@ -50,11 +52,15 @@ Soft Constraints:
  S7. 연속 휴무 보상 (+15/쌍) — 산발적 휴무 억제, 연속 휴무 유도
  S8. 월 N 초과 억제 (-300/개) — max_N_per_month 초과 시 강한 페널티 (소프트)
 """
-from datetime import date, timedelta
+import os
+import time
+from datetime import date
 from ortools.sat.python import cp_model
+from ortools.sat.python.cp_model import LinearExpr
 from engine.models import (
     Nurse, Request, Rules, Schedule, ROLE_TIERS, get_sleep_partner_month,
-    WORK_SHIFTS, SHIFT_ORDER,
+    SHIFT_ORDER, ShiftCode, NUM_CODES, CODE_NAMES, CODE_OF,
+    WORK_SET, OFF_SET, WEEKDAY_NAMES, PeriodCalendar, period_calendar,
 )
 import logging as _logging
 def _log(message):
@@ -62,46 +68,38 @@ def _log(message):
 
 
 # ══════════════════════════════════════════
-# 솔버 내 근무 타입 인덱스 (12개)
+# 솔버 내 근무 타입 인덱스 (21개) — engine.models.ShiftCode와 동일
 # ══════════════════════════════════════════
 
 # 근무 (기존 인덱스 유지, 입력전용 3종은 끝에 추가)
-_D, _중2, _E, _N = 0, 1, 2, 3
+_D, _중2, _E, _N = int(ShiftCode.D), int(ShiftCode.중2), int(ShiftCode.E), int(ShiftCode.N)
 
 # 휴무 (개별 타입) — _N=3 다음부터 시작
-_주 = 4
-_OFF = 5
-_법휴 = 6
-_수면 = 7
-_생휴 = 8
-_휴가 = 9
-_특휴 = 10
-_공가 = 11
-_경가 = 12
-_보수 = 13
-_POFF = 14
-_필수 = 15
-_번표 = 16
-_병가 = 17
+_주 = int(ShiftCode.주)
+_OFF = int(ShiftCode.OFF)
+_법휴 = int(ShiftCode.법휴)
+_수면 = int(ShiftCode.수면)
+_생휴 = int(ShiftCode.생휴)
+_휴가 = int(ShiftCode.휴가)
+_특휴 = int(ShiftCode.특휴)
+_공가 = int(ShiftCode.공가)
+_경가 = int(ShiftCode.경가)
+_보수 = int(ShiftCode.보수)
+_POFF = int(ShiftCode.POFF)
+_필수 = int(ShiftCode.필수)
+_번표 = int(ShiftCode.번표)
+_병가 = int(ShiftCode.병가)
 
 # 입력 전용 중간근무 (솔버 변수 필요, 자동배정 없음)
-_D9 = 18
-_D1 = 19
-_중1 = 20
+_D9 = int(ShiftCode.D9)
+_D1 = int(ShiftCode.D1)
+_중1 = int(ShiftCode.중1)
 
-NUM_TYPES = 21
+NUM_TYPES = NUM_CODES
 
 # 인덱스 ↔ 이름
-IDX_TO_NAME = {
-    _D: "D",
-    _중2: "중2",
-    _D9: "D9", _D1: "D1", _중1: "중1",  # 입력 전용
-    _E: "E", _N: "N",
-    _주: "주", _OFF: "OFF", _법휴: "법휴", _수면: "수면",
-    _생휴: "생휴", _휴가: "휴가", _병가: "병가", _특휴: "특휴", _공가: "공가", _경가: "경가",
-    _보수: "보수", _POFF: "POFF", _필수: "필수", _번표: "번표",
-}
-NAME_TO_IDX = {v: k for k, v in IDX_TO_NAME.items()}
+IDX_TO_NAME = dict(enumerate(CODE_NAMES))
+NAME_TO_IDX = CODE_OF
 
 # 휴무 그룹
 REGULAR_OFF = [_주, _OFF]                                               # 주당 정규 휴무 (주1 + OFF1 = 2)
@@ -130,6 +128,15 @@ FORBIDDEN_PAIRS = [
     if SHIFT_LEVEL[si] > SHIFT_LEVEL[sj]
 ]
 
+# 신청한 날에만 배정 가능한 특수 휴무 (코드, 인덱스) — 미신청일은 0 고정
+_SOFT_SPECIFIC_CODES = [("특휴", _특휴), ("공가", _공가), ("경가", _경가), ("보수", _보수), ("필수", _필수)]
+_SOFT_SPECIFIC_NAMES = frozenset(code for code, _ in _SOFT_SPECIFIC_CODES)
+
+# 갯수 제약 대상 특수 휴무 (코드, 인덱스)
+_SPECIAL_OFF_CODES = [("생휴", _생휴), ("수면", _수면), ("휴가", _휴가), ("병가", _병가),
+                      ("특휴", _특휴), ("공가", _공가), ("경가", _경가),
+                      ("보수", _보수), ("필수", _필수), ("번표", _번표)]
+
 
 def validate_requests(
     nurses: list[Nurse],
@@ -142,14 +149,14 @@ def validate_requests(
     Returns: 경고/오류 메시지 리스트 (빈 리스트 = 문제 없음)
     """
     warnings = []
-    num_days = 28
+    cal = period_calendar(start_date, rules.public_holidays)
+    num_days = cal.num_days
     nurse_map = {n.id: n for n in nurses}
     num_nurses = len(nurses)
 
-    def weekday_of(di):
-        return (start_date + timedelta(days=di)).weekday()
-
-    wd_names = ["월", "화", "수", "목", "금", "토", "일"]
+    weekday_of = cal.weekdays.__getitem__   # di(0-based) → 요일 (사전 계산 테이블 조회)
+    fmt_day = cal.fmt_day                   # 스케줄 day(1-based) → "M/D"
+    wd_names = WEEKDAY_NAMES
 
     # ── 인원 수 체크 ──
     중2_exists = any(n.role == "중2" for n in nurses)
@@ -162,7 +169,7 @@ def validate_requests(
         )
 
     # ── base_off 계산 (H20과 동일) ──
-    num_weekdays = sum(1 for di in range(num_days) if weekday_of(di) < 5)
+    num_weekdays = len(cal.weekday_indices)
     num_weekends = num_days - num_weekdays
     total_work_slots = (
         num_weekdays * (rules.daily_D + 중2_per_weekday + rules.daily_E + rules.daily_N)
@@ -188,13 +195,8 @@ def validate_requests(
         nurse = nurse_map[nid]
         hard_reqs = [r for r in reqs if r.is_hard]
 
-        def fmt_day(day: int) -> str:
-            """스케줄 day(1-based)를 실제 날짜 문자열로 변환"""
-            dt = start_date + timedelta(days=day - 1)
-            return f"{dt.month}/{dt.day}"
-
         # 1. 생휴: 남자 불가, 여성 월 1회 (28일 기간이 2개월에 걸치면 최대 2회)
-        months_in_period = len({(start_date + timedelta(days=di)).month for di in range(num_days)})
+        months_in_period = len(cal.month_days)
         max_menst = months_in_period - (1 if nurse.menstrual_used else 0)
         menst_reqs = [r for r in hard_reqs if r.code == "생휴"]
         if menst_reqs:
@@ -271,9 +273,7 @@ def validate_requests(
             effective_off = min(required_off, available)
             if effective_off < required_off:
                 shortage = required_off - effective_off
-                dt_start = start_date + timedelta(days=w_start - 1)
-                dt_end = start_date + timedelta(days=w_end - 1)
-                date_range = f"{dt_start.month}/{dt_start.day}~{dt_end.month}/{dt_end.day}"
+                date_range = f"{fmt_day(w_start)}~{fmt_day(w_end)}"
                 warnings.append(
                     f"{nurse.name}: {week_num}주차({date_range}) "
                     f"확정 휴무가 많아 OFF {shortage}개 부족 "
@@ -314,7 +314,7 @@ def validate_requests(
         if nurse.fixed_weekly_off is not None:
             for r in reqs:
                 wd = weekday_of(r.day - 1)
-                if wd == nurse.fixed_weekly_off and r.code in WORK_SHIFTS:
+                if wd == nurse.fixed_weekly_off and r.code in WORK_SET:
                     warnings.append(
                         f"{nurse.name}: {fmt_day(r.day)}({wd_names[wd]})은 고정 주휴일인데"
                         f" {r.code} 근무 요청"
@@ -361,7 +361,7 @@ def validate_requests(
             if r.code == "N":
                 code1 = req_day_code.get(r.day + 1, "")
                 code2 = req_day_code.get(r.day + 2, "")
-                if code1 and code1 not in WORK_SHIFTS and code2 in _MID_AND_D_N:
+                if code1 and code1 not in WORK_SET and code2 in _MID_AND_D_N:
                     warnings.append(
                         f"{nurse.name}: N→휴무→{code2} 패턴 불가"
                         f" ({fmt_day(r.day)} N → {fmt_day(r.day + 1)} {code1}"
@@ -380,13 +380,13 @@ def validate_requests(
                 )
             # tail[-2:]가 [N, 휴무]이면 1일에 D/중간/N 요청 불가
             if (len(tail) >= 2 and tail[-2] == "N"
-                    and tail[-1] not in WORK_SHIFTS
+                    and tail[-1] not in WORK_SET
                     and day1_code in _MID_AND_D_N):
                 warnings.append(
                     f"{nurse.name}: 전월 N→휴무 이후 1일 {day1_code} 요청 불가"
                 )
             # tail[-1]이 N이면 1일 휴무+2일 D/중간/N 패턴 불가
-            if tail[-1] == "N" and day1_code and day1_code not in WORK_SHIFTS and day2_code in _MID_AND_D_N:
+            if tail[-1] == "N" and day1_code and day1_code not in WORK_SET and day2_code in _MID_AND_D_N:
                 warnings.append(
                     f"{nurse.name}: 전월 N → 1일 {day1_code} → 2일 {day2_code} 패턴 불가"
                 )
@@ -398,9 +398,8 @@ def validate_requests(
             warnings.append(f"{nurse.name}: POFF는 임산부만 신청 가능 ({days})")
 
         # 14. 법휴: 공휴일에만
-        holiday_set = set(rules.public_holidays)
         for r in hard_reqs:
-            if r.code == "법휴" and r.day not in holiday_set:
+            if r.code == "법휴" and not cal.holiday[r.day - 1]:
                 warnings.append(
                     f"{nurse.name}: {fmt_day(r.day)}은 공휴일이 아닌데 법휴 요청"
                 )
@@ -421,12 +420,12 @@ def validate_requests(
             if r.code == "N" and req_day_code.get(r.day - 1) == "N":
                 nxt1 = req_day_code.get(r.day + 1, "")
                 nxt2 = req_day_code.get(r.day + 2, "")
-                if nxt1 in WORK_SHIFTS:
+                if nxt1 in WORK_SET:
                     warnings.append(
                         f"{nurse.name}: NN 후 2일 휴무 필요"
                         f" — {fmt_day(r.day + 1)} {nxt1} 요청 불가"
                     )
-                elif nxt1 and nxt1 not in WORK_SHIFTS and nxt2 in WORK_SHIFTS:
+                elif nxt1 and nxt1 not in WORK_SET and nxt2 in WORK_SET:
                     warnings.append(
                         f"{nurse.name}: NN 후 2일 휴무 필요"
                         f" — {fmt_day(r.day + 2)} {nxt2} 요청 불가"
@@ -476,21 +475,21 @@ def validate_requests(
         for r in reqs:
             if reported:
                 break
-            if r.code not in WORK_SHIFTS:
+            if r.code not in WORK_SET:
                 continue
             count = 1
             d2 = r.day - 1
-            while d2 >= 1 and req_day_code.get(d2) in WORK_SHIFTS:
+            while d2 >= 1 and req_day_code.get(d2) in WORK_SET:
                 count += 1
                 d2 -= 1
             if d2 == 0 and tail:
                 for t in reversed(tail):
-                    if t in WORK_SHIFTS:
+                    if t in WORK_SET:
                         count += 1
                     else:
                         break
             d2 = r.day + 1
-            while d2 <= num_days and req_day_code.get(d2) in WORK_SHIFTS:
+            while d2 <= num_days and req_day_code.get(d2) in WORK_SET:
                 count += 1
                 d2 += 1
             if count > max_w:
@@ -597,85 +596,123 @@ def solve_schedule(
     rules: Rules,
     start_date: date,
     timeout_seconds: int = 180,
-    output_path: str = None  # 경로 파라미터 추가
+    output_path: str = None,  # 경로 파라미터 추가
+    stats: dict | None = None,
+    export_path: str | None = None,
+    build_only: bool = False,
+    native_encoding: bool = False,
+    symmetry_breaking: bool = True,
+    redundant_constraints: bool = False,
+    search_strategy: str = "default",
+    solve_mode: str = "monolithic",
 ) -> Schedule:
-    """OR-Tools CP-SAT으로 최적 근무표 생성 (4주=28일 고정)"""
-
-    num_days = 28
+    """OR-Tools CP-SAT으로 최적 근무표 생성 (4주=28일 고정)
+
+    stats: dict를 넘기면 실행 텔레메트리를 채움 (해 탐색 결과에는 영향 없음)
+           - 모델 크기, 구축 시간 (전체 + 제약 그룹 H1~S8별 build_groups)
+           - presolve 시간, 첫 해 시각, 해 개선 추이(trajectory: 시각·목적값·상한)
+           - 최종 상태·목적값·상한·gap, CP-SAT response 통계
+           worker(solver_jobs.telemetry), engine/bench_solver.py, engine/replay.py에서 사용
+    export_path: 구축된 CpModel proto + 솔버 파라미터를 파일로 저장 (export_model 참고)
+    build_only: 모델 구축(+저장)까지만 하고 탐색 없이 빈 Schedule 반환 (engine/profile_build.py용)
+    native_encoding: 불리언 제약(H1/H3/H4-H6/H17/H21/S6/S7)을 CP-SAT 전용 제약
+                     (exactly_one/at_most_one/bool_or/implication)으로 추가. 기본은 동치 선형 제약
+                     — 해 공간은 같고 구축·presolve·탐색 성능만 다름 (_BoolEncoding 참고)
+    symmetry_breaking: 서로 바꿔도 같은 해가 되는 간호사 묶음(interchangeable_nurses)에
+                       사전식 순서 제약 추가 — 대칭 해 제거, 최적값은 그대로
+    redundant_constraints: 기존 제약을 합산한 함의 제약(날짜·주·월 휴무 인원, D/E/N 월 합계,
+                           책임/시니어/역할 풀 월 합계, 간호사별 근무+휴무=일수) 추가 — 해 공간 불변
+    search_strategy: "default"(CP-SAT 기본 분기) | "night_first"(시니어 N → 나머지 N → E → D 순서로
+                     분기하는 결정 전략 추가, 멀티워커 포트폴리오의 fixed 워커가 사용 — _add_night_first_strategy)
+    solve_mode: "monolithic"(전체 모델 1회) | "two_phase"(야간 축약 모델로 N 배치 → N 고정 후 나머지 배정 →
+                결과를 힌트로 전체 모델 다듬기, 제한 시간을 단계별로 나눠 씀 — _two_phase_hint)
+    """
+    if search_strategy not in SEARCH_STRATEGIES:
+        raise ValueError(f"알 수 없는 search_strategy: {search_strategy} ({', '.join(SEARCH_STRATEGIES)})")
+    if solve_mode not in SOLVE_MODES:
+        raise ValueError(f"알 수 없는 solve_mode: {solve_mode} ({', '.join(SOLVE_MODES)})")
+    t_start = time.perf_counter()
+    cal = period_calendar(start_date, rules.public_holidays)
+    num_days = cal.num_days
     num_nurses = len(nurses)
     model = cp_model.CpModel()
 
     # ──────────────────────────────────────────
-    # 변수 정의: shifts[(ni, di, si)] = BoolVar
-    # ni: 간호사 인덱스, di: 날짜(0-based), si: 타입(0~13)
+    # 변수 정의: X[ni][di][si] = BoolVar (shifts[(ni, di, si)]는 같은 변수의 dict 뷰)
+    # ni: 간호사 인덱스, di: 날짜(0-based), si: 타입(0~20)
+    # 제약은 X 인덱스 배열 + LinearExpr.sum으로 구성 (generator sum 대비 구축 시간 단축)
     # ──────────────────────────────────────────
-    shifts = {}
-    for ni in range(num_nurses):
-        for di in range(num_days):
-            for si in range(NUM_TYPES):
-                shifts[(ni, di, si)] = model.new_bool_var(f"s_n{ni}_d{di}_s{si}")
-
-    # 진단용 체크포인트: 각 H* 그룹 추가 후 제약 수 기록
-    _cp_idx: dict[str, int] = {}
+    new_bool_var = model.new_bool_var
+    X = [
+        [[new_bool_var(f"s_n{ni}_d{di}_s{si}") for si in range(NUM_TYPES)] for di in range(num_days)]
+        for ni in range(num_nurses)
+    ]
+    shifts = {
+        (ni, di, si): var
+        for ni, row in enumerate(X) for di, cell in enumerate(row) for si, var in enumerate(cell)
+    }
+    add = model.add
+    enc = _BoolEncoding(model, native_encoding)
+    add_bool_or = enc.bool_or
+    # 휴무 여부 리터럴: OFF[ni][di] == ALL_OFF 합 (H1로 0/1) — 휴무 판정이 필요한 제약은
+    # 14개 변수 합 대신 이 리터럴 하나를 사용. NX[ni][di]: N 변수, 접두어 NOT_: 부정 리터럴
+    OFF = [[new_bool_var(f"off_n{ni}_d{di}") for di in range(num_days)] for ni in range(num_nurses)]
+    for off_row, row in zip(OFF, X):
+        for off, cell in zip(off_row, row):
+            add(off == LinearExpr.sum([cell[oi] for oi in ALL_OFF]))
+    NX = [[cell[_N] for cell in row] for row in X]
+    NOT_OFF = [[off.Not() for off in off_row] for off_row in OFF]
+    NOT_N = [[n.Not() for n in n_row] for n_row in NX]
+
+    # 진단용 체크포인트: 각 H* 그룹 추가 후 제약 수 기록 (+ 그룹별 구축 시간, stats용)
+    profile = _BuildProfile(model, t_start)
+    _cp_idx = profile.checkpoints
+    _mark = profile.mark
+    _mark("변수", checkpoint=False)
 
     # 인덱스 맵
     nurse_idx = {nurse.id: i for i, nurse in enumerate(nurses)}
 
     # 요청 맵: (nurse_id, day) → Request
     req_map = {}
+    # 간호사 id → 신청 목록 (간호사별 루프에서 전체 신청 재순회 방지)
+    requests_by_nurse: dict = {}
     for r in requests:
         req_map[(r.nurse_id, r.day)] = r
+        requests_by_nurse.setdefault(r.nurse_id, []).append(r)
 
-    # 헬퍼 함수
-    def weekday_of(di):
-        """di(0-based) → 요일 (0=월...6=일)"""
-        return (start_date + timedelta(days=di)).weekday()
+    # 헬퍼: di(0-based) → 요일 (0=월...6=일), 기간 달력 테이블 조회
+    weekday_of = cal.weekdays.__getitem__
 
     # ══════════════════════════════════════════
     # HARD CONSTRAINTS
     # ══════════════════════════════════════════
 
     # ── H1. 하루에 정확히 1개 배정 ──
-    for ni in range(num_nurses):
-        for di in range(num_days):
-            model.add(
-                sum(shifts[(ni, di, si)] for si in range(NUM_TYPES)) == 1
-            )
-    _cp_idx["H1(1개배정)"] = len(model.proto.constraints)
+    for row in X:
+        for cell in row:
+            enc.exactly_one(cell)
+    _mark("H1(1개배정)")
 
     # ── H2. 일일 인원 ──
+    중2_nurses = [ni for ni, n in enumerate(nurses) if n.role == "중2"]
     for di in range(num_days):
-        model.add(
-            sum(shifts[(ni, di, _D)] for ni in range(num_nurses))
-            == rules.daily_D
-        )
+        add(LinearExpr.sum([row[di][_D] for row in X]) == rules.daily_D)
         # 중2: 평일(월~금)만 정확히 daily_M명, 주말은 0명
-        중2_nurses = [ni for ni, n in enumerate(nurses) if n.role == "중2"]
-        if 중2_nurses and weekday_of(di) < 5:  # 월~금 + 중2 간호사 존재 시
-            model.add(
-                sum(shifts[(ni, di, si)] for ni in 중2_nurses for si in M_FAMILY)
+        if 중2_nurses and not cal.weekend[di]:  # 월~금 + 중2 간호사 존재 시
+            add(
+                LinearExpr.sum([X[ni][di][si] for ni in 중2_nurses for si in M_FAMILY])
                 == rules.daily_M
             )
         else:  # 주말 또는 중2 간호사 없음
-            model.add(
-                sum(shifts[(ni, di, si)] for ni in range(num_nurses) for si in M_FAMILY)
-                == 0
-            )
-        model.add(
-            sum(shifts[(ni, di, _E)] for ni in range(num_nurses))
-            == rules.daily_E
-        )
-        model.add(
-            sum(shifts[(ni, di, _N)] for ni in range(num_nurses))
-            == rules.daily_N
-        )
+            add(LinearExpr.sum([row[di][si] for row in X for si in M_FAMILY]) == 0)
+        add(LinearExpr.sum([row[di][_E] for row in X]) == rules.daily_E)
+        add(LinearExpr.sum([row[di][_N] for row in X]) == rules.daily_N)
 
-    _cp_idx["H2(일일인원)"] = len(model.proto.constraints)
+    _mark("H2(일일인원)")
     # ── H2a. 중2 role 아닌 간호사는 중2 근무 금지 (D9/D1/중1은 별도 처리) ──
     non_중2_nurses = [ni for ni, n in enumerate(nurses) if n.role != "중2"]
-    for ni in non_중2_nurses:
-        for di in range(num_days):
-            model.add(shifts[(ni, di, _중2)] == 0)
+    _fix_zero(model, [cell[_중2] for ni in non_중2_nurses for cell in X[ni]])
 
     # ── H2b. D9/D1/중1 입력 전용: 신청(hard/soft 무관)이 없으면 자동배정 불가 ──
     # D9/D1/중1은 신청 없이 배정이 불가능한 구조이므로 condition 무관하게 허용
@@ -687,10 +724,12 @@ def solve_schedule(
             if 0 <= di < num_days and r.code in NAME_TO_IDX:
                 _input_only_allowed[NAME_TO_IDX[r.code]].add((ni, di))
     for si in (_D9, _D1, _중1):
-        for ni in range(num_nurses):
-            for di in range(num_days):
-                if (ni, di) not in _input_only_allowed[si]:
-                    model.add(shifts[(ni, di, si)] == 0)
+        allowed = _input_only_allowed[si]
+        _fix_zero(model, [
+            cell[si]
+            for ni, row in enumerate(X) for di, cell in enumerate(row)
+            if (ni, di) not in allowed
+        ])
 
     # ══════════════════════════════════════════
     # 월 경계 제약 (prev_tail_shifts 기반)
@@ -717,16 +756,13 @@ def solve_schedule(
         # tail[-2:]가 [N, OFF계열]이면 day0에 D/중간/N 금지
         if tail_len >= 2:
             t2, t1 = tail[-2], tail[-1]
-            if t2 == "N" and t1 in ("OFF", "주", "법휴", "수면", "생휴", "휴가", "병가", "특휴", "공가", "경가", "보수", "POFF", "필수", "번표"):
+            if t2 == "N" and t1 in OFF_SET:
                 for si in D_FAMILY + M_FAMILY + [_N]:
                     model.add(shifts[(ni, 0, si)] == 0)
         # tail[-1]이 N이면 day0 OFF + day1 D/중간/N 금지
         if tail_len >= 1 and tail[-1] == "N" and num_days >= 2:
             for si in D_FAMILY + M_FAMILY + [_N]:
-                model.add(
-                    sum(shifts[(ni, 0, oi)] for oi in ALL_OFF)
-                    + shifts[(ni, 1, si)] <= 1
-                )
+                add(OFF[ni][0] + X[ni][1][si] <= 1)
 
         # ── 경계 H3c: N 다음날 보수/필수/번표 금지 ──
         if tail_len >= 1 and tail[-1] == "N":
@@ -747,17 +783,12 @@ def solve_schedule(
             remain = rules.max_consecutive_work - tail_consec_work
             if remain <= 0:
                 # 이미 한도 도달 → day0은 반드시 휴무
-                model.add(
-                    sum(shifts[(ni, 0, oi)] for oi in ALL_OFF) >= 1
-                )
+                add(OFF[ni][0] >= 1)
             else:
                 # remain일 이내에 휴무 1개 필요
                 window = min(remain + 1, num_days)
                 if window > 0:
-                    model.add(
-                        sum(shifts[(ni, dd, oi)]
-                            for dd in range(window) for oi in ALL_OFF) >= 1
-                    )
+                    add_bool_or(OFF[ni][:window])
 
         # ── 경계 H5: 연속 N ≤ max_consecutive_N ──
         tail_consec_N = 0
@@ -773,10 +804,7 @@ def solve_schedule(
             else:
                 window_n = min(remain_n + 1, num_days)
                 if window_n > 0:
-                    model.add(
-                        sum(shifts[(ni, dd, _N)]
-                            for dd in range(window_n)) <= remain_n
-                    )
+                    add(LinearExpr.sum(NX[ni][:window_n]) <= remain_n)
 
         # ── 경계 H6: NN→2off ──
         off_after = rules.off_after_2N
@@ -784,26 +812,22 @@ def solve_schedule(
         if tail_len >= 2 and tail[-2] == "N" and tail[-1] == "N":
             for k in range(off_after):
                 if k < num_days:
-                    model.add(
-                        sum(shifts[(ni, k, oi)] for oi in ALL_OFF) >= 1
-                    )
+                    add(OFF[ni][k] >= 1)
         # tail[-1]이 N이면, day0이 N인 경우 day1,day2 휴무 필요
         elif tail_len >= 1 and tail[-1] == "N":
             for k in range(off_after):
                 if 1 + k < num_days:
-                    model.add(
-                        shifts[(ni, 0, _N)] <= sum(shifts[(ni, 1 + k, oi)] for oi in ALL_OFF)
-                    )
+                    enc.implication(NX[ni][0], OFF[ni][1 + k])
 
-    _cp_idx["H2a-H2b(중2/입력전용)"] = len(model.proto.constraints)
+    _mark("H2a-H2b(중2/입력전용)")
     # ── H3. 역순 금지 ──
+    # 두 불리언 합 ≤ 1 (native_encoding이면 at_most_one)
+    at_most_one = enc.at_most_one
     if rules.ban_reverse_order:
-        for ni in range(num_nurses):
-            for di in range(num_days - 1):
+        for row in X:
+            for today, tomorrow in zip(row, row[1:]):
                 for si, sj in FORBIDDEN_PAIRS:
-                    model.add(
-                        shifts[(ni, di, si)] + shifts[(ni, di + 1, sj)] <= 1
-                    )
+                    at_most_one(today[si], tomorrow[sj])
 
     # ── H3a. N→1휴무→(D/중간근무/N) 금지 ──
     # N 후 1휴무 뒤에는 E만 허용, D·D9·D1·중1·중2·N 불가
@@ -811,45 +835,38 @@ def solve_schedule(
     # CP-SAT 표현: N[di] + off[di+1] + D/M/N[di+2] <= 2
     #   off[di+1]=1 → N[di+2]≤0 (금지)
     #   off[di+1]=0 (= di+1이 N) → 제약 비활성화 (NNN 허용)
-    for ni in range(num_nurses):
+    _after_n_off = D_FAMILY + M_FAMILY + [_N]
+    for ni, row in enumerate(X):
         for di in range(num_days - 2):
-            off_next = sum(shifts[(ni, di + 1, oi)] for oi in ALL_OFF)
-            for si in D_FAMILY + M_FAMILY + [_N]:
-                model.add(
-                    shifts[(ni, di, _N)] + off_next + shifts[(ni, di + 2, si)] <= 2
-                )
+            # N + off + X ≤ 2 ⇔ 셋 중 하나는 거짓 (절 ¬N ∨ ¬off ∨ ¬X)
+            not_n, not_off, day2 = NOT_N[ni][di], NOT_OFF[ni][di + 1], row[di + 2]
+            for si in _after_n_off:
+                add_bool_or([not_n, not_off, day2[si].Not()])
 
 
     # ── H3c. N 다음날 보수/필수/번표 금지 ──
     # 보수(교육), 필수, 번표는 실질 근무에 준하므로 N 직후 배치 불가
-    for ni in range(num_nurses):
+    for ni, row in enumerate(X):
         for di in range(num_days - 1):
+            n_today, tomorrow = NX[ni][di], row[di + 1]
             for si in (_보수, _필수, _번표):
-                model.add(
-                    shifts[(ni, di, _N)] + shifts[(ni, di + 1, si)] <= 1
-                )
+                at_most_one(n_today, tomorrow[si])
 
-    _cp_idx["H3(역순금지)"] = len(model.proto.constraints)
+    _mark("H3(역순금지)")
     # ── H4. 최대 연속 근무 (5일) ──
     # ALL_OFF 모두 비근무로 인정
     max_cw = rules.max_consecutive_work
-    for ni in range(num_nurses):
+    for off_row in OFF:
         for di in range(num_days - max_cw):
-            model.add(
-                sum(shifts[(ni, di + dd, oi)]
-                    for dd in range(max_cw + 1) for oi in ALL_OFF) >= 1
-            )
+            add_bool_or(off_row[di:di + max_cw + 1])  # 구간 내 휴무 ≥ 1
 
     # ── H5. 최대 연속 N (3개) ──
     max_cn = rules.max_consecutive_N
-    for ni in range(num_nurses):
+    for not_n_row in NOT_N:
         for di in range(num_days - max_cn):
-            model.add(
-                sum(shifts[(ni, di + dd, _N)]
-                    for dd in range(max_cn + 1)) <= max_cn
-            )
+            add_bool_or(not_n_row[di:di + max_cn + 1])  # max_cn+1일 연속 N 금지
 
-    _cp_idx["H4-H5(연속근무/연속N)"] = len(model.proto.constraints)
+    _mark("H4-H5(연속근무/연속N)")
     # ── H6. N 2연속 이상(NN/NNN) 블록 종료 후 휴무 ──
     # 핵심: 블록 중간이 아닌 블록 끝(di)에서만 off_after 강제
     # 조건: N[di] AND N[di-1] AND NOT N[di+1] → off at di+1..di+off_after
@@ -857,20 +874,17 @@ def solve_schedule(
     # → N[di+1]=1이면 좌변≤0 → 제약 비활성화(블록 계속 이어짐)
     # → N[di+1]=0이면 좌변=1 → 휴무 강제(블록 종료)
     off_after = rules.off_after_2N
-    for ni in range(num_nurses):
+    # 절 표현: ¬N[di] ∨ ¬N[di-1] ∨ N[di+1] ∨ off[target]
+    for n_row, not_n_row, off_row in zip(NX, NOT_N, OFF):
         for di in range(1, num_days):          # di >= 1: 이전 날(di-1) 존재
             next_di = di + 1
-            n_next = shifts[(ni, next_di, _N)] if next_di < num_days else 0
-            for k in range(off_after):
-                target = di + 1 + k
-                if target < num_days:
-                    model.add(
-                        shifts[(ni, di, _N)] + shifts[(ni, di - 1, _N)]
-                        - n_next - 1
-                        <= sum(shifts[(ni, target, oi)] for oi in ALL_OFF)
-                    )
+            if next_di >= num_days:            # 마지막 날 → 강제할 휴무일 없음
+                continue
+            nn_end = [not_n_row[di], not_n_row[di - 1], n_row[next_di]]
+            for target in range(next_di, min(next_di + off_after, num_days)):
+                add_bool_or(nn_end + [off_row[target]])
 
-    _cp_idx["H6(NN후휴무)"] = len(model.proto.constraints)
+    _mark("H6(NN후휴무)")
 
     # ── [진단용] N 가용 인원 분석 ──
     # 경계 H6으로 인해 강제 휴무인 날 계산
@@ -923,11 +937,10 @@ def solve_schedule(
         return span is not None and span[0] <= di <= span[1]
 
     # ── 공휴일 날짜 인덱스 사전 계산 (H8 필터링에서도 사용) ──
-    # rules.public_holidays는 스케줄 위치(1-28) → 0-indexed di로 변환
-    _holiday_days = set(rules.public_holidays)
-    public_holiday_dis = {h - 1 for h in _holiday_days if 1 <= h <= num_days}
+    # rules.public_holidays는 스케줄 위치(1-28) → 기간 달력의 holiday 마스크(0-indexed di)
+    public_holiday_dis = {di for di in range(num_days) if cal.holiday[di]}
 
-    _cp_idx["H6(NN후휴무)"] = len(model.proto.constraints)
+    _mark("H6(NN후휴무)")
     # ── H8. 확정 요청 ──
     # 각 요청 코드를 해당 인덱스로 직접 매핑
     fixed_off_days = set()  # (ni, di) 고정 주휴일
@@ -955,7 +968,7 @@ def solve_schedule(
             if nurses[ni].is_male:
                 continue
             nurse_obj = nurses[ni]
-            _months = len({(start_date + timedelta(days=d)).month for d in range(num_days)})
+            _months = len(cal.month_days)
             _max_menst = _months - (1 if nurse_obj.menstrual_used else 0)
             menst_hard_used.setdefault(r.nurse_id, 0)
             if menst_hard_used[r.nurse_id] >= _max_menst:
@@ -1010,32 +1023,35 @@ def solve_schedule(
         elif excluded == "N":
             model.add(shifts[(ni, di, _N)] == 0)
 
-    _cp_idx["H8-H9(확정요청/제외)"] = len(model.proto.constraints)
+    _mark("H8-H9(확정요청/제외)")
     # ── H10. 고정 주휴 ──
+    no_주 = []
     for ni, nurse in enumerate(nurses):
         if nurse.fixed_weekly_off is not None:
-            for di in range(num_days):
+            for di, cell in enumerate(X[ni]):
                 if weekday_of(di) == nurse.fixed_weekly_off:
                     if in_병가_span(ni, di):
                         # 병가 기간 중 고정 주휴일 → 주 대신 병가로 강제
-                        model.add(shifts[(ni, di, _주)] == 0)
-                        model.add(shifts[(ni, di, _병가)] == 1)
+                        no_주.append(cell[_주])
+                        add(cell[_병가] == 1)
                     else:
-                        model.add(shifts[(ni, di, _주)] == 1)
-                else:
-                    model.add(shifts[(ni, di, _주)] == 0) # 다른 날엔 주휴 안 됨
+                        add(cell[_주] == 1)
+                # 다른 날엔 주휴 안 됨 → H10a
+    _fix_zero(model, no_주)
 
     # ── H10a. 주는 고정 주휴일에만 배치 가능 ──
-    for ni, nurse in enumerate(nurses):
-        for di in range(num_days):
-            if nurse.fixed_weekly_off is None or weekday_of(di) != nurse.fixed_weekly_off:
-                model.add(shifts[(ni, di, _주)] == 0)
+    _fix_zero(model, [
+        cell[_주]
+        for nurse, row in zip(nurses, X) for di, cell in enumerate(row)
+        if nurse.fixed_weekly_off is None or weekday_of(di) != nurse.fixed_weekly_off
+    ])
 
     # ── H10b. 법휴는 공휴일에만 배치 가능 ──
-    for ni in range(num_nurses):
-        for di in range(num_days):
-            if di not in public_holiday_dis:
-                model.add(shifts[(ni, di, _법휴)] == 0)
+    _fix_zero(model, [
+        cell[_법휴]
+        for row in X for di, cell in enumerate(row)
+        if di not in public_holiday_dis
+    ])
 
     # ── 주당 OFF 배치 가능일 사전 계산 ──
     # 하드 커밋(비-OFF 타입) + 고정주휴일은 OFF 불가
@@ -1053,7 +1069,7 @@ def solve_schedule(
                 if weekday_of(di) == nurse.fixed_weekly_off:
                     nurse_committed_days[ni].add(di)
 
-    _cp_idx["H10(고정주휴)"] = len(model.proto.constraints)
+    _mark("H10(고정주휴)")
     # ── H11. 주당 OFF ≥ N개 (일반 1개, 주4일제 2개) — 법휴 대체 허용 ──
     # 공휴일 주에 법휴를 받으면 해당 법휴가 OFF 요구를 대체할 수 있음
     # (_OFF + 법휴) >= required, _OFF <= required (OFF 자체는 초과 불가)
@@ -1062,22 +1078,22 @@ def solve_schedule(
         committed = nurse_committed_days[ni]
         for w_start in range(0, num_days, 7):
             w_end = min(w_start + 7, num_days)
-            off_sum = sum(shifts[(ni, di, _OFF)] for di in range(w_start, w_end))
+            off_sum = LinearExpr.sum([X[ni][di][_OFF] for di in range(w_start, w_end)])
             if w_end - w_start < 4:
-                model.add(off_sum <= required_off)  # 짧은 마지막 주
+                add(off_sum <= required_off)  # 짧은 마지막 주
                 continue
             available = sum(1 for di in range(w_start, w_end) if di not in committed)
             effective_off = min(required_off, available)
             # 법휴가 있는 주는 법휴로 OFF 요구 대체 가능
-            hol_sum = sum(
-                shifts[(ni, di, _법휴)]
+            hol_sum = LinearExpr.sum([
+                X[ni][di][_법휴]
                 for di in range(w_start, w_end)
                 if di in public_holiday_dis
-            )
-            model.add(off_sum + hol_sum >= effective_off)
-            model.add(off_sum <= effective_off)
+            ])
+            add(off_sum + hol_sum >= effective_off)
+            add(off_sum <= effective_off)
 
-    _cp_idx["H11(주당OFF)"] = len(model.proto.constraints)
+    _mark("H11(주당OFF)")
     # ── [진단] H11 후 간호사별 OFF 현황 ──
     _off_totals = {}
     for ni, nurse in enumerate(nurses):
@@ -1092,32 +1108,20 @@ def solve_schedule(
     if chiefs and rules.min_chief_per_shift > 0:
         for di in range(num_days):
             for si in [_D, _E, _N]:
-                model.add(
-                    sum(shifts[(ni, di, si)] for ni in chiefs)
-                    >= rules.min_chief_per_shift
-                )
+                add(LinearExpr.sum([X[ni][di][si] for ni in chiefs]) >= rules.min_chief_per_shift)
 
     # ── H13. 책임+서브차지 2명 이상 (매 근무) ──
     seniors = [ni for ni, n in enumerate(nurses)
                if n.grade in ("책임", "서브차지")]
     if seniors and rules.min_senior_per_shift > 0:
         for di in range(num_days):
-            model.add(
-                sum(shifts[(ni, di, si)]
-                    for ni in seniors for si in D_FAMILY)
-                >= rules.min_senior_per_shift
-            )
-            model.add(
-                sum(shifts[(ni, di, si)]
-                    for ni in seniors for si in E_FAMILY)
-                >= rules.min_senior_per_shift
-            )
-            model.add(
-                sum(shifts[(ni, di, _N)] for ni in seniors)
-                >= rules.min_senior_per_shift
-            )
+            for family in (D_FAMILY, E_FAMILY, N_FAMILY):
+                add(
+                    LinearExpr.sum([X[ni][di][si] for ni in seniors for si in family])
+                    >= rules.min_senior_per_shift
+                )
 
-    _cp_idx["H12(책임등급)"] = len(model.proto.constraints)
+    _mark("H12(책임등급)")
     # ── H14. 역할 누적 제한 ──
     for tier_roles, max_d, max_e, max_n in ROLE_TIERS:
         tier_nurses = [ni for ni, n in enumerate(nurses)
@@ -1125,28 +1129,19 @@ def solve_schedule(
         if not tier_nurses:
             continue
         for di in range(num_days):
-            model.add(
-                sum(shifts[(ni, di, _D)] for ni in tier_nurses) <= max_d
-            )
-            model.add(
-                sum(shifts[(ni, di, _E)] for ni in tier_nurses) <= max_e
-            )
-            model.add(
-                sum(shifts[(ni, di, _N)] for ni in tier_nurses) <= max_n
-            )
+            for si, cap in ((_D, max_d), (_E, max_e), (_N, max_n)):
+                add(LinearExpr.sum([X[ni][di][si] for ni in tier_nurses]) <= cap)
 
-    _cp_idx["H14(역할티어)"] = len(model.proto.constraints)
+    _mark("H14(역할티어)")
     # ── H15. 책임만 1명 이하 (D/E/N만, 중2 제외) ──
     chief_only = [ni for ni, n in enumerate(nurses)
                   if n.role == "책임만"]
     if chief_only:
         for di in range(num_days):
             for si in [_D, _E, _N]:
-                model.add(
-                    sum(shifts[(ni, di, si)] for ni in chief_only) <= 1
-                )
+                add(LinearExpr.sum([X[ni][di][si] for ni in chief_only]) <= 1)
 
-    _cp_idx["H15(책임만상한)"] = len(model.proto.constraints)
+    _mark("H15(책임만상한)")
     # ── H17. 임산부 → 최대 연속 근무 4일 ──
     # ALL_OFF 모두 비근무로 인정
     for ni, nurse in enumerate(nurses):
@@ -1154,37 +1149,34 @@ def solve_schedule(
             continue
         interval = rules.pregnant_poff_interval  # 4
         for di in range(num_days - interval):
-            model.add(
-                sum(shifts[(ni, di + dd, oi)]
-                    for dd in range(interval + 1) for oi in ALL_OFF) >= 1
-            )
+            add_bool_or(OFF[ni][di:di + interval + 1])
 
-    _cp_idx["H17(임산부연속)"] = len(model.proto.constraints)
+    _mark("H17(임산부연속)")
     # ══════════════════════════════════════════
     # 특수 휴무 갯수 제약 (타입별 정확한 수 강제)
     # ══════════════════════════════════════════
     from collections import Counter as _Counter
-    _month_day_counts = _Counter(
-        (start_date + timedelta(days=di)).month for di in range(num_days)
-    )
+    _month_day_counts = cal.month_day_counts
     _period_months = len(_month_day_counts)
     _log(f"[생휴] 기간 내 달별 일수: {dict(_month_day_counts)} | 달 수={_period_months} | menstrual_used 현황: "
          f"{sum(1 for n in nurses if n.menstrual_used)}명 True / {sum(1 for n in nurses if not n.is_male and not n.menstrual_used)}명 False(여성)")
 
+    # 간호사별 하드 요청 코드 집계 (고정 주휴일 제외) — 요청 목록 1회 순회
+    hard_code_counts: dict[int, _Counter] = {ni: _Counter() for ni in range(num_nurses)}
+    for r in requests:
+        if not r.is_hard or r.nurse_id not in nurse_idx:
+            continue
+        if not 1 <= r.day <= num_days:
+            continue
+        ni = nurse_idx[r.nurse_id]
+        if (ni, r.day - 1) in fixed_off_days:
+            continue
+        hard_code_counts[ni][r.shift_code] += 1
+
     obj_auto_off = []  # 추가 soft bonus (목적함수에 추가)
     for ni, nurse in enumerate(nurses):
         # 각 특수 off 타입별 하드 요청 갯수 계산
-        hard_counts = {}
-        for code, idx in [("생휴", _생휴), ("수면", _수면), ("휴가", _휴가), ("병가", _병가),
-                          ("특휴", _특휴), ("공가", _공가), ("경가", _경가),
-                          ("보수", _보수), ("필수", _필수), ("번표", _번표)]:
-            hard_counts[idx] = sum(
-                1 for r in requests
-                if r.is_hard and r.nurse_id == nurse.id
-                and r.code == code
-                and 1 <= r.day <= num_days
-                and (ni, r.day - 1) not in fixed_off_days
-            )
+        hard_counts = {idx: hard_code_counts[ni][idx] for _, idx in _SPECIAL_OFF_CODES}
 
         # 병가 span 내 고정 주휴일 → 주 대신 병가로 강제되므로 카운트에 추가
         span = nurse_병가_span[ni]
@@ -1198,7 +1190,7 @@ def solve_schedule(
         # 생휴: 여성 월 1회 (하드 제약), 남자 0
         # _period_months: 기간 내 달 수, menstrual_used: 이전 근무표에서 시작 달 생휴 사용 여부
         max_menst = max(0, _period_months - (1 if nurse.menstrual_used else 0))
-        menst_sum = sum(shifts[(ni, di, _생휴)] for di in range(num_days))
+        menst_sum = LinearExpr.sum([cell[_생휴] for cell in X[ni]])
         if nurse.is_male:
             model.add(menst_sum == 0)
         elif hard_counts[_생휴] > 0:
@@ -1210,32 +1202,20 @@ def solve_schedule(
 
         # 생휴: 달마다 최대 1회 (같은 달 두 개 방지)
         if not nurse.is_male:
-            for _month, _month_cnt in _month_day_counts.items():
-                _month_days = [di for di in range(num_days)
-                               if (start_date + timedelta(days=di)).month == _month]
-                _month_menst = sum(shifts[(ni, di, _생휴)] for di in _month_days)
+            for _month, _month_days in cal.month_days.items():
+                _month_menst = LinearExpr.sum([X[ni][di][_생휴] for di in _month_days])
                 _is_start_month = _month == start_date.month
                 if nurse.menstrual_used and _is_start_month:
                     model.add(_month_menst == 0)
                 else:
                     model.add(_month_menst <= 1)
 
-    _cp_idx["특수OFF-생휴"] = len(model.proto.constraints)
+    _mark("특수OFF-생휴")
     for ni, nurse in enumerate(nurses):
         # 수면: 조건 충족 시 1개 생성 (하드 제약)
-        hard_counts = {}
-        for code, idx in [("생휴", _생휴), ("수면", _수면), ("휴가", _휴가), ("병가", _병가),
-                          ("특휴", _특휴), ("공가", _공가), ("경가", _경가),
-                          ("보수", _보수), ("필수", _필수), ("번표", _번표)]:
-            hard_counts[idx] = sum(
-                1 for r in requests
-                if r.is_hard and r.nurse_id == nurse.id
-                and r.code == code
-                and 1 <= r.day <= num_days
-                and (ni, r.day - 1) not in fixed_off_days
-            )
+        hard_counts = {idx: hard_code_counts[ni][idx] for _, idx in _SPECIAL_OFF_CODES}
         hard_sleep = hard_counts[_수면]
-        sleep_sum = sum(shifts[(ni, di, _수면)] for di in range(num_days))
+        sleep_sum = LinearExpr.sum([cell[_수면] for cell in X[ni]])
         if hard_sleep > 0:
             model.add(sleep_sum == hard_sleep)
         elif nurse.pending_sleep:
@@ -1253,9 +1233,7 @@ def solve_schedule(
                 model.add(sleep_sum == 0)
             else:
                 total_N_var = model.new_int_var(0, num_days, f"totalN_{ni}")
-                model.add(total_N_var == sum(
-                    shifts[(ni, di, _N)] for di in range(num_days)
-                ))
+                model.add(total_N_var == LinearExpr.sum(NX[ni]))
 
                 sleep_needed = model.new_bool_var(f"sleepNeed_{ni}")
                 model.add(
@@ -1274,38 +1252,21 @@ def solve_schedule(
                 for di in range(min(eff_threshold, num_days)):
                     model.add(shifts[(ni, di, _수면)] == 0)
 
-    _cp_idx["특수OFF-수면"] = len(model.proto.constraints)
+    _mark("특수OFF-수면")
     _log(f"[진단] 총 제약 수: {len(model.proto.constraints)}개 | 변수: {num_nurses}×28×{NUM_TYPES}={num_nurses*28*NUM_TYPES}개")
 
     # 진단: 특수OFF 하드 요청 현황 출력
-    _special_off_codes = [("생휴", _생휴), ("수면", _수면), ("휴가", _휴가), ("병가", _병가),
-                          ("특휴", _특휴), ("공가", _공가), ("경가", _경가),
-                          ("보수", _보수), ("필수", _필수), ("번표", _번표)]
     for ni, nurse in enumerate(nurses):
         nurse_hard = {}
-        for code, idx in _special_off_codes:
-            cnt = sum(
-                1 for r in requests
-                if r.is_hard and r.nurse_id == nurse.id
-                and r.code == code
-                and 1 <= r.day <= num_days
-                and (ni, r.day - 1) not in fixed_off_days
-            )
+        for code, idx in _SPECIAL_OFF_CODES:
+            cnt = hard_code_counts[ni][idx]
             if cnt > 0:
                 nurse_hard[code] = cnt
         if nurse_hard:
             _log(f"[특수OFF 하드요청] {nurse.name}: {nurse_hard}")
 
     for ni, nurse in enumerate(nurses):
-        hard_counts = {}
-        for code, idx in _special_off_codes:
-            hard_counts[idx] = sum(
-                1 for r in requests
-                if r.is_hard and r.nurse_id == nurse.id
-                and r.code == code
-                and 1 <= r.day <= num_days
-                and (ni, r.day - 1) not in fixed_off_days
-            )
+        hard_counts = {idx: hard_code_counts[ni][idx] for _, idx in _SPECIAL_OFF_CODES}
         # 병가 span 내 고정 주휴일은 H10a에서 병가로 강제됨 → 카운트에 추가
         span = nurse_병가_span[ni]
         if span is not None:
@@ -1316,35 +1277,24 @@ def solve_schedule(
             )
         # 번표, 병가: hard → 월 총 배정 수 정확히 == 요청 수
         for idx in [_번표, _병가]:
-            model.add(
-                sum(shifts[(ni, di, idx)] for di in range(num_days))
-                == hard_counts[idx]
-            )
+            add(LinearExpr.sum([cell[idx] for cell in X[ni]]) == hard_counts[idx])
         # 특휴, 공가, 경가, 보수, 필수: soft → 신청하지 않은 날에는 배정 불가
         # (신청한 날에는 S1 가중치로 반영 시도, 인원 부족 시 미반영 가능)
-        _soft_specific = [("특휴", _특휴), ("공가", _공가), ("경가", _경가), ("보수", _보수), ("필수", _필수)]
-        _soft_req_days = {idx: set() for _, idx in _soft_specific}
-        for r in requests:
-            if r.nurse_id == nurse.id and r.code in {c for c, _ in _soft_specific}:
+        _soft_req_days = {idx: set() for _, idx in _SOFT_SPECIFIC_CODES}
+        for r in requests_by_nurse.get(nurse.id, ()):
+            if r.code in _SOFT_SPECIFIC_NAMES:
                 di_r = r.day - 1
                 if 0 <= di_r < num_days:
                     _soft_req_days[NAME_TO_IDX[r.code]].add(di_r)
-        for _, idx in _soft_specific:
-            for di in range(num_days):
-                if di not in _soft_req_days[idx]:
-                    model.add(shifts[(ni, di, idx)] == 0)
+        _fix_zero(model, [
+            cell[idx]
+            for _, idx in _SOFT_SPECIFIC_CODES for di, cell in enumerate(X[ni])
+            if di not in _soft_req_days[idx]
+        ])
 
-    _cp_idx["특수OFF-기타(==)"] = len(model.proto.constraints)
+    _mark("특수OFF-기타(==)")
     for ni, nurse in enumerate(nurses):
-        hard_counts = {}
-        for code, idx in _special_off_codes:
-            hard_counts[idx] = sum(
-                1 for r in requests
-                if r.is_hard and r.nurse_id == nurse.id
-                and r.code == code
-                and 1 <= r.day <= num_days
-                and (ni, r.day - 1) not in fixed_off_days
-            )
+        hard_counts = {idx: hard_code_counts[ni][idx] for _, idx in _SPECIAL_OFF_CODES}
         # 병가 span 내 고정 주휴일 카운트 추가 (위와 동일)
         span = nurse_병가_span[ni]
         if span is not None:
@@ -1355,15 +1305,12 @@ def solve_schedule(
             )
 
         # 휴가: >= hard_request_count (나머지 여유 off 슬롯을 휴가로 채움)
-        model.add(
-            sum(shifts[(ni, di, _휴가)] for di in range(num_days))
-            >= hard_counts[_휴가]
-        )
+        add(LinearExpr.sum([cell[_휴가] for cell in X[ni]]) >= hard_counts[_휴가])
 
         # 법휴: 갯수 고정 안 함 (H18 공휴일 제약이 결정)
         # POFF: H19에서 처리
 
-    _cp_idx["H12-H17(등급/역할/임산부)"] = len(model.proto.constraints)
+    _mark("H12-H17(등급/역할/임산부)")
     # ── H18. 공휴일 → 비근무 시 법휴만 허용 ──
     hard_req_days = set()
     for r in requests:
@@ -1375,7 +1322,7 @@ def solve_schedule(
 
     # H18: 공휴일에 비근무 시 법휴만 허용 (주휴/하드요청 제외)
     # _OFF는 차단 — 공휴일에는 법휴여야 함. H11은 법휴로 대체 가능하도록 별도 수정
-    h18_count = 0
+    h18_fixed = []
     for di in public_holiday_dis:
         if di < 0 or di >= num_days:
             continue
@@ -1384,35 +1331,35 @@ def solve_schedule(
                 continue
             if (ni, di) in hard_req_days:
                 continue
-            for oi in ALL_OFF:
-                if oi != _법휴:
-                    model.add(shifts[(ni, di, oi)] == 0)
-                    h18_count += 1
+            cell = X[ni][di]
+            h18_fixed.extend(cell[oi] for oi in ALL_OFF if oi != _법휴)
+    _fix_zero(model, h18_fixed)
+    h18_count = len(h18_fixed)
     _log(f"[H18] {h18_count}개 제약 추가 (공휴일={public_holiday_dis})")
 
     # ── H19. 임산부 POFF: 4연속 근무 후 추가 휴무 ──
+    no_poff = []
     for ni, nurse in enumerate(nurses):
         if not nurse.is_pregnant:
-            for di in range(num_days):
-                model.add(shifts[(ni, di, _POFF)] == 0)
+            no_poff.extend(cell[_POFF] for cell in X[ni])
             continue
 
         interval = rules.pregnant_poff_interval  # 4
         for di in range(num_days):
             if di < interval:
-                model.add(shifts[(ni, di, _POFF)] == 0)
+                no_poff.append(X[ni][di][_POFF])
                 continue
 
             if ((ni, di) in fixed_off_days
                     or (ni, di) in req_hard_days
                     or di in public_holiday_dis):
-                model.add(shifts[(ni, di, _POFF)] == 0)
+                no_poff.append(X[ni][di][_POFF])
                 continue
 
-            work_sum = sum(
-                shifts[(ni, di - k - 1, wi)]
+            work_sum = LinearExpr.sum([
+                X[ni][di - k - 1][wi]
                 for k in range(interval) for wi in WORK_INDICES
-            )
+            ])
 
             # Forward: 4연속 근무 → POFF 필수
             model.add(
@@ -1423,13 +1370,14 @@ def solve_schedule(
             model.add(
                 work_sum >= interval * shifts[(ni, di, _POFF)]
             )
+    _fix_zero(model, no_poff)
 
-    _cp_idx["H18-H19(공휴일/임산부POFF)"] = len(model.proto.constraints)
+    _mark("H18-H19(공휴일/임산부POFF)")
     # ── H20. 휴무 편차 제한 (±2, 주4일제 +4) ──
     # ±2: 수면/생휴 등 특수 휴무로 인한 개인차 수용
     중2_exists = any(n.role == "중2" for n in nurses)
     중2_per_weekday = rules.daily_M if 중2_exists else 0
-    num_weekdays = sum(1 for di in range(num_days) if weekday_of(di) < 5)
+    num_weekdays = len(cal.weekday_indices)
     num_weekends = num_days - num_weekdays
     total_work_slots = (
         num_weekdays * (rules.daily_D + 중2_per_weekday + rules.daily_E + rules.daily_N)
@@ -1450,11 +1398,10 @@ def solve_schedule(
     # 생휴(여성 자동), 수면(auto/pending), 법휴(공휴일 강제)를 모두 포함해야
     # "우영미(번표)+생휴+수면+법휴=14 > 13" 같은 경우를 정확히 건너뜀
     def _expected_off_count(ni):
-        nid = nurses[ni].id
+        nurse_reqs = requests_by_nurse.get(nurses[ni].id, ())
         hard_off = sum(
-            1 for r in requests
-            if r.nurse_id == nid and r.is_hard
-            and 1 <= r.day <= num_days
+            1 for r in nurse_reqs
+            if r.is_hard and 1 <= r.day <= num_days
         )
         # H10 FWO 주 일수 추가 — 주휴일은 ALL_OFF에 포함되므로 반드시 계산
         span = nurse_병가_span[ni]
@@ -1487,17 +1434,15 @@ def solve_schedule(
         if not nurses[ni].is_male and rules.menstrual_leave:
             auto_menst = max(0, _period_months - (1 if nurses[ni].menstrual_used else 0))
             already_menst = sum(
-                1 for r in requests
-                if r.nurse_id == nid and r.is_hard and r.code == "생휴"
-                and 1 <= r.day <= num_days
+                1 for r in nurse_reqs
+                if r.is_hard and r.code == "생휴" and 1 <= r.day <= num_days
             )
             hard_off += max(0, auto_menst - already_menst)
 
         # 수면: pending_sleep → 자동 1개, auto-수면 가능 간호사도 +1 (보수적 추정)
         sleep_already = sum(
-            1 for r in requests
-            if r.nurse_id == nid and r.is_hard and r.code == "수면"
-            and 1 <= r.day <= num_days
+            1 for r in nurse_reqs
+            if r.is_hard and r.code == "수면" and 1 <= r.day <= num_days
         )
         if sleep_already == 0:
             if nurses[ni].pending_sleep:
@@ -1531,10 +1476,7 @@ def solve_schedule(
         if _expected_off_count(ni) > base_off + h20_tol:
             h20_skip_count += 1
             continue
-        off_sum = sum(
-            shifts[(ni, di, oi)]
-            for di in range(num_days) for oi in ALL_OFF
-        )
+        off_sum = LinearExpr.sum(OFF[ni])
         model.add(off_sum >= base_off - h20_tol)
         model.add(off_sum <= base_off + h20_tol)
         h20_apply_count += 1
@@ -1545,15 +1487,13 @@ def solve_schedule(
             if _expected_off_count(ni) > fourday_target + h20_tol:
                 h20_skip_count += 1
                 continue
-            off_sum = sum(
-                shifts[(ni, di, oi)]
-                for di in range(num_days) for oi in ALL_OFF
-            )
+            off_sum = LinearExpr.sum(OFF[ni])
             model.add(off_sum >= fourday_target - h20_tol)
             model.add(off_sum <= fourday_target + h20_tol)
             h20_apply_count += 1
 
     _log(f"[H20] applied={h20_apply_count} skip={h20_skip_count} | base_off={base_off} tol=±{h20_tol}")
+    _mark("H20(휴무편차)", checkpoint=False)  # 진단 체크포인트는 INFEASIBLE 시 별도 기록
 
     # ── H21. 신청 휴무 샌드위치 금지 ──
     # 간호사가 d일에 휴무 신청 + d-1일·d+1일이 모두 휴무로 배정 → d일도 반드시 휴무
@@ -1564,16 +1504,24 @@ def solve_schedule(
             r = req_map.get((nid, di + 1))  # day는 1-based
             if r is None or not r.is_off_request:
                 continue
-            is_off_d   = model.new_bool_var(f"is_off_n{ni}_d{di}")
-            is_off_dm1 = model.new_bool_var(f"is_off_n{ni}_d{di-1}")
-            is_off_dp1 = model.new_bool_var(f"is_off_n{ni}_d{di+1}")
-            model.add(is_off_d   == sum(shifts[(ni, di,     oi)] for oi in ALL_OFF))
-            model.add(is_off_dm1 == sum(shifts[(ni, di - 1, oi)] for oi in ALL_OFF))
-            model.add(is_off_dp1 == sum(shifts[(ni, di + 1, oi)] for oi in ALL_OFF))
-            # is_off[d-1] AND is_off[d+1] → is_off[d]
-            # 동치: NOT(is_off[d-1]) OR NOT(is_off[d+1]) OR is_off[d]
-            model.add_bool_or([is_off_dm1.Not(), is_off_dp1.Not(), is_off_d])
-    _cp_idx["H21(샌드위치금지)"] = len(model.proto.constraints)
+            # off[d-1] AND off[d+1] → off[d]
+            # 동치: NOT(off[d-1]) OR NOT(off[d+1]) OR off[d]
+            add_bool_or([NOT_OFF[ni][di - 1], NOT_OFF[ni][di + 1], OFF[ni][di]])
+    _mark("H21(샌드위치금지)")
+
+    # ── 대칭 제거: 교환 가능한 간호사끼리 근무 배열 사전식 내림차순 ──
+    # 같은 묶음 간호사의 행을 서로 바꿔도 제약·목적값이 같으므로 정렬된 해 하나만 남김
+    sym_classes = interchangeable_nurses(nurses, requests) if symmetry_breaking else []
+    for members in sym_classes:
+        rows = [
+            [LinearExpr.weighted_sum(cell, range(NUM_TYPES)) for cell in X[ni]]
+            for ni in members
+        ]
+        for (na, a), (nb, b) in zip(zip(members, rows), zip(members[1:], rows[1:])):
+            _add_lex_geq(model, a, b, f"sym_{na}_{nb}")
+    if stats is not None:
+        stats["symmetry_classes"] = [len(members) for members in sym_classes]
+    _mark("대칭제거", checkpoint=False)
 
     # ══════════════════════════════════════════
     # SOFT CONSTRAINTS (목적함수)
@@ -1627,7 +1575,7 @@ def solve_schedule(
     for (ni, di), si_list in or_groups.items():
         unique_si = list(set(si_list))
         w = or_weights.get((ni, di), 650)  # 기본값: B조건 score 100 기준 (150 + 100*5)
-        obj.append(w * sum(shifts[(ni, di, si)] for si in unique_si))
+        obj.append(w * LinearExpr.sum([X[ni][di][si] for si in unique_si]))
 
     # ── S1b. 하드 휴무 사이 빈날 → OFF/휴무 배치 선호 (+250) ──
     # 예: 5일=휴가, 7일=휴가인데 6일 요청 없음 → 6일에 OFF 배치 유도
@@ -1636,8 +1584,8 @@ def solve_schedule(
         nid = nurses[ni].id
         # 이 간호사의 하드 휴무일 집합 (0-indexed di)
         hard_off_di: set[int] = set()
-        for r in requests:
-            if r.nurse_id != nid or not r.is_hard:
+        for r in requests_by_nurse.get(nid, ()):
+            if not r.is_hard:
                 continue
             di_r = r.day - 1
             if 0 <= di_r < num_days and r.code in NAME_TO_IDX:
@@ -1654,17 +1602,15 @@ def solve_schedule(
             if di in hard_off_di:
                 continue
             if (di - 1) in hard_off_di and (di + 1) in hard_off_di:
-                obj.append(250 * sum(shifts[(ni, di, oi)] for oi in ALL_OFF))
+                obj.append(250 * OFF[ni][di])
+    _mark("S1(희망요청)", checkpoint=False)
 
     # ── S2. D/E/N 횟수 공정성 (-5) ──
     shift_counts = {}
     for ni in range(num_nurses):
         for family, label in [(D_FAMILY, "D"), (E_FAMILY, "E"), ([_N], "N")]:
             c = model.new_int_var(0, num_days, f"cnt_n{ni}_{label}")
-            model.add(c == sum(
-                shifts[(ni, di, si)]
-                for di in range(num_days) for si in family
-            ))
+            model.add(c == LinearExpr.sum([cell[si] for cell in X[ni] for si in family]))
             shift_counts[(ni, label)] = c
 
     for label in ["D", "E", "N"]:
@@ -1677,6 +1623,7 @@ def solve_schedule(
             diff = model.new_int_var(0, num_days, f"diff_{label}")
             model.add(diff == mx - mn)
             obj.append(-5 * diff)
+    _mark("S2(DEN공정성)", checkpoint=False)
 
     # ── S3. N 균등 배분 (-8) ──
     n_counts = [shift_counts[(ni, "N")] for ni in range(num_nurses)]
@@ -1688,6 +1635,7 @@ def solve_schedule(
         diff = model.new_int_var(0, num_days, "N_eq_diff")
         model.add(diff == mx - mn)
         obj.append(-8 * diff)
+    _mark("S3(N균등)", checkpoint=False)
 
     # ── S8. 월 N 초과 억제 (-300/개) ──
     # max_N_per_month(기본 6) 초과 시 강한 소프트 페널티
@@ -1697,18 +1645,18 @@ def solve_schedule(
         excess = model.new_int_var(0, num_days, f"N_excess_{ni}")
         model.add(excess >= n_cnt - rules.max_N_per_month)
         obj.append(-300 * excess)
+    _mark("S8(N초과)", checkpoint=False)
 
     # ── S4. 주말 균등 배분 (-8) ──
-    weekend_indices = [di for di in range(num_days) if weekday_of(di) >= 5]
+    weekend_indices = cal.weekend_indices
     if weekend_indices and num_nurses >= 2:
         max_wk_work = len(weekend_indices) * len(WORK_INDICES)
         wk_counts = []
         for ni in range(num_nurses):
             c = model.new_int_var(0, max_wk_work, f"wk_n{ni}")
-            model.add(c == sum(
-                shifts[(ni, di, si)]
-                for di in weekend_indices for si in WORK_INDICES
-            ))
+            model.add(c == LinearExpr.sum([
+                X[ni][di][si] for di in weekend_indices for si in WORK_INDICES
+            ]))
             wk_counts.append(c)
 
         mx = model.new_int_var(0, max_wk_work, "max_wk")
@@ -1718,6 +1666,7 @@ def solve_schedule(
         diff = model.new_int_var(0, max_wk_work, "wk_diff")
         model.add(diff == mx - mn)
         obj.append(-8 * diff)
+    _mark("S4(주말균등)", checkpoint=False)
 
     # ── S5. 일반 3명 이하 권고 (-3) ──
     juniors = [ni for ni, n in enumerate(nurses) if n.grade == ""]
@@ -1725,33 +1674,92 @@ def solve_schedule(
         for di in range(num_days):
             for si in WORK_INDICES:
                 over = model.new_int_var(0, len(juniors), f"jr_d{di}_s{si}")
-                jr_cnt = sum(shifts[(ni, di, si)] for ni in juniors)
+                jr_cnt = LinearExpr.sum([X[ni][di][si] for ni in juniors])
                 model.add(over >= jr_cnt - rules.max_junior_per_shift)
                 obj.append(-3 * over)
+    _mark("S5(일반인원)", checkpoint=False)
 
     # ── S6. N 연속 배정 보상 (+20/쌍) ──
     # 연속된 N 쌍마다 보너스 → N 휴무 N 패턴 대신 N N N 블록 유도
     for ni in range(num_nurses):
         for di in range(num_days - 1):
             pair = model.new_bool_var(f"n_pair_{ni}_{di}")
-            model.add_min_equality(pair, [shifts[(ni, di, _N)], shifts[(ni, di + 1, _N)]])
+            enc.both(pair, NX[ni][di], NX[ni][di + 1])  # pair == N[di] AND N[di+1]
             obj.append(20 * pair)
+    _mark("S6(N연속)", checkpoint=False)
 
     # ── S7. 연속 휴무 보상 (+15/쌍) ──
     # 연속된 휴무 쌍마다 보너스 → 산발적 휴무(D-OFF-D-OFF)보다 연속 휴무(D-D-OFF-OFF) 유도
     for ni in range(num_nurses):
         for di in range(num_days - 1):
-            off_di  = sum(shifts[(ni, di,     oi)] for oi in ALL_OFF)
-            off_di1 = sum(shifts[(ni, di + 1, oi)] for oi in ALL_OFF)
             both_off = model.new_bool_var(f"both_off_{ni}_{di}")
-            model.add(both_off <= off_di)
-            model.add(both_off <= off_di1)
+            enc.implication(both_off, OFF[ni][di])
+            enc.implication(both_off, OFF[ni][di + 1])
             obj.append(15 * both_off)
-
+    _mark("S7(연속휴무)", checkpoint=False)
+
+    # ── R. 함의 제약 (redundant_constraints) ──
+    # H1·H2·H12~H15를 합산한 제약 — 해 공간은 그대로, 합계 단위 전파로 탐색·불가능 증명을 앞당김
+    if redundant_constraints:
+        # R1. 날짜별 휴무 인원 = 전체 − 근무 인원 (H1 + H2 + H2a/H2b)
+        #     평일 비-중2 간호사의 입력 전용(D9/D1/중1)은 H2 인원에 없으므로 좌변에 포함
+        중2_set = set(중2_nurses)
+        day_off_sums, day_off_targets = [], []
+        for di in range(num_days):
+            m_counted = bool(중2_nurses) and not cal.weekend[di]
+            demand = rules.daily_D + rules.daily_E + rules.daily_N + (rules.daily_M if m_counted else 0)
+            extra = [
+                X[ni][di][si]
+                for si in (_D9, _D1, _중1) for ni, dd in _input_only_allowed[si]
+                if dd == di and ni not in 중2_set
+            ] if m_counted else []
+            day_off_sums.append([OFF[ni][di] for ni in range(num_nurses)] + extra)
+            day_off_targets.append(num_nurses - demand)
+            add(LinearExpr.sum(day_off_sums[-1]) == day_off_targets[-1])
+        # R2. 주별·월 전체 합 (R1 합산)
+        for w_start in [*range(0, num_days, 7), None]:
+            days = range(num_days) if w_start is None else range(w_start, min(w_start + 7, num_days))
+            add(LinearExpr.sum([lit for di in days for lit in day_off_sums[di]])
+                == sum(day_off_targets[di] for di in days))
+        # R3. D/E/N 월 합계 = 일일 인원 × 일수 (S2/S3/S8 카운트 변수와 연결)
+        for label, daily in (("D", rules.daily_D), ("E", rules.daily_E), ("N", rules.daily_N)):
+            add(LinearExpr.sum([shift_counts[(ni, label)] for ni in range(num_nurses)]) == daily * num_days)
+        # R4. 풀별 월 합계 (H12 책임, H13 책임+서브차지, H14 역할 티어, H15 책임만)
+        pools = []
+        if chiefs and rules.min_chief_per_shift > 0:
+            pools += [(chiefs, label, rules.min_chief_per_shift, None) for label in "DEN"]
+        if seniors and rules.min_senior_per_shift > 0:
+            pools += [(seniors, label, rules.min_senior_per_shift, None) for label in "DEN"]
+        for tier_roles, max_d, max_e, max_n in ROLE_TIERS:
+            tier_nurses = [ni for ni, n in enumerate(nurses) if n.role in tier_roles]
+            if tier_nurses:
+                pools += [(tier_nurses, "D", None, max_d), (tier_nurses, "E", None, max_e),
+                          (tier_nurses, "N", None, max_n)]
+        if chief_only:
+            pools += [(chief_only, label, None, 1) for label in "DEN"]
+        for pool, label, lo, hi in pools:
+            pool_sum = LinearExpr.sum([shift_counts[(ni, label)] for ni in pool])
+            if lo is not None:
+                add(pool_sum >= lo * num_days)
+            if hi is not None and hi < len(pool):
+                add(pool_sum <= hi * num_days)
+        # R5. 간호사별 D+E+N + 중간계열 + 휴무 = 일수 (H1 합산, 카운트 변수 ↔ H20 휴무 합)
+        for ni, row in enumerate(X):
+            add(
+                shift_counts[(ni, "D")] + shift_counts[(ni, "E")] + shift_counts[(ni, "N")]
+                + LinearExpr.sum([cell[si] for cell in row for si in M_FAMILY])
+                + LinearExpr.sum(OFF[ni])
+                == num_days
+            )
+    _mark("R(함의제약)", checkpoint=False)
 
     # ── 목적함수 설정 ──
     if obj:
-        model.maximize(sum(obj))
+        model.maximize(LinearExpr.sum(obj))
+    _mark("목적함수", checkpoint=False)
+
+    if search_strategy == "night_first":
+        _add_night_first_strategy(model, X, seniors)
 
     # ══════════════════════════════════════════
     # 솔버 실행
@@ -1759,10 +1767,49 @@ def solve_schedule(
     solver = cp_model.CpSolver()
     solver.parameters.max_time_in_seconds = timeout_seconds
     solver.parameters.num_workers = 8
-    
+
+    if stats is not None:
+        stats.update(model_size(model), build_sec=time.perf_counter() - t_start,
+                     build_groups=profile.groups)
+    if export_path:
+        export_model(model, solver.parameters, export_path)
+    if build_only:
+        return Schedule(start_date=start_date, nurses=nurses, rules=rules, requests=requests)
+
+    phases: list[dict] = []
+    phase_values = None
+    if solve_mode == "two_phase":
+        phase_sec, phase_values = _two_phase_hint(model, X, nurses, requests, rules, cal,
+                                                  timeout_seconds, phases)
+        # 단계 + 다듬기 합이 timeout_seconds를 넘지 않도록 (남은 시간이 없으면 2단계 해 사용)
+        solver.parameters.max_time_in_seconds = max(0.0, timeout_seconds - phase_sec)
+
     _log("solver.solve() 호출 시작...")
-    status = solver.solve(model)
-    
+    if stats is None:
+        status = solver.solve(model)
+    else:
+        timer = _SolutionTimer()
+        # presolve 종료 시각은 탐색 로그에서만 알 수 있음 → stdout 대신 콜백으로 받음
+        presolve = _PresolveTimer()
+        solver.parameters.log_search_progress = True
+        solver.parameters.log_to_stdout = False
+        solver.log_callback = presolve
+        status = solver.solve(model, timer)
+        _fill_solve_stats(stats, solver, status, timer)
+        if phases:
+            _add_phase_stats(stats, phases)
+
+    value = solver.value
+    if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE) and phase_values is not None:
+        # 다듬기에서 해를 못 찾음(시간 부족) → 2단계 해(N 고정 전체 모델)를 결과로
+        value = lambda var: phase_values[var.index]
+        status = cp_model.FEASIBLE
+        if stats is not None:
+            stats.update(status="FEASIBLE", objective=phases[-1]["objective"], result_phase="day")
+    if stats is not None:
+        stats["presolve_sec"] = presolve.sec
+        stats["total_sec"] = time.perf_counter() - t_start
+
     _log(f"솔버 종료 상태: {status} (3:FEASIBLE, 4:OPTIMAL, 0:UNKNOWN)")
 
     # ══════════════════════════════════════════
@@ -1778,7 +1825,7 @@ def solve_schedule(
         for ni, nurse in enumerate(nurses):
             for di in range(num_days):
                 for si in range(NUM_TYPES):
-                    if solver.value(shifts[(ni, di, si)]):
+                    if value(shifts[(ni, di, si)]):
                         schedule.set_shift(nurse.id, di + 1, IDX_TO_NAME[si])
                         break
 
@@ -1793,6 +1840,529 @@ def solve_schedule(
     return schedule
 
 
+# ══════════════════════════════════════════
+# 실행 통계 (stats 요청 시에만)
+# ══════════════════════════════════════════
+
+TRAJECTORY_POINTS = 50  # stats["trajectory"] 최대 점 수 (job 행 크기 제한)
+
+
+class _BuildProfile:
+    """제약 그룹별 구축 시간·제약 수 — mark() 호출 사이 구간 단위
+
+    checkpoint=True면 _diagnose_infeasible용 체크포인트(그룹명 → 누적 제약 수)도 기록
+    """
+
+    def __init__(self, model: cp_model.CpModel, t_start: float):
+        self.model = model
+        self.checkpoints: dict[str, int] = {}
+        self.groups: list[dict] = []
+        self._t = t_start
+        self._n = 0
+
+    def mark(self, name: str, checkpoint: bool = True) -> None:
+        n = len(self.model.proto.constraints)
+        now = time.perf_counter()
+        if checkpoint:
+            self.checkpoints[name] = n
+        self.groups.append({"group": name, "sec": round(now - self._t, 4), "constraints": n - self._n})
+        self._t, self._n = now, n
+
+
+class _SolutionTimer(cp_model.CpSolverSolutionCallback):
+    """해 발견 시각 기록 — 첫 해까지 걸린 시간, 개선 횟수, 목적값·상한 추이"""
+
+    def __init__(self):
+        super().__init__()
+        self.first_sec: float | None = None
+        self.first_objective: float | None = None
+        self.count = 0
+        self.trajectory: list[tuple[float, float, float]] = []
+
+    def on_solution_callback(self):
+        self.count += 1
+        if self.first_sec is None:
+            self.first_sec = self.wall_time
+            self.first_objective = self.objective_value
+        self.trajectory.append((self.wall_time, self.objective_value, self.best_objective_bound))
+
+
+class _PresolveTimer:
+    """CP-SAT 탐색 로그 콜백 — presolve 종료 시각(solve 시작 기준 초)"""
+
+    def __init__(self):
+        self._t0 = time.perf_counter()
+        self.sec: float | None = None
+
+    def __call__(self, line: str) -> None:
+        if self.sec is None and line.startswith("Presolved"):
+            self.sec = time.perf_counter() - self._t0
+
+
+def _downsample(points: list, limit: int) -> list:
+    """첫 점·마지막 점 유지하며 limit개 이하로 균등 추출"""
+    if len(points) <= limit:
+        return points
+    step = (len(points) - 1) / (limit - 1)
+    return [points[round(i * step)] for i in range(limit)]
+
+
+def model_size(model: cp_model.CpModel) -> dict:
+    """모델 크기 (변수·제약 수)"""
+    proto = model.proto
+    return {"num_vars": len(proto.variables), "num_constraints": len(proto.constraints)}
+
+
+def export_model(model: cp_model.CpModel, parameters, path: str) -> tuple[str, str]:
+    """CpModel proto와 솔버 파라미터 저장 → (모델 경로, 파라미터 경로)
+
+    확장자가 .txt/.pbtxt면 텍스트 proto, 그 외(.pb 등)는 바이너리.
+    파라미터는 항상 텍스트 proto (<모델 경로에서 확장자 제외>.params.pbtxt).
+    """
+    if not model.export_to_file(path):
+        raise OSError(f"모델 저장 실패: {path}")
+    params_path = os.path.splitext(path)[0] + ".params.pbtxt"
+    with open(params_path, "w", encoding="utf-8") as f:
+        f.write(str(parameters))
+    return path, params_path
+
+
+def _fix_zero(model: cp_model.CpModel, literals: list) -> None:
+    """불리언 변수 묶음을 0으로 고정 — 합 == 0 제약 1개
+
+    변수마다 var == 0 제약을 두는 것과 동치 (0/1 변수의 합이 0 ⇔ 전부 0),
+    제약 수가 줄어 구축이 빠르고 presolve에서 그대로 고정됨.
+    """
+    if literals:
+        model.add(LinearExpr.sum(literals) == 0)
+
+
+def interchangeable_nurses(nurses: list[Nurse], requests: list[Request]) -> list[list[int]]:
+    """서로 교환 가능한 간호사 인덱스 묶음 (2명 이상인 묶음만, 입력 순서)
+
+    신청이 없고 솔버가 보는 속성(역할·직급·임신·성별·주4일·고정주휴·휴가/수면 잔여·
+    전월 근무 tail)이 모두 같은 간호사 → 두 사람의 근무 행을 바꿔도 같은 해·같은 목적값.
+    id·이름·비고는 솔버가 신청 매칭 외에 쓰지 않으므로 제외.
+    """
+    requested = {r.nurse_id for r in requests}
+    classes: dict[tuple, list[int]] = {}
+    for ni, nurse in enumerate(nurses):
+        if nurse.id in requested:
+            continue
+        attrs = nurse.to_dict()
+        for key in ("id", "name", "note"):
+            attrs.pop(key)
+        attrs["prev_tail_shifts"] = tuple(attrs["prev_tail_shifts"])
+        classes.setdefault(tuple(sorted(attrs.items())), []).append(ni)
+    return [members for members in classes.values() if len(members) >= 2]
+
+
+def _add_lex_geq(model: cp_model.CpModel, a: list, b: list, name: str) -> None:
+    """a ≥ b (사전식) — eq[d]: d 이전이 모두 같음
+
+    eq[d] → a[d] ≥ b[d],  eq[d] ∧ ¬eq[d+1] → a[d] > b[d]
+    처음 다른 자리에서 a가 크거나 전부 같으면 만족 (eq[0] = 참)
+    """
+    eq_prev = None
+    for d, (x, y) in enumerate(zip(a, b)):
+        ge = model.add(x >= y)
+        if eq_prev is not None:
+            ge.only_enforce_if(eq_prev)
+        if d == len(a) - 1:
+            break
+        eq_next = model.new_bool_var(f"{name}_eq{d + 1}")
+        gt = model.add(x >= y + 1)
+        gt.only_enforce_if([eq_next.Not()] if eq_prev is None else [eq_prev, eq_next.Not()])
+        eq_prev = eq_next
+
+
+class _BoolEncoding:
+    """불리언 제약 추가 방식 선택 (solve_schedule native_encoding)
+
+    native=True : CP-SAT 전용 제약 — 구축이 빠르고 presolve가 절/AMO로 바로 다룸
+    native=False: 같은 의미의 선형 제약 (기본값)
+    합성 병동 벤치마크(1코어)에서 native는 구축 30~40% 단축, 대신 첫 해·목적값이 나빠짐
+    (기본 linearization_level=1에서는 bool_or가 LP 완화에 들어가지 않음) → 선택 사항으로 둠
+    """
+
+    def __init__(self, model: cp_model.CpModel, native: bool = False):
+        self.native = native
+        self._model = model
+        if native:
+            self.exactly_one = model.add_exactly_one
+            self.at_most_one = model.add_at_most_one
+            self.bool_or = model.add_bool_or
+            self.implication = model.add_implication
+        else:
+            add = model.add
+            self.exactly_one = lambda literals: add(LinearExpr.sum(literals) == 1)
+            self.at_most_one = lambda *literals: add(LinearExpr.sum(list(literals)) <= 1)
+            self.bool_or = lambda literals: add(LinearExpr.sum(literals) >= 1)
+            self.implication = lambda a, b: add(a <= b)
+
+    def both(self, target, a, b) -> None:
+        """target == (a AND b)"""
+        if self.native:
+            self._model.add_bool_and([a, b]).only_enforce_if(target)
+            self._model.add_bool_or([a.Not(), b.Not(), target])
+        else:
+            self._model.add_min_equality(target, [a, b])
+
+
+SEARCH_STRATEGIES = ("default", "night_first")
+
+
+def _add_night_first_strategy(model: cp_model.CpModel, X: list, seniors: list[int]) -> None:
+    """야간 우선 결정 전략 — 시니어 N → 나머지 N → E → D (각 단계 날짜순, 1 먼저 시도)
+
+    N 블록(H3a/H5/H6, S3/S6/S8)과 시니어 커버(H12/H13)가 가장 빡빡하므로 먼저 고정하고
+    나머지는 전파에 맡김. 결정 전략은 포트폴리오 중 fixed 워커만 따르고 다른 워커는 기본 탐색 유지.
+    """
+    senior_set = set(seniors)
+    num_days = len(X[0]) if X else 0
+    others = [ni for ni in range(len(X)) if ni not in senior_set]
+    for group, si in ((seniors, _N), (others, _N), (range(len(X)), _E), (range(len(X)), _D)):
+        literals = [X[ni][di][si] for di in range(num_days) for ni in group]
+        if literals:
+            model.add_decision_strategy(literals, cp_model.CHOOSE_FIRST, cp_model.SELECT_MAX_VALUE)
+
+
+SOLVE_MODES = ("monolithic", "two_phase")
+TWO_PHASE_SPLIT = (0.15, 0.35)  # 야간 단계 / 주간 단계 시간 비율 (나머지는 전체 모델 다듬기)
+
+# 야간 축약 모델의 칸 상태: 근무 타입 21개를 4개로 묶음
+_NIGHT, _EVENING, _DAYWORK, _REST = range(4)
+_STATE_TYPES = (N_FAMILY, E_FAMILY, D_FAMILY + M_FAMILY, ALL_OFF)
+_STATE_OF = {si: state for state, types in enumerate(_STATE_TYPES) for si in types}
+
+
+def _build_night_model(nurses: list[Nurse], requests: list[Request], rules: Rules,
+                       cal: PeriodCalendar) -> tuple[cp_model.CpModel, list]:
+    """two_phase 1단계 축약 모델 → (model, S[ni][di][state])
+
+    칸마다 N / E / 주간근무(D·중간 계열) / 휴무 4상태만 두고, 전체 모델 제약 중
+    이 상태로 그대로 옮겨지는 것만 추가 (전체 해를 상태로 묶으면 항상 만족 = 완화 모델):
+      일일 N·E 인원, 주간근무 최소 인원, H3 역순(상태 단위로 전부 금지되는 쌍), H3a, H4, H5, H6,
+      H17, H21, 월 경계(tail), 고정 주휴·확정 신청·N/E 제외, H12~H15의 N·E 인원(D는 하한만),
+      수면 발생 시 휴무 1일
+    목적: S1 신청(상태 단위) + S3 N 균등 + S8 N 초과 + S6 N 연속 — 원래 가중치
+    휴무 종류(생휴·법휴·휴가…), H11·H18·H20, D 단위 등급 제약은 없음 → 2단계에서 정함
+    """
+    num_days = cal.num_days
+    num_nurses = len(nurses)
+    model = cp_model.CpModel()
+    S = [
+        [[model.new_bool_var(f"p1_n{ni}_d{di}_{k}") for k in range(4)] for di in range(num_days)]
+        for ni in range(num_nurses)
+    ]
+    NV = [[cell[_NIGHT] for cell in row] for row in S]
+    REST = [[cell[_REST] for cell in row] for row in S]
+    add = model.add
+    for row in S:
+        for cell in row:
+            model.add_exactly_one(cell)
+
+    # 일일 인원: N·E 정확히, 주간근무는 D(+평일 중2) 이상 (입력 전용 D9/D1/중1만큼 더 많을 수 있음)
+    중2_nurses = [ni for ni, n in enumerate(nurses) if n.role == "중2"]
+    for di in range(num_days):
+        add(LinearExpr.sum([row[di][_NIGHT] for row in S]) == rules.daily_N)
+        add(LinearExpr.sum([row[di][_EVENING] for row in S]) == rules.daily_E)
+        m_today = rules.daily_M if 중2_nurses and not cal.weekend[di] else 0
+        add(LinearExpr.sum([row[di][_DAYWORK] for row in S]) >= rules.daily_D + m_today)
+        if m_today:
+            add(LinearExpr.sum([S[ni][di][_DAYWORK] for ni in 중2_nurses]) >= m_today)
+
+    # H3 역순: 상태 쌍의 모든 타입 조합이 금지일 때만 (N→E, N→주간, E→주간)
+    forbidden = set(FORBIDDEN_PAIRS)
+    state_pairs = [
+        (a, b) for a in (_NIGHT, _EVENING, _DAYWORK) for b in (_NIGHT, _EVENING, _DAYWORK)
+        if all((si, sj) in forbidden for si in _STATE_TYPES[a] for sj in _STATE_TYPES[b])
+    ] if rules.ban_reverse_order else []
+    for row in S:
+        for today, tomorrow in zip(row, row[1:]):
+            for a, b in state_pairs:
+                model.add_at_most_one(today[a], tomorrow[b])
+
+    max_cw, max_cn, off_after = rules.max_consecutive_work, rules.max_consecutive_N, rules.off_after_2N
+    for ni, nurse in enumerate(nurses):
+        n_row, rest_row, row = NV[ni], REST[ni], S[ni]
+        for di in range(num_days - 2):  # H3a: N → 휴무 1일 → 주간근무·N 금지
+            for k in (_DAYWORK, _NIGHT):
+                model.add_bool_or([n_row[di].Not(), rest_row[di + 1].Not(), row[di + 2][k].Not()])
+        for di in range(num_days - max_cw):  # H4
+            model.add_bool_or(rest_row[di:di + max_cw + 1])
+        for di in range(num_days - max_cn):  # H5
+            model.add_bool_or([v.Not() for v in n_row[di:di + max_cn + 1]])
+        for di in range(1, num_days - 1):  # H6: NN 블록 끝 → 휴무 off_after일
+            for target in range(di + 1, min(di + 1 + off_after, num_days)):
+                model.add_bool_or([n_row[di].Not(), n_row[di - 1].Not(), n_row[di + 1], rest_row[target]])
+        if nurse.is_pregnant:  # H17
+            interval = rules.pregnant_poff_interval
+            for di in range(num_days - interval):
+                model.add_bool_or(rest_row[di:di + interval + 1])
+        if nurse.fixed_weekly_off is not None:  # H10: 주(병가 기간이면 병가) → 휴무
+            for di in range(num_days):
+                if cal.weekdays[di] == nurse.fixed_weekly_off:
+                    add(rest_row[di] == 1)
+
+        # 월 경계 (전체 모델의 경계 H3/H3a/H4/H5/H6과 같은 조건)
+        tail = nurse.prev_tail_shifts
+        if not tail:
+            continue
+        if tail[-1] == "N":
+            if rules.ban_reverse_order:
+                add(row[0][_EVENING] == 0)
+                add(row[0][_DAYWORK] == 0)
+            if num_days >= 2:
+                for k in (_DAYWORK, _NIGHT):
+                    model.add_at_most_one(rest_row[0], row[1][k])
+        elif tail[-1] == "E" and rules.ban_reverse_order:
+            add(row[0][_DAYWORK] == 0)
+        if len(tail) >= 2 and tail[-2] == "N" and tail[-1] in OFF_SET:
+            add(row[0][_DAYWORK] == 0)
+            add(n_row[0] == 0)
+        consec_work = next((k for k, s in enumerate(reversed(tail)) if s not in ("D", "E", "N", "중2")), len(tail))
+        if consec_work:
+            remain = max_cw - consec_work
+            model.add_bool_or(rest_row[:max(1, min(remain + 1, num_days))])
+        consec_n = next((k for k, s in enumerate(reversed(tail)) if s != "N"), len(tail))
+        if consec_n:
+            remain_n = max_cn - consec_n
+            if remain_n <= 0:
+                add(n_row[0] == 0)
+            else:
+                add(LinearExpr.sum(n_row[:min(remain_n + 1, num_days)]) <= remain_n)
+        if len(tail) >= 2 and tail[-2] == "N" and tail[-1] == "N":
+            for k in range(min(off_after, num_days)):
+                add(rest_row[k] == 1)
+        elif tail[-1] == "N":
+            for k in range(off_after):
+                if 1 + k < num_days:
+                    model.add_implication(n_row[0], rest_row[1 + k])
+
+    # H12~H15: N·E 인원. D는 중간 계열과 묶여 있어 하한(H12/H13)만 주간근무 상태로 적용
+    chiefs = [ni for ni, n in enumerate(nurses) if n.grade == "책임"]
+    seniors = [ni for ni, n in enumerate(nurses) if n.grade in ("책임", "서브차지")]
+    chief_only = [ni for ni, n in enumerate(nurses) if n.role == "책임만"]
+    tiers = [([ni for ni, n in enumerate(nurses) if n.role in roles], max_e, max_n)
+             for roles, _, max_e, max_n in ROLE_TIERS]
+    for di in range(num_days):
+        for k, tier_idx in ((_NIGHT, 2), (_EVENING, 1)):
+            if chiefs and rules.min_chief_per_shift > 0:
+                add(LinearExpr.sum([S[ni][di][k] for ni in chiefs]) >= rules.min_chief_per_shift)
+            if seniors and rules.min_senior_per_shift > 0:
+                add(LinearExpr.sum([S[ni][di][k] for ni in seniors]) >= rules.min_senior_per_shift)
+            if chief_only:
+                add(LinearExpr.sum([S[ni][di][k] for ni in chief_only]) <= 1)
+            for tier in tiers:
+                if tier[0]:
+                    add(LinearExpr.sum([S[ni][di][k] for ni in tier[0]]) <= tier[tier_idx])
+        if chiefs and rules.min_chief_per_shift > 0:
+            add(LinearExpr.sum([S[ni][di][_DAYWORK] for ni in chiefs]) >= rules.min_chief_per_shift)
+        if seniors and rules.min_senior_per_shift > 0:
+            add(LinearExpr.sum([S[ni][di][_DAYWORK] for ni in seniors]) >= rules.min_senior_per_shift)
+
+    # H21: 휴무 신청일 양옆이 휴무면 그날도 휴무 (같은 날 신청이 여럿이면 마지막 신청 기준)
+    nurse_idx = {nurse.id: i for i, nurse in enumerate(nurses)}
+    req_map = {(r.nurse_id, r.day): r for r in requests}
+    for (nid, day), r in req_map.items():
+        if nid in nurse_idx and 2 <= day <= num_days - 1 and r.is_off_request:
+            rest_row = REST[nurse_idx[nid]]
+            di = day - 1
+            model.add_bool_or([rest_row[di - 1].Not(), rest_row[di + 1].Not(), rest_row[di]])
+
+    # 신청: 확정(병가/번표/수면/D9/D1)·N/E 제외는 고정, 나머지는 S1 가중치로 상태에 보상
+    obj = []
+    or_groups: dict[tuple, set] = {}
+    or_weights: dict[tuple, int] = {}
+    for r in requests:
+        if r.nurse_id not in nurse_idx or not 1 <= r.day <= num_days:
+            continue
+        ni, di = nurse_idx[r.nurse_id], r.day - 1
+        if r.is_exclude:
+            if r.excluded_shift in ("N", "E"):
+                add(S[ni][di][_NIGHT if r.excluded_shift == "N" else _EVENING] == 0)
+            continue
+        state = _STATE_OF.get(NAME_TO_IDX.get(r.code))
+        if state is None:
+            continue
+        if r.is_hard:
+            add(S[ni][di][state] == 1)
+            continue
+        weight = (800 if r.condition == 'A' else 250) + r.score * 5
+        if r.is_or:
+            or_groups.setdefault((ni, di), set()).add(state)
+            or_weights[(ni, di)] = max(or_weights.get((ni, di), 0), weight)
+        else:
+            obj.append(weight * S[ni][di][state])
+    for (ni, di), states in or_groups.items():
+        obj.append(or_weights[(ni, di)] * LinearExpr.sum([S[ni][di][k] for k in states]))
+
+    # 수면: N 누적이 기준 이상이면 기준일 이후 휴무 1일 필요 (전체 모델 특수OFF-수면 조건)
+    hard_sleep = {nurse_idx[r.nurse_id] for r in requests
+                  if r.is_hard and r.code == "수면" and r.nurse_id in nurse_idx}
+    partner = get_sleep_partner_month(cal.start_date.month)
+    n_counts = []
+    for ni, nurse in enumerate(nurses):
+        n_cnt = model.new_int_var(0, num_days, f"p1_cntN_{ni}")
+        add(n_cnt == LinearExpr.sum(NV[ni]))
+        n_counts.append(n_cnt)
+        if ni in hard_sleep or nurse.pending_sleep:
+            continue
+        threshold = rules.sleep_N_monthly
+        if partner is not None:
+            threshold = min(threshold, max(0, rules.sleep_N_bimonthly - nurse.prev_month_N))
+        if 0 < threshold <= rules.max_N_per_month and threshold < num_days:
+            sleep = model.new_bool_var(f"p1_sleep_{ni}")
+            add(n_cnt >= threshold).only_enforce_if(sleep)
+            add(n_cnt <= threshold - 1).only_enforce_if(sleep.Not())
+            model.add_bool_or(REST[ni][threshold:] + [sleep.Not()])
+
+    # S3 N 균등 (-8), S8 N 초과 (-300/개), S6 N 연속 (+20/쌍)
+    if len(n_counts) >= 2:
+        mx = model.new_int_var(0, num_days, "p1_max_N")
+        mn = model.new_int_var(0, num_days, "p1_min_N")
+        model.add_max_equality(mx, n_counts)
+        model.add_min_equality(mn, n_counts)
+        obj.append(-8 * (mx - mn))
+    for ni, n_cnt in enumerate(n_counts):
+        excess = model.new_int_var(0, num_days, f"p1_N_excess_{ni}")
+        add(excess >= n_cnt - rules.max_N_per_month)
+        obj.append(-300 * excess)
+    for ni, n_row in enumerate(NV):
+        for di in range(num_days - 1):
+            pair = model.new_bool_var(f"p1_n_pair_{ni}_{di}")
+            model.add_implication(pair, n_row[di])
+            model.add_implication(pair, n_row[di + 1])
+            obj.append(20 * pair)
+    model.maximize(LinearExpr.sum(obj))
+    return model, S
+
+
+def _solve_phase(model: cp_model.CpModel, name: str, max_time: float,
+                 full_model: bool) -> tuple[cp_model.CpSolver, int, dict]:
+    """two_phase 단계 1개 실행 → (solver, status, 단계 기록)
+
+    full_model: 전체 모델(제약 추가만 한 것 포함)의 해인지 — 이 단계의 해만 근무표로 인정
+    """
+    solver = cp_model.CpSolver()
+    solver.parameters.max_time_in_seconds = max_time
+    solver.parameters.num_workers = 8
+    timer = _SolutionTimer()
+    status = solver.solve(model, timer)
+    found = status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+    return solver, status, {
+        "phase": name,
+        "status": solver.status_name(status),
+        "sec": solver.wall_time,
+        "full_model": full_model,
+        "first_solution_sec": timer.first_sec,
+        "first_objective": timer.first_objective,
+        "objective": solver.objective_value if found else None,
+    }
+
+
+def _two_phase_hint(model: cp_model.CpModel, X: list, nurses: list[Nurse], requests: list[Request],
+                    rules: Rules, cal: PeriodCalendar, timeout_seconds: float,
+                    phases: list[dict]) -> tuple[float, list | None]:
+    """2단계 분해 — 야간 축약 모델로 N 배치 → N 고정 후 전체 모델 → 마지막 해를 model 힌트로 추가
+
+    1단계(night): _build_night_model (칸당 4상태, 야간·수면·휴식 규칙과 야간 목적만) — N 배치 결정
+    2단계(day):   전체 모델에서 N 셀을 1단계 값으로 고정, D/E/중2/휴무 종류 배정 (1단계 상태를 힌트로)
+    축약 모델은 완화라 1단계 N 배치가 전체 모델에서 불가능할 수 있음 → 2단계가 해를 못 찾으면
+    1단계 N 배치만 힌트로 남김 (힌트는 제약이 아니므로 다듬기 단계는 전체 모델 그대로).
+    phases에 단계별 결과를 기록하고 (소요 시간(초), 2단계 해 값 또는 None)을 반환.
+    2단계 해는 변수 인덱스가 model과 같음 → 다듬기 단계가 해를 못 찾으면 그대로 결과로 사용.
+    1단계에서 해가 없으면 힌트 없이 반환.
+    """
+    t0 = time.perf_counter()
+    night_share, day_share = TWO_PHASE_SPLIT
+
+    p1, S = _build_night_model(nurses, requests, rules, cal)
+    solver, status, record = _solve_phase(p1, "night", timeout_seconds * night_share, full_model=False)
+    phases.append(record)
+    if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        return time.perf_counter() - t0, None
+    night = [[solver.boolean_value(cell[_NIGHT]) for cell in row] for row in S]
+
+    p2 = model.clone()
+    night_on, night_off = [], []
+    for x_row, n_row in zip(X, night):
+        for cell, is_n in zip(x_row, n_row):
+            (night_on if is_n else night_off).append(cell[_N])
+    if night_on:
+        p2.add(LinearExpr.sum(night_on) == len(night_on))
+    _fix_zero(p2, night_off)
+    for x_row, s_row in zip(X, S):
+        for cell, states in zip(x_row, s_row):
+            state = next(k for k, v in enumerate(states) if solver.boolean_value(v))
+            if state != _REST:  # 휴무 종류는 1단계에서 정하지 않음
+                p2.add_hint(cell[_STATE_TYPES[state][0]], 1)
+    solver, status, record = _solve_phase(p2, "day", timeout_seconds * day_share, full_model=True)
+    phases.append(record)
+
+    values = None
+    if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        values = list(solver.response_proto.solution)
+        for cell in (c for row in X for c in row):
+            for lit in cell:
+                model.add_hint(lit, values[lit.index])
+    else:
+        for x_row, n_row in zip(X, night):
+            for cell, is_n in zip(x_row, n_row):
+                model.add_hint(cell[_N], is_n)
+    return time.perf_counter() - t0, values
+
+
+def _add_phase_stats(stats: dict, phases: list[dict]) -> None:
+    """two_phase 단계 기록을 stats에 합침 — 시각은 탐색 시작(1단계) 기준으로 환산
+
+    first_solution_sec/first_objective는 전체 모델 해(2단계 또는 다듬기)만 기준.
+    1단계 축약 모델의 해는 근무표가 아니므로 phases[0]["first_solution_sec"]에만 남김
+    """
+    offset = sum(p["sec"] for p in phases)
+    elapsed = 0.0
+    for p in phases:
+        if p["full_model"] and p["first_solution_sec"] is not None:
+            stats["first_solution_sec"] = elapsed + p["first_solution_sec"]
+            stats["first_objective"] = p["first_objective"]
+            break
+        elapsed += p["sec"]
+    else:
+        if stats["first_solution_sec"] is not None:
+            stats["first_solution_sec"] += offset
+    stats["solve_sec"] += offset
+    for point in stats["trajectory"]:
+        point["sec"] = round(point["sec"] + offset, 3)
+    stats["phases"] = phases
+
+
+def _fill_solve_stats(stats: dict, solver: cp_model.CpSolver, status, timer: _SolutionTimer) -> None:
+    found = status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+    objective = solver.objective_value if found else None
+    bound = solver.best_objective_bound if found else None
+    stats.update(
+        status=solver.status_name(status),
+        solve_sec=solver.wall_time,
+        first_solution_sec=timer.first_sec,
+        first_objective=timer.first_objective,
+        num_solutions=timer.count,
+        objective=objective,
+        best_bound=bound,
+        # 최대화 문제: (상한 - 현재값) / |현재값|
+        gap=(bound - objective) / max(1.0, abs(objective)) if found else None,
+        num_conflicts=solver.num_conflicts,
+        num_branches=solver.num_branches,
+        num_booleans=solver.num_booleans,
+        user_time=solver.user_time,
+        trajectory=[
+            {"sec": round(t, 3), "objective": obj, "bound": b}
+            for t, obj, b in _downsample(timer.trajectory, TRAJECTORY_POINTS)
+        ],
+        response_stats=solver.response_stats(),
+    )
+
+
 # ══════════════════════════════════════════
 # 후처리 (최소한)
 # 솔버가 법휴/POFF/수면/생휴를 직접 관리하므로
@@ -0,0 +1,180 @@
+"""합성 병동 데이터 생성기 — 솔버 벤치마크·재현용 (DB 없이 결정적 생성)
+
+기준 병동(nurse_info.xlsx, 38명)의 구성 비율을 인원수에 맞춰 확장:
+  - 직급: 책임 9 / 서브차지 13 / 일반 16
+  - 역할: 중2 7명, 구역 역할(책임만·외상·혼자 관찰·준급성·급성구역·격리구역)
+  - 남자 5, 주4일제 5, 전원 고정 주휴
+  - 일일 인원: D7 / E8 / N7 / 중2 1 (Rules 기본값)
+
+구역 역할은 ROLE_TIERS의 근무당 상한이 인원수와 무관하게 고정이므로
+기준 인원(38명)을 넘으면 더 늘리지 않음 (늘리면 구조적으로 infeasible).
+
+사용법:
+    from engine.synthetic import SyntheticSpec, generate
+    dept = generate(SyntheticSpec(num_nurses=60, seed=1))
+    solve_schedule(dept.nurses, dept.requests, dept.rules, dept.start_date)
+"""
+import random
+from dataclasses import dataclass, field
+from datetime import date
+
+from engine.models import Nurse, Request, Rules
+
+REFERENCE_NURSES = 38
+
+# 기준 병동 구역 역할 인원 (중2 제외)
+_ZONE_ROLES = {"책임만": 3, "혼자 관찰": 3, "준급성": 2, "외상": 1, "격리구역": 1, "급성구역": 1}
+
+# 신청 코드 분포 (휴무 위주, 실제 신청표와 비슷한 비율)
+_REQUEST_CODES = ["OFF"] * 8 + ["휴가"] * 3 + ["D", "E", "N", "N 제외", "D 제외"]
+_OR_CODES = ["D", "E", "OFF"]
+
+
+@dataclass(frozen=True)
+class SyntheticSpec:
+    num_nurses: int = REFERENCE_NURSES
+    seed: int = 0
+
+    # 직급·근무형태 비율 (0~1)
+    chief_ratio: float = 9 / 38          # 책임
+    sub_ratio: float = 13 / 38           # 서브차지
+    m_role_ratio: float = 7 / 38         # 중2 역할
+    male_ratio: float = 5 / 38
+    four_day_ratio: float = 5 / 38       # 주4일제
+    pregnant_ratio: float = 0.0
+    fixed_off_ratio: float = 1.0         # 고정 주휴 지정 비율
+
+    # 신청
+    requests_per_nurse: float = 6.0      # 간호사당 평균 신청 건수
+    hard_share: float = 0.25             # A조건 비율 (간호사당 최대 3건)
+    or_share: float = 0.05               # OR 신청(같은 날 2코드) 비율
+
+    # 기간
+    start_date: date = date(2026, 9, 21)
+    public_holidays: tuple = (3, 17)
+    vacation_days: int = 20
+
+    # 일일 인원 (None이면 기준 병동 비율로 확장)
+    daily: dict | None = field(default=None, hash=False)
+
+
+@dataclass
+class SyntheticDepartment:
+    spec: SyntheticSpec
+    nurses: list[Nurse]
+    requests: list[Request]
+    rules: Rules
+    start_date: date
+
+    def summary(self) -> dict:
+        r = self.rules
+        return {
+            "nurses": len(self.nurses),
+            "requests": len(self.requests),
+            "hard_requests": sum(1 for q in self.requests if q.condition == "A"),
+            "daily": {"D": r.daily_D, "E": r.daily_E, "N": r.daily_N, "M": r.daily_M},
+            "holidays": list(r.public_holidays),
+        }
+
+
+def _scaled(count_at_reference: int, n: int) -> int:
+    return max(1, round(count_at_reference * n / REFERENCE_NURSES))
+
+
+def _rules_for(spec: SyntheticSpec) -> Rules:
+    n = spec.num_nurses
+    daily = spec.daily or {
+        "D": _scaled(7, n), "E": _scaled(8, n), "N": _scaled(7, n), "M": _scaled(1, n),
+    }
+    return Rules(
+        daily_D=daily["D"], daily_E=daily["E"], daily_N=daily["N"], daily_M=daily["M"],
+        public_holidays=list(spec.public_holidays),
+    )
+
+
+def _take(pool: list[int], k: int) -> list[int]:
+    taken, pool[:] = pool[:k], pool[k:]
+    return taken
+
+
+def _nurses_for(spec: SyntheticSpec, rng: random.Random) -> list[Nurse]:
+    n = spec.num_nurses
+    nurses = [Nurse(id=i, name=f"간호사{i:03d}", vacation_days=spec.vacation_days) for i in range(n)]
+
+    order = list(range(n))
+    rng.shuffle(order)
+    for i in _take(order, round(n * spec.chief_ratio)):
+        nurses[i].grade = "책임"
+    for i in _take(order, round(n * spec.sub_ratio)):
+        nurses[i].grade = "서브차지"
+
+    # 역할: 책임만은 책임 중에서, 나머지는 전체에서
+    capped = min(n, REFERENCE_NURSES)
+    chiefs = [i for i in range(n) if nurses[i].grade == "책임"]
+    rng.shuffle(chiefs)
+    free = [i for i in range(n)]
+    rng.shuffle(free)
+    for i in chiefs[:_ZONE_ROLES["책임만"] * capped // REFERENCE_NURSES]:
+        nurses[i].role = "책임만"
+        free.remove(i)
+    for role, count in _ZONE_ROLES.items():
+        if role == "책임만":
+            continue
+        for i in _take(free, count * capped // REFERENCE_NURSES):
+            nurses[i].role = role
+    for i in _take(free, round(n * spec.m_role_ratio)):
+        nurses[i].role = "중2"
+
+    for nurse in nurses:
+        nurse.is_male = rng.random() < spec.male_ratio
+        nurse.is_4day_week = rng.random() < spec.four_day_ratio
+        nurse.is_pregnant = not nurse.is_male and rng.random() < spec.pregnant_ratio
+        if rng.random() < spec.fixed_off_ratio:
+            nurse.fixed_weekly_off = rng.randrange(7)
+    return nurses
+
+
+def _requests_for(spec: SyntheticSpec, nurses: list[Nurse], rng: random.Random) -> list[Request]:
+    requests = []
+    for nurse in nurses:
+        count = min(27, max(0, round(rng.gauss(spec.requests_per_nurse, 2))))
+        days = sorted(rng.sample(range(1, 29), count))
+        # 고정 주휴일과 겹치는 신청은 실제로 거의 없으므로 제외
+        days = [
+            d for d in days
+            if nurse.fixed_weekly_off is None
+            or (spec.start_date.weekday() + d - 1) % 7 != nurse.fixed_weekly_off
+        ]
+        a_left = 3
+        items = []
+        for d in days:
+            condition = "B"
+            if a_left and rng.random() < spec.hard_share:
+                condition = "A"
+                a_left -= 1
+            if rng.random() < spec.or_share:
+                for code in rng.sample(_OR_CODES, 2):
+                    items.append((d, code, True, condition))
+            else:
+                items.append((d, rng.choice(_REQUEST_CODES), False, condition))
+        # 점수 = 100 - (A×1 + B×3), OR 쌍은 1건으로 집계
+        counted = {(d, c) for d, _, _, c in items}
+        score = 100 - sum(1 if c == "A" else 3 for _, c in counted)
+        requests.extend(
+            Request(nurse_id=nurse.id, day=d, code=code, is_or=is_or, condition=c, score=score)
+            for d, code, is_or, c in items
+        )
+    return requests
+
+
+def generate(spec: SyntheticSpec = SyntheticSpec()) -> SyntheticDepartment:
+    """같은 spec → 항상 같은 병동 (seed 고정)"""
+    rng = random.Random(spec.seed)
+    nurses = _nurses_for(spec, rng)
+    return SyntheticDepartment(
+        spec=spec,
+        nurses=nurses,
+        requests=_requests_for(spec, nurses, rng),
+        rules=_rules_for(spec),
+        start_date=spec.start_date,
+    )
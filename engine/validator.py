@@ -24,12 +24,14 @@
  20.  POFF: 임산부만
  21.  중2: 역할 '중2'만, 주말 불가
 """
-from datetime import timedelta
 from engine.models import (
-    Nurse, Rules, Schedule,
-    WORK_SHIFTS, OFF_TYPES, SHIFT_ORDER, ROLE_TIERS,
+    Nurse, Rules, Schedule, ShiftCode, ROLE_TIERS, WEEKDAY_NAMES,
+    CODE_LEVELS, WORK_MASK, OFF_MASK, D_MID_MASK, NEAR_WORK_OFF_MASK,
+    encode_shift,
 )
 
+_N = int(ShiftCode.N)
+
 
 def validate_change(
     schedule: Schedule,
@@ -54,41 +56,47 @@ def validate_change(
     nid = nurse.id
     num_days = schedule.num_days
     old_shift = schedule.get_shift(nid, day)
+    cal = schedule.calendar
+
+    # 대상 간호사 28일을 정수 코드로 1회 변환 (row[d - 1] = d일 코드)
+    row = schedule.encoded_row(nid)
+    new_code = encode_shift(new_shift)
+    old_is_work = (WORK_MASK >> row[day - 1]) & 1
 
-    is_work = new_shift in WORK_SHIFTS
-    is_off = new_shift in OFF_TYPES or new_shift == "OFF"
+    is_work = bool((WORK_MASK >> new_code) & 1)
+    is_off = bool((OFF_MASK >> new_code) & 1)
 
     # ── 1-2. 역순 금지 ──
     if is_work and rules.ban_reverse_order:
         # 전날 → 오늘
         if day > 1:
-            prev = schedule.get_shift(nid, day - 1)
-            if prev in SHIFT_ORDER and new_shift in SHIFT_ORDER:
-                if SHIFT_ORDER[prev] > SHIFT_ORDER[new_shift]:
-                    violations.append(
-                        f"역순 금지: {day-1}일 {prev} → {day}일 {new_shift}"
-                    )
+            lv_prev, lv_new = CODE_LEVELS[row[day - 2]], CODE_LEVELS[new_code]
+            if lv_prev and lv_new and lv_prev > lv_new:
+                prev = schedule.get_shift(nid, day - 1)
+                violations.append(
+                    f"역순 금지: {day-1}일 {prev} → {day}일 {new_shift}"
+                )
 
         # 오늘 → 다음날
         if day < num_days:
-            nxt = schedule.get_shift(nid, day + 1)
-            if nxt in SHIFT_ORDER and new_shift in SHIFT_ORDER:
-                if SHIFT_ORDER[new_shift] > SHIFT_ORDER[nxt]:
-                    violations.append(
-                        f"역순 금지: {day}일 {new_shift} → {day+1}일 {nxt}"
-                    )
+            lv_new, lv_next = CODE_LEVELS[new_code], CODE_LEVELS[row[day]]
+            if lv_new and lv_next and lv_new > lv_next:
+                nxt = schedule.get_shift(nid, day + 1)
+                violations.append(
+                    f"역순 금지: {day}일 {new_shift} → {day+1}일 {nxt}"
+                )
 
     # ── 3. 연속 근무 ≤5일 ──
     if is_work:
         consec = 1
         # 앞으로
         d = day - 1
-        while d >= 1 and schedule.get_shift(nid, d) in WORK_SHIFTS:
+        while d >= 1 and (WORK_MASK >> row[d - 1]) & 1:
             consec += 1
             d -= 1
         # 뒤로
         d = day + 1
-        while d <= num_days and schedule.get_shift(nid, d) in WORK_SHIFTS:
+        while d <= num_days and (WORK_MASK >> row[d - 1]) & 1:
             consec += 1
             d += 1
 
@@ -101,11 +109,11 @@ def validate_change(
     if new_shift == "N":
         consec_n = 1
         d = day - 1
-        while d >= 1 and schedule.get_shift(nid, d) == "N":
+        while d >= 1 and row[d - 1] == _N:
             consec_n += 1
             d -= 1
         d = day + 1
-        while d <= num_days and schedule.get_shift(nid, d) == "N":
+        while d <= num_days and row[d - 1] == _N:
             consec_n += 1
             d += 1
 
@@ -119,18 +127,18 @@ def validate_change(
     if new_shift == "N":
         # 블록 끝 탐색 (day 포함, 오른쪽으로 확장)
         block_end = day
-        while block_end < num_days and schedule.get_shift(nid, block_end + 1) == "N":
+        while block_end < num_days and row[block_end] == _N:
             block_end += 1
         # 블록 시작 탐색 (day 포함, 왼쪽으로 확장)
         block_start = day
-        while block_start > 1 and schedule.get_shift(nid, block_start - 1) == "N":
+        while block_start > 1 and row[block_start - 2] == _N:
             block_start -= 1
         block_len = block_end - block_start + 1
         if block_len >= 2:
             for k in range(rules.off_after_2N):
                 check = block_end + 1 + k
                 if check <= num_days:
-                    if schedule.get_shift(nid, check) in WORK_SHIFTS:
+                    if (WORK_MASK >> row[check - 1]) & 1:
                         violations.append(
                             f"N {block_len}연속 후 {check}일에 근무 있음 "
                             f"(휴무 {rules.off_after_2N}일 필요)"
@@ -138,14 +146,11 @@ def validate_change(
                         break
 
     # 근무→근무 or OFF→근무 변경 시: 앞 off_after일 내에 NN 이상 블록 끝이 있으면 위반
-    if is_work and old_shift not in WORK_SHIFTS:
+    if is_work and not old_is_work:
         for end in range(day - 1, max(0, day - rules.off_after_2N - 1), -1):
             if end >= 2:
-                s_end = schedule.get_shift(nid, end)
-                s_prev = schedule.get_shift(nid, end - 1)
-                s_after = schedule.get_shift(nid, end + 1) if end + 1 <= num_days else None
-                if (s_end == "N" and s_prev == "N"
-                        and (s_after is None or s_after != "N")):
+                after_is_n = end + 1 <= num_days and row[end] == _N
+                if row[end - 1] == _N and row[end - 2] == _N and not after_is_n:
                     gap = day - end - 1
                     violations.append(
                         f"{end-1}~{end}일 N연속 후 "
@@ -157,7 +162,7 @@ def validate_change(
     if new_shift == "N":
         n_count = sum(
             1 for d in range(1, num_days + 1)
-            if d != day and schedule.get_shift(nid, d) == "N"
+            if d != day and row[d - 1] == _N
         ) + 1
         if n_count > rules.max_N_per_month:
             violations.append(
@@ -165,13 +170,12 @@ def validate_change(
             )
 
     # ── 7. 주당 휴무 ≥2개 ──
-    if is_work and old_shift not in WORK_SHIFTS:
+    if is_work and not old_is_work:
         # OFF → 근무 변경: 해당 주 휴무 감소
-        week_start = ((day - 1) // 7) * 7 + 1
-        week_end = min(week_start + 6, num_days)
+        week_start, week_end = cal.week_ranges[(day - 1) // 7]
         off_count = sum(
             1 for d in range(week_start, week_end + 1)
-            if d != day and schedule.get_shift(nid, d) not in WORK_SHIFTS
+            if d != day and not (WORK_MASK >> row[d - 1]) & 1
         )
         if off_count < rules.min_weekly_off:
             violations.append(
@@ -181,8 +185,7 @@ def validate_change(
 
     # ── 7b. 주당 OFF ≤1개 (주4일제 ≤2개) — H11 ──
     if new_shift == "OFF":
-        week_start = ((day - 1) // 7) * 7 + 1
-        week_end = min(week_start + 6, num_days)
+        week_start, week_end = cal.week_ranges[(day - 1) // 7]
         max_weekly_off = 2 if nurse.is_4day_week else 1
         off_in_week = sum(
             1 for d in range(week_start, week_end + 1)
@@ -267,21 +270,20 @@ def validate_change(
             violations.append(f"{day}일 {new_shift} 책임만 {cnt}명 (최대 1명)")
 
     # ── 13. 법정공휴일 ──
-    if day in rules.public_holidays and is_off:
+    if cal.holiday[day - 1] and is_off:
         if new_shift not in ("법휴", "주"):
             violations.append(
                 f"{day}일은 법정공휴일: 법휴 또는 주만 가능"
             )
-    if new_shift == "법휴" and day not in rules.public_holidays:
+    if new_shift == "법휴" and not cal.holiday[day - 1]:
         violations.append(f"{day}일은 법정공휴일이 아님: 법휴 배정 불가")
 
     # ── 14. 주4일제 ──
-    if nurse.is_4day_week and is_work and old_shift not in WORK_SHIFTS:
-        week_start = ((day - 1) // 7) * 7 + 1
-        week_end = min(week_start + 6, num_days)
+    if nurse.is_4day_week and is_work and not old_is_work:
+        week_start, week_end = cal.week_ranges[(day - 1) // 7]
         off_count = sum(
             1 for d in range(week_start, week_end + 1)
-            if d != day and schedule.get_shift(nid, d) not in WORK_SHIFTS
+            if d != day and not (WORK_MASK >> row[d - 1]) & 1
         )
         if off_count < 3:
             violations.append(
@@ -293,11 +295,11 @@ def validate_change(
     if nurse.is_pregnant and is_work:
         consec = 1
         d = day - 1
-        while d >= 1 and schedule.get_shift(nid, d) in WORK_SHIFTS:
+        while d >= 1 and (WORK_MASK >> row[d - 1]) & 1:
             consec += 1
             d -= 1
         d = day + 1
-        while d <= num_days and schedule.get_shift(nid, d) in WORK_SHIFTS:
+        while d <= num_days and (WORK_MASK >> row[d - 1]) & 1:
             consec += 1
             d += 1
         if consec > rules.pregnant_poff_interval:
@@ -308,46 +310,41 @@ def validate_change(
 
     # ── 16. N→1off→(D/중간근무) 금지 ──
     # N 후 1휴무 뒤에는 E·N만 허용
-    _MID_AND_D = {"D", "D9", "D1", "중1", "중2"}
     # D/중간으로 변경 시: 2일 전이 N이고 사이가 휴무면 위반
-    if new_shift in _MID_AND_D and day >= 3:
-        prev2 = schedule.get_shift(nid, day - 2)
-        prev1 = schedule.get_shift(nid, day - 1)
-        if prev2 == "N" and prev1 not in WORK_SHIFTS:
+    if (D_MID_MASK >> new_code) & 1 and day >= 3:
+        if row[day - 3] == _N and not (WORK_MASK >> row[day - 2]) & 1:
+            prev1 = schedule.get_shift(nid, day - 1)
             violations.append(
                 f"N→1휴무→{new_shift} 금지: {day-2}일 N → {day-1}일 {prev1} → {day}일 {new_shift}"
             )
     # N으로 변경 시: 2일 후가 D/중간이고 사이가 휴무면 위반
     if new_shift == "N" and day + 2 <= num_days:
-        next1 = schedule.get_shift(nid, day + 1)
-        next2 = schedule.get_shift(nid, day + 2)
-        if next2 in _MID_AND_D and next1 not in WORK_SHIFTS:
+        if (D_MID_MASK >> row[day + 1]) & 1 and not (WORK_MASK >> row[day]) & 1:
+            next1 = schedule.get_shift(nid, day + 1)
+            next2 = schedule.get_shift(nid, day + 2)
             violations.append(
                 f"N→1휴무→{next2} 금지: {day}일 N → {day+1}일 {next1} → {day+2}일 {next2}"
             )
     # 근무→OFF 변경 시: 양쪽이 N, D/중간이면 위반
-    if is_off and old_shift in WORK_SHIFTS:
+    if is_off and old_is_work:
         if day >= 2 and day < num_days:
-            prev = schedule.get_shift(nid, day - 1)
-            nxt = schedule.get_shift(nid, day + 1)
-            if prev == "N" and nxt in _MID_AND_D:
+            if row[day - 2] == _N and (D_MID_MASK >> row[day]) & 1:
+                nxt = schedule.get_shift(nid, day + 1)
                 violations.append(
                     f"N→1휴무→{nxt} 금지: {day-1}일 N → {day}일 {new_shift} → {day+1}일 {nxt}"
                 )
 
     # ── 16b. N 다음날 보수/필수/번표 금지 ──
-    _N_INVALID_NEXT = {"보수", "필수", "번표"}
     # 오늘이 보수/필수/번표로 변경: 전날이 N이면 위반
-    if new_shift in _N_INVALID_NEXT and day >= 2:
-        prev = schedule.get_shift(nid, day - 1)
-        if prev == "N":
+    if (NEAR_WORK_OFF_MASK >> new_code) & 1 and day >= 2:
+        if row[day - 2] == _N:
             violations.append(
                 f"N 후 {new_shift} 금지: {day-1}일 N → {day}일 {new_shift}"
             )
     # 오늘이 N으로 변경: 다음날이 보수/필수/번표이면 위반
     if new_shift == "N" and day < num_days:
-        nxt = schedule.get_shift(nid, day + 1)
-        if nxt in _N_INVALID_NEXT:
+        if (NEAR_WORK_OFF_MASK >> row[day]) & 1:
+            nxt = schedule.get_shift(nid, day + 1)
             violations.append(
                 f"N 후 {nxt} 금지: {day}일 N → {day+1}일 {nxt}"
             )
@@ -365,11 +362,10 @@ def validate_change(
 
     # ── 18. 고정 주휴 요일 ──
     if nurse.fixed_weekly_off is not None:
-        day_weekday = (schedule.start_date + timedelta(days=day - 1)).weekday()
+        day_weekday = cal.weekdays[day - 1]
         if day_weekday == nurse.fixed_weekly_off and new_shift != "주":
-            weekday_names = ["월", "화", "수", "목", "금", "토", "일"]
             violations.append(
-                f"{day}일은 고정 주휴일 ({weekday_names[nurse.fixed_weekly_off]}요일): "
+                f"{day}일은 고정 주휴일 ({WEEKDAY_NAMES[nurse.fixed_weekly_off]}요일): "
                 f"'주' 필요 (현재: {new_shift})"
             )
 
@@ -378,7 +374,7 @@ def validate_change(
         if nurse.is_male:
             violations.append("생리휴가는 남성에게 배정할 수 없습니다")
         else:
-            target_month = (schedule.start_date + timedelta(days=day - 1)).month
+            target_month = cal.month_ids[day - 1]
             # 이전 근무표에서 시작 달(첫째 달)에 이미 생휴 사용 여부
             is_start_month = target_month == schedule.start_date.month
             already_used_prev = nurse.menstrual_used and is_start_month
@@ -387,7 +383,7 @@ def validate_change(
                 1 for d in range(1, num_days + 1)
                 if d != day
                 and schedule.get_shift(nid, d) == "생휴"
-                and (schedule.start_date + timedelta(days=d - 1)).month == target_month
+                and cal.month_ids[d - 1] == target_month
             )
             if already_used_prev:
                 violations.append(
@@ -406,9 +402,7 @@ def validate_change(
     if new_shift == "중2":
         if nurse.role != "중2":
             violations.append(f"중2 근무는 역할이 '중2'인 간호사만 배정 가능합니다 (현재 역할: {nurse.role or '없음'})")
-        day_weekday = (schedule.start_date + timedelta(days=day - 1)).weekday()
-        if day_weekday >= 5:  # 토=5, 일=6
-            weekday_names = ["월", "화", "수", "목", "금", "토", "일"]
-            violations.append(f"중2 근무는 주말({weekday_names[day_weekday]})에 배정할 수 없습니다")
+        if cal.weekend[day - 1]:  # 토/일
+            violations.append(f"중2 근무는 주말({WEEKDAY_NAMES[cal.weekdays[day - 1]]})에 배정할 수 없습니다")
 
     return violations
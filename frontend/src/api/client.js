@@ -76,8 +76,11 @@ export const holidaysApi = {
 // ── 근무신청 ──────────────────────────────────────
 export const requestsApi = {
   getAll:         (period_id) => api.get(`/requests/${period_id}`),
+  getDelta:       (period_id, cursor) =>
+    api.get(`/requests/${period_id}/delta`, { params: cursor ? { cursor } : {} }),
   getMine:        (period_id) => api.get(`/requests/${period_id}/me`),
-  getStatus:      (period_id) => api.get(`/requests/${period_id}/status`),
+  getStatus:      (period_id, cursor) =>
+    api.get(`/requests/${period_id}/status`, { params: cursor ? { cursor } : {} }),
   upsert:         (period_id, nurse_id, items) =>
     api.put(`/requests/${period_id}/${nurse_id}`, { items }),
   getScore:       (period_id, nurse_id) =>
@@ -113,4 +116,14 @@ export const scheduleApi = {
     api.get(`/schedule/${schedule_id}/export`, { responseType: 'blob' }),
 }
 
+// ── 이벤트 (SSE) ─────────────────────────────────
+// EventSource는 axios를 거치지 않으므로 baseURL·쿠키를 직접 지정
+const eventSource = (path) =>
+  new EventSource(`${api.defaults.baseURL}${path}`, { withCredentials: true })
+
+export const eventsApi = {
+  job:    (job_id) => eventSource(`/events/job/${job_id}`),
+  period: (period_id) => eventSource(`/events/period/${period_id}`),
+}
+
 export default api
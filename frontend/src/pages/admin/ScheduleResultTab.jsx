@@ -1,5 +1,5 @@
 import { useState, useEffect, useRef, useMemo } from 'react'
-import { scheduleApi, requestsApi, settingsApi, rulesApi, nursesApi } from '../../api/client'
+import { scheduleApi, requestsApi, settingsApi, rulesApi, nursesApi, eventsApi } from '../../api/client'
 import { sc, fmtDate, getWd, getDate, mmdd, WD, NUM_DAYS, WORK_SET, SHIFT_GROUPS } from '../../utils/constants'
 import { buildRequestMap } from '../../utils/validate'
 import NameFilter from '../../components/NameFilter'
@@ -314,6 +314,7 @@ export default function ScheduleResultTab({ period }) {
   const [settings, setSettings] = useState(null)
   const [jobId, setJobId] = useState(null)
   const [jobStatus, setJobStatus] = useState(null)
+  const [jobProgress, setJobProgress] = useState(null)   // 0~1 (경과/제한 시간, SSE progress)
   const [scheduleId, setScheduleId] = useState(null)
   const [scheduleData, setScheduleData] = useState(null)
   const [nurses, setNurses] = useState([])
@@ -390,26 +391,49 @@ export default function ScheduleResultTab({ period }) {
     loadAll()
   }, [period?.period_id])
 
+  // 작업 상태: SSE 스트림으로 수신, 연결 실패 시 3초 폴링으로 대체
   useEffect(() => {
-    if (!jobId || jobStatus === 'done' || jobStatus === 'failed') return
-    pollRef.current = setInterval(async () => {
-      try {
-        const res = await scheduleApi.jobStatus(jobId)
-        setJobStatus(res.data.status)
-        if (res.data.status === 'done' && res.data.schedule_id) {
-          clearInterval(pollRef.current)
-          setScheduleId(res.data.schedule_id)
-          loadSchedule(res.data.schedule_id)
-          if (settings?.period_id) loadRequests(settings.period_id)
-        } else if (res.data.status === 'failed') {
-          clearInterval(pollRef.current)
-          showMsg('근무표 생성 실패: ' + (res.data.error_msg || ''), false)
-          setGenerating(false)
-        }
-      } catch {}
-    }, 3000)
-    return () => clearInterval(pollRef.current)
-  }, [jobId, jobStatus])
+    if (!jobId) return
+    let finished = false
+    const applyJob = (job) => {
+      if (finished) return
+      setJobStatus(job.status)
+      if (job.progress != null) setJobProgress(job.progress)
+      if (job.status === 'done' && job.schedule_id) {
+        finished = true
+        setScheduleId(job.schedule_id)
+        loadSchedule(job.schedule_id)
+        if (settings?.period_id) loadRequests(settings.period_id)
+      } else if (job.status === 'failed') {
+        finished = true
+        showMsg('근무표 생성 실패: ' + (job.error_msg || ''), false)
+        setGenerating(false)
+      }
+    }
+    const startPolling = () => {
+      pollRef.current = setInterval(async () => {
+        try {
+          const res = await scheduleApi.jobStatus(jobId)
+          applyJob(res.data)
+          if (finished) clearInterval(pollRef.current)
+        } catch {}
+      }, 3000)
+    }
+    if (typeof EventSource === 'undefined') {
+      startPolling()
+      return () => clearInterval(pollRef.current)
+    }
+    const es = eventsApi.job(jobId)
+    es.addEventListener('status', (e) => {
+      applyJob(JSON.parse(e.data))
+      if (finished) es.close()
+    })
+    es.onerror = () => {
+      es.close()
+      if (!finished) startPolling()
+    }
+    return () => { es.close(); clearInterval(pollRef.current) }
+  }, [jobId])
 
   useEffect(() => {
     if (!datePicker) return
@@ -502,7 +526,7 @@ export default function ScheduleResultTab({ period }) {
   const _doGenerate = async () => {
     if (!window.confirm('근무표를 생성하시겠습니까? 기존 근무표가 있으면 덮어씌워집니다.')) return
     setConflictWarnings(null)
-    setGenerating(true); setJobStatus('pending'); setScheduleData(null); setEvalData(null)
+    setGenerating(true); setJobStatus('pending'); setJobProgress(null); setScheduleData(null); setEvalData(null)
     try {
       const res = await scheduleApi.generate(settings.period_id)
       setJobId(res.data.job_id)
@@ -684,7 +708,7 @@ export default function ScheduleResultTab({ period }) {
               {jobStatus === 'pending' ? '작업 대기 중...' : 'OR-Tools 최적화 중...'}
             </p>
             <div className="mt-1 bg-blue-100 rounded-full h-1 overflow-hidden">
-              <div className="bg-blue-500 h-1 rounded-full animate-pulse" style={{ width: jobStatus === 'running' ? '65%' : '20%' }} />
+              <div className="bg-blue-500 h-1 rounded-full animate-pulse" style={{ width: jobStatus !== 'running' ? '20%' : jobProgress != null ? `${Math.max(5, Math.round(jobProgress * 100))}%` : '65%' }} />
             </div>
           </div>
           <span className="text-xs text-blue-500 flex-shrink-0">최대 {rulesData?.solver_timeout ?? 300}초</span>
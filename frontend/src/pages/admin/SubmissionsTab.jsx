@@ -1,5 +1,5 @@
 import { useState, useEffect, useRef, useCallback } from 'react'
-import { requestsApi, nursesApi, rulesApi } from '../../api/client'
+import { requestsApi, nursesApi, rulesApi, eventsApi } from '../../api/client'
 import { sc, fmtDate, getWd, getDate, mmdd, WD, NUM_DAYS, SHIFT_GROUPS, WORK_SET, DEFAULT_RULES } from '../../utils/constants'
 import { validate, buildRequestMap } from '../../utils/validate'
 import NameFilter from '../../components/NameFilter'
@@ -51,22 +51,51 @@ export default function SubmissionsTab({ period }) {
   const datePickerRef = useRef(null)
   const periodIdRef = useRef(null)
   const allRequestsRef = useRef({})
+  const statusCursorRef = useRef(null)   // /status 커서 (null이면 전체 조회)
+  const requestRowsRef = useRef({})      // request id → 신청 행 (델타 병합용)
+  const deltaCursorRef = useRef(null)    // /delta 커서 (null이면 전체 조회)
+
+  // 델타(변경 행 + 삭제 id) 병합 → 그리드 맵 재구성. full이면 전체 교체
+  const applyRequestDelta = useCallback((delta) => {
+    const rows = delta.full ? {} : { ...requestRowsRef.current }
+    ;(delta.deleted || []).forEach(id => { delete rows[id] })
+    ;(delta.rows || []).forEach(r => { rows[r.id] = r })
+    requestRowsRef.current = rows
+    deltaCursorRef.current = delta.cursor || null
+    if (!delta.full && !delta.rows?.length && !delta.deleted?.length) return
+    const map = buildRequestMap(Object.values(rows))
+    allRequestsRef.current = map
+    setAllRequests(map)
+  }, [])
+
+  // 제출 현황 델타 병합 — 커서는 서버가 준 값을 그대로 다음 조회에 넘김 (클라이언트 비교 없음)
+  const applyStatus = useCallback((delta) => {
+    const rows = delta.rows || []
+    statusCursorRef.current = delta.cursor || null
+    if (delta.full) { setStatus(rows); return }
+    if (rows.length === 0) return
+    const changed = Object.fromEntries(rows.map(r => [r.nurse_id, r]))
+    setStatus(prev => {
+      const known = new Set(prev.map(s => s.nurse_id))
+      return [...prev.map(s => changed[s.nurse_id] || s), ...rows.filter(r => !known.has(r.nurse_id))]
+    })
+  }, [])
 
   useEffect(() => {
     if (!period?.period_id) { setLoading(false); return }
     periodIdRef.current = period.period_id
+    statusCursorRef.current = null
+    deltaCursorRef.current = null
     setLoading(true)
     Promise.all([
       requestsApi.getStatus(period.period_id),
-      requestsApi.getAll(period.period_id),
+      requestsApi.getDelta(period.period_id),
       nursesApi.list(),
       rulesApi.get(),
       requestsApi.getAllScores(period.period_id).catch(() => ({ data: [] })),
     ]).then(([sRes, aRes, nRes, rRes, scRes]) => {
-      setStatus(sRes.data)
-      const map = buildRequestMap(aRes.data)
-      setAllRequests(map)
-      allRequestsRef.current = map
+      applyStatus(sRes.data)
+      applyRequestDelta(aRes.data)
       const fMap = {}, nMap = {}
       ;(nRes.data || []).forEach(n => {
         nMap[n.id] = n
@@ -84,11 +113,27 @@ export default function SubmissionsTab({ period }) {
 
   const handleRefreshStatus = () => {
     if (!periodIdRef.current) return
-    requestsApi.getStatus(periodIdRef.current)
-      .then(res => setStatus(res.data))
+    // 마지막 조회 이후 바뀐 간호사·신청 행만 받아 병합
+    requestsApi.getStatus(periodIdRef.current, statusCursorRef.current)
+      .then(res => applyStatus(res.data))
+      .catch(() => {})
+    requestsApi.getDelta(periodIdRef.current, deltaCursorRef.current)
+      .then(res => applyRequestDelta(res.data))
       .catch(() => {})
   }
 
+  // 간호사 제출·가져오기 푸시 수신 → 증분 새로고침 (연속 제출은 0.5초 모아서 1회)
+  useEffect(() => {
+    if (!period?.period_id || typeof EventSource === 'undefined') return
+    const es = eventsApi.period(period.period_id)
+    let timer = null
+    es.addEventListener('submission', () => {
+      clearTimeout(timer)
+      timer = setTimeout(handleRefreshStatus, 500)
+    })
+    return () => { clearTimeout(timer); es.close() }
+  }, [period?.period_id])
+
   useEffect(() => {
     if (!activePick) return
     const handler = (e) => {
@@ -125,12 +170,10 @@ export default function SubmissionsTab({ period }) {
       // 데이터 새로고침
       const [sRes, aRes] = await Promise.all([
         requestsApi.getStatus(period.period_id),
-        requestsApi.getAll(period.period_id),
+        requestsApi.getDelta(period.period_id, deltaCursorRef.current),
       ])
-      setStatus(sRes.data)
-      const map = buildRequestMap(aRes.data)
-      allRequestsRef.current = map
-      setAllRequests(map)
+      applyStatus(sRes.data)
+      applyRequestDelta(aRes.data)
     } catch (err) {
       setImportMsg({ ok: false, text: err.response?.data?.detail || '가져오기 실패' })
       setTimeout(() => setImportMsg(null), 4000)
@@ -212,11 +255,10 @@ export default function SubmissionsTab({ period }) {
       })
       await requestsApi.upsert(periodIdRef.current, nurseId, items)
     } catch {
-      requestsApi.getAll(periodIdRef.current).then(res => {
-        const map = buildRequestMap(res.data)
-        allRequestsRef.current = map
-        setAllRequests(map)
-      }).catch(() => {})
+      // 저장 실패 → 서버 상태로 전체 재동기화
+      requestsApi.getDelta(periodIdRef.current)
+        .then(res => applyRequestDelta(res.data))
+        .catch(() => {})
       alert('저장에 실패했습니다.')
     } finally { setSaving(null) }
   }, [activePick])
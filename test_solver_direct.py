@@ -5,6 +5,7 @@
   예) uv run python test_solver_direct.py 2026-02-01
 
 start_date 미지정 시 가장 최근 period 사용.
+DB 없이 재현하려면 worker 번들(settings.solver_bundle_dir) + python -m engine.replay 사용.
 """
 import sys
 import os
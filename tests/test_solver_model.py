@@ -0,0 +1,124 @@
+"""솔버 모델 동치성 — 인덱스 배열 구축(user-045) 이전 모델과 같은 해 집합·목적값인지 확인
+(+ two_phase 야간 축약 모델이 전체 모델의 완화인지)
+
+기준 모델: tests/_baseline_solver.py (user-045 직전 engine/solver.py 고정 사본).
+두 모델을 build_only + export_path로 만든 뒤 근무 변수(s_n{ni}_d{di}_s{si}) 이름으로 대응:
+  1. 한 모델에서 임의 목적함수로 실행 가능해 하나를 뽑고
+  2. 근무 변수를 그 해로 고정해 두 모델 모두 풀어 → 둘 다 OPTIMAL, 목적값 동일
+양방향으로 반복 (한쪽에만 있는 해가 있으면 다른 쪽이 INFEASIBLE).
+보조 변수(OFF 채널, 단계 변수 등)는 모델마다 달라도 되므로 비교하지 않음.
+
+실행: python -m pytest tests
+"""
+import importlib.util
+import logging
+import os
+import random
+
+import pytest
+from ortools.sat.python import cp_model
+
+from engine import solver
+from engine.models import period_calendar
+from engine.synthetic import SyntheticSpec, generate
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "_baseline_solver.py")
+NUM_NURSES = 24           # 합성 병동이 실행 가능한 최소 규모 근처 (20명 이하는 인원 제약으로 해 없음)
+SAMPLE_SEC = 5            # 임의 목적함수 해 찾기 제한 시간
+FIXED_SEC = 30            # 근무 변수 고정 후 풀기 제한 시간
+
+
+@pytest.fixture(scope="module")
+def baseline():
+    """user-045 직전 솔버 (shifts dict + 변수별 제약)"""
+    spec = importlib.util.spec_from_file_location("_baseline_solver", BASELINE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(autouse=True)
+def _quiet_solver_log():
+    logging.disable(logging.WARNING)
+    yield
+    logging.disable(logging.NOTSET)
+
+
+def _build(solve_fn, dept, path, **kwargs) -> cp_model.CpModel:
+    solve_fn(dept.nurses, dept.requests, dept.rules, dept.start_date,
+             export_path=str(path), build_only=True, **kwargs)
+    model = cp_model.CpModel()
+    model.proto.parse_text_format(path.read_text())
+    return model
+
+
+def _shift_vars(model: cp_model.CpModel) -> dict[str, int]:
+    return {v.name: i for i, v in enumerate(model.proto.variables) if v.name.startswith("s_n")}
+
+
+def _solve(model: cp_model.CpModel, seconds: float):
+    s = cp_model.CpSolver()
+    s.parameters.max_time_in_seconds = seconds
+    s.parameters.num_workers = 8
+    return s, s.solve(model)
+
+
+def _sample(model: cp_model.CpModel, seed: int) -> dict[str, int]:
+    """근무 변수에 임의 가중치를 준 목적함수로 실행 가능해 하나"""
+    m = model.clone()
+    m.clear_objective()
+    rng = random.Random(seed)
+    index = _shift_vars(m)
+    m.minimize(cp_model.LinearExpr.weighted_sum(
+        [m.get_bool_var_from_proto_index(i) for i in index.values()],
+        [rng.randint(-3, 3) for _ in index],
+    ))
+    s, status = _solve(m, SAMPLE_SEC)
+    assert status in (cp_model.OPTIMAL, cp_model.FEASIBLE), s.status_name(status)
+    return {name: s.value(m.get_bool_var_from_proto_index(i)) for name, i in index.items()}
+
+
+def _objective_at(model: cp_model.CpModel, assignment: dict[str, int]):
+    """근무 변수를 고정했을 때 (상태, 최소 목적값)"""
+    m = model.clone()
+    index = _shift_vars(m)
+    assert set(index) == set(assignment)
+    for name, i in index.items():
+        m.add(m.get_bool_var_from_proto_index(i) == assignment[name])
+    s, status = _solve(m, FIXED_SEC)
+    return s.status_name(status), (s.objective_value if status == cp_model.OPTIMAL else None)
+
+
+@pytest.mark.parametrize("native_encoding", [False, True])
+def test_model_matches_baseline(baseline, tmp_path, native_encoding):
+    dept = generate(SyntheticSpec(num_nurses=NUM_NURSES, seed=1))
+    base = _build(baseline.solve_schedule, dept, tmp_path / "base.pbtxt")
+    # 대칭 제거는 해 집합을 줄이므로(목적값만 불변) 끄고 비교
+    new = _build(solver.solve_schedule, dept, tmp_path / "new.pbtxt",
+                 native_encoding=native_encoding, symmetry_breaking=False)
+
+    for seed in range(2):
+        for source in (base, new):
+            x = _sample(source, seed)
+            got_base = _objective_at(base, x)
+            got_new = _objective_at(new, x)
+            assert got_base[0] == "OPTIMAL"
+            assert got_new == got_base
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_night_model_admits_full_solutions(seed):
+    """two_phase 1단계 축약 모델은 완화 — 전체 모델 해를 4상태로 묶으면 그대로 만족"""
+    dept = generate(SyntheticSpec(num_nurses=NUM_NURSES, seed=seed))
+    schedule = solver.solve_schedule(dept.nurses, dept.requests, dept.rules, dept.start_date,
+                                     timeout_seconds=10)
+    assert schedule.schedule_data
+
+    cal = period_calendar(dept.start_date, dept.rules.public_holidays)
+    model, states = solver._build_night_model(dept.nurses, dept.requests, dept.rules, cal)
+    for nurse, row in zip(dept.nurses, states):
+        for di, cell in enumerate(row):
+            code = schedule.get_shift(nurse.id, di + 1)
+            model.add(cell[solver._STATE_OF[solver.NAME_TO_IDX[code]]] == 1)
+    s, status = _solve(model, FIXED_SEC)
+    assert status in (cp_model.OPTIMAL, cp_model.FEASIBLE), s.status_name(status)
@@ -0,0 +1,63 @@
+"""대칭 제거 (user-047) — 사전식 제약 전수 검사 + 교환 가능 간호사 묶음"""
+import itertools
+
+import pytest
+from ortools.sat.python import cp_model
+
+from engine.models import Nurse, Request
+from engine.solver import _add_lex_geq, interchangeable_nurses
+
+DOMAIN = 3  # 각 자리 값 0..2
+
+
+class _Collector(cp_model.CpSolverSolutionCallback):
+    def __init__(self, variables):
+        super().__init__()
+        self._vars = variables
+        self.seen: set[tuple] = set()
+
+    def on_solution_callback(self):
+        self.seen.add(tuple(self.value(v) for v in self._vars))
+
+
+@pytest.mark.parametrize("length", [1, 2, 3])
+def test_lex_geq_matches_enumeration(length):
+    model = cp_model.CpModel()
+    a = [model.new_int_var(0, DOMAIN - 1, f"a{d}") for d in range(length)]
+    b = [model.new_int_var(0, DOMAIN - 1, f"b{d}") for d in range(length)]
+    _add_lex_geq(model, a, b, "lex")
+
+    solver = cp_model.CpSolver()
+    solver.parameters.enumerate_all_solutions = True
+    collector = _Collector(a + b)
+    assert solver.solve(model, collector) == cp_model.OPTIMAL
+
+    # 보조 변수(eq)는 여러 값이 가능하므로 (a, b)로 사영해서 비교
+    rows = list(itertools.product(range(DOMAIN), repeat=length))
+    expected = {ra + rb for ra in rows for rb in rows if ra >= rb}
+    assert collector.seen == expected
+
+
+def _nurse(nid, **kw):
+    return Nurse(id=nid, name=f"간호사{nid}", **kw)
+
+
+def test_interchangeable_nurses_groups_identical_unrequested():
+    nurses = [
+        _nurse(1),
+        _nurse(2, note="비고는 무시"),
+        _nurse(3, grade="책임"),
+        _nurse(4, grade="책임"),
+        _nurse(5),                          # 신청 있음 → 제외
+        _nurse(6, prev_tail_shifts=["N"]),  # 전월 tail 다름 → 단독
+        _nurse(7, is_4day_week=True),       # 단독 → 묶음 없음
+        _nurse(8),
+    ]
+    requests = [Request(nurse_id=5, day=3, code="OFF")]
+
+    assert interchangeable_nurses(nurses, requests) == [[0, 1, 7], [2, 3]]
+
+
+def test_interchangeable_nurses_none_when_all_distinct():
+    nurses = [_nurse(1), _nurse(2, is_male=True), _nurse(3, fixed_weekly_off=2)]
+    assert interchangeable_nurses(nurses, []) == []